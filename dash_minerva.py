@@ -1,31 +1,42 @@
 import re
 import os
 import uuid
-import shutil
 import json
-from pathlib import Path
 import math
+import threading
+from collections import OrderedDict
 from typing import Any, List, TypedDict, TypeAlias
 from dotenv import load_dotenv
 
 import dash
-from dash import dcc, html, Input, Output, State, callback, clientside_callback, ALL, MATCH, ctx
+from dash import dcc, html, dash_table, Input, Output, State, callback, clientside_callback, ALL, MATCH, ctx
 import dash_bootstrap_components as dbc
 import glob
 from urllib.parse import quote
-from flask import logging, request, send_file, abort
+from flask import logging, request, send_file, abort, Response
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 
 from logic.services.service_factory import get_service
-from datamodel.models import FilterFieldSpec, Filters, FilterSpec, NodeRef, NodeKind, DetailsData, FileNode, FileSet, Summary, Badge
+from logic.utils.download_cache import DownloadCache, DEFAULT_MAX_BYTES
+from logic.core.minerva.cli_progress import CLIProgress
+from datamodel.models import FilterFieldSpec, Filters, FilterSpec, NodeRef, NodeKind, DetailsData, FileNode, FileSet, FileHit, Summary, Badge
 
 print("### RUNNING DASH FILE:", __file__)
 
 # --- [0. Load Environment Variables] ---
 load_dotenv()
 TEMP_DOWNLOAD_PATH = os.getenv("TEMP_DOWNLOAD_PATH", "./temp_downloads")
+# Signed download links; set DOWNLOAD_URL_SECRET when running several workers.
+DOWNLOAD_URL_SECRET = os.getenv("DOWNLOAD_URL_SECRET") or uuid.uuid4().hex
+DOWNLOAD_URL_TTL = int(os.getenv("DOWNLOAD_URL_TTL", "300"))
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_CACHE_MAX_BYTES = int(os.getenv("DOWNLOAD_CACHE_MAX_BYTES", str(DEFAULT_MAX_BYTES)))
+# How long a request waits for another request's in-flight fill before streaming from upstream itself.
+DOWNLOAD_CACHE_WAIT = 2.0
 
 # --- [1. Build service (tenant-agnostic) ] ---
 service = get_service()
+download_cache = DownloadCache(os.path.join(TEMP_DOWNLOAD_PATH, "cache"), max_bytes=DOWNLOAD_CACHE_MAX_BYTES)
 
 print("### Service initialized:", service)
 
@@ -256,126 +267,157 @@ def format_size(size_bytes):
     return f"{s} {size_name[i]}"
 
 
-def create_tree_table(file_list: list[FileNode], category: str, active_item: str):
+# Server-side row model for the file grids: the full lists stay here and the
+# browser only ever receives one page, so payload and DOM size do not grow
+# with the number of files.
+FILE_GRID_PAGE_SIZE = 100
+FILE_GRID_CACHE_MAX = 32
+_file_grid_cache: "OrderedDict[tuple[str, str], list[FileNode]]" = OrderedDict()
+_file_grid_lock = threading.Lock()
+
+
+def cache_file_grid(active_item: str, category: str, file_list: list[FileNode]) -> None:
+    with _file_grid_lock:
+        _file_grid_cache[(active_item, category)] = file_list
+        _file_grid_cache.move_to_end((active_item, category))
+        while len(_file_grid_cache) > FILE_GRID_CACHE_MAX:
+            _file_grid_cache.popitem(last=False)
+
+
+def cached_file_grid(active_item: str, category: str, node_map: dict) -> list[FileNode]:
+    with _file_grid_lock:
+        file_list = _file_grid_cache.get((active_item, category))
+    if file_list is not None:
+        return file_list
+
+    # Another worker rendered the details, or the entry was evicted.
+    node_dict = (node_map or {}).get(active_item)
+    if not node_dict:
+        return []
+    files = service.get_details(node_from_dict(node_dict)).files
+    for cat, nodes in (("inputs", files.inputs if files else []), ("outputs", files.outputs if files else [])):
+        cache_file_grid(active_item, cat, nodes or [])
+    return (files.inputs if category == "inputs" else files.outputs) if files else []
+
+
+def expand_file_list(file_list: list[FileNode], expanded: set[str]) -> list[FileNode]:
+    """Splice the children of expanded lazy folders in after their parent."""
+    if not expanded:
+        return file_list
+
+    out: list[FileNode] = []
+
+    def walk(nodes: list[FileNode]):
+        for f in nodes:
+            out.append(f)
+            if f.has_children and f.id in expanded:
+                walk(service.list_folder_children(f.id, depth=(f.depth or 0) + 1))
+
+    walk(file_list)
+    return out
+
+
+def file_grid_row(f: FileNode, expanded: set[str]) -> dict:
+    depth = f.depth or 0
+    name = f.name or ""
+    icon = "folder-download.svg" if f.is_folder else "download.svg"
+    expandable = bool(f.is_folder and f.has_children)
+    toggle = ("▾ " if f.id in expanded else "▸ ") if expandable else ""
+    return {
+        "id": f.id,
+        "name": ("\u00a0" * 5 * depth) + ("└─ " if depth > 0 else "") + toggle + ("📂 " if f.is_folder else "📄 ") + name,
+        "size": format_size(f.size or 0) if not f.is_folder else "-",
+        "view": f"![view]({dash.get_asset_url('icons/eye.svg')})" if (not f.is_folder and get_viewer_type_by_ext(name)) else "",
+        "download": f"![download]({dash.get_asset_url('icons/' + icon)})",
+        "external": "↗ Minerva",
+        "kind": "folder" if f.is_folder else "file",
+        "expandable": expandable,
+        "file_name": name,
+        "is_folder": f.is_folder,
+        "vault_id": f.vault_id,
+        "modified_on": f.modified_on,
+    }
+
+
+def file_grid_page(
+    file_list: list[FileNode], search: str | None, page: int, expanded: set[str] = frozenset()
+) -> tuple[list[dict], int]:
+    file_list = expand_file_list(file_list, expanded)
+    term = (search or "").lower().strip()
+    if term:
+        file_list = [f for f in file_list if term in (f.name or "").lower()]
+    page_count = max(1, math.ceil(len(file_list) / FILE_GRID_PAGE_SIZE))
+    page = min(max(page or 0, 0), page_count - 1)
+    start = page * FILE_GRID_PAGE_SIZE
+    return [file_grid_row(f, expanded) for f in file_list[start:start + FILE_GRID_PAGE_SIZE]], page_count
+
+
+def create_file_grid(file_list: list[FileNode], category: str, active_item: str):
     if not file_list:
         return html.Div("No files found.", className="p-4 text-muted small text-center")
 
-    rows = []
-    for f in file_list:
-        file_id = f.id
-        file_name = f.name
-        is_folder = f.is_folder
-        vault_id = f.vault_id
-        depth = f.depth or 0
-        file_size = f.size or 0
-
-        rows.append(
-            html.Tr(
-                [
-                    html.Td(
-                        [
-                            html.Span(
-                                "└─ " if depth > 0 else "",
-                                style={"color": "#adb5bd", "fontFamily": "monospace"},
-                            ),
-                            html.Span("📂 " if is_folder else "📄 ", className="me-1"),
-                            html.Span(file_name),
-                        ],
-                        style={
-                            "paddingLeft": f"{depth * 20 + 15}px",
-                            "paddingTop": "4px",
-                            "paddingBottom": "4px",
-                            "fontWeight": "600" if is_folder else "400",
-                            "fontSize": "14px",
-                        },
-                        className="align-middle",
-                    ),
-                    html.Td(
-                        format_size(file_size) if not is_folder else "-",
-                        className="text-end text-muted align-middle",
-                        style={"fontSize": "14px", "paddingTop": "4px", "paddingBottom": "4px"},
-                    ),
-                    html.Td(
-                        dbc.ButtonGroup(
-                            [
-                                dbc.Button(
-                                    html.Img(src=dash.get_asset_url("icons/eye.svg"), style={"width": "14px"}),
-                                    id={"type": "btn-view", "index": file_id, "file_name": file_name, "category": category},
-                                    color="white",
-                                    size="sm",
-                                    className="border py-0 px-2",
-                                    style={
-                                        "visibility": "visible"
-                                        if (not is_folder and get_viewer_type_by_ext(file_name))
-                                        else "hidden"
-                                    },
-                                ),
-                                dbc.Button(
-                                    html.Img(
-                                        src=dash.get_asset_url("icons/folder-download.svg" if is_folder else "icons/download.svg"),
-                                        style={"width": "14px"},
-                                    ),
-                                    id={"type": "btn-download", "index": file_id, "file_name": file_name, "category": category, "is_folder": is_folder, "vault_id":vault_id},
-                                    n_clicks=0,
-                                    color="white",
-                                    size="sm",
-                                    className="ms-1 border py-0 px-2",
-                                ),
-                                dbc.Button(
-                                    [
-                                        html.Img(
-                                            src=dash.get_asset_url("icons/arrow-up-right-square.svg"),
-                                            style={"width": "12px", "marginRight": "4px"},
-                                        ),
-                                        "Minerva",
-                                    ],
-                                    id={"type": "btn-external", "index": file_id, "file_name": file_name, "category": category},
-                                    color="primary",
-                                    outline=True,
-                                    size="sm",
-                                    className="ms-1 py-0 px-2 d-flex align-items-center justify-content-center",
-                                    style={"fontSize": "12px"},
-                                ),
-                            ],
-                            size="sm",
-                            className="w-100",
-                        ),
-                        className="text-center align-middle",
-                        style={"paddingTop": "2px", "paddingBottom": "2px"},
-                    ),
-                ],
-                className="file-row-item",
-                id={"type": "file-row", "index": active_item, "file_id": file_id},
-                **{"data-filename": (file_name or "").lower()},
-                style={"height": "32px"},
-            )
-        )
+    cache_file_grid(active_item, category, file_list)
+    data, page_count = file_grid_page(file_list, None, 0)
+    grid_id = {"type": "file-grid", "index": active_item, "category": category}
 
-    return dbc.Table(
+    return html.Div(
         [
-            html.Thead(
-                html.Tr(
-                    [
-                        html.Th("Name", className="ps-4"),
-                        html.Th("Size", className="text-end", style={"width": "100px"}),
-                        html.Th("Actions", className="text-center", style={"width": "180px"}),
-                    ],
-                    style={"lineHeight": "1.2"},
-                )
+            dash_table.DataTable(
+                id=grid_id,
+                columns=[
+                    {"name": "Name", "id": "name"},
+                    {"name": "Size", "id": "size"},
+                    {"name": "", "id": "view", "presentation": "markdown"},
+                    {"name": "", "id": "download", "presentation": "markdown"},
+                    {"name": "Actions", "id": "external"},
+                ],
+                data=data,
+                page_action="custom",
+                page_current=0,
+                page_size=FILE_GRID_PAGE_SIZE,
+                page_count=page_count,
+                cell_selectable=True,
+                style_as_list_view=True,
+                style_table={"maxHeight": "480px", "overflowY": "auto"},
+                style_header={"fontWeight": "bold", "backgroundColor": "white", "borderBottom": "1px solid #dee2e6"},
+                style_cell={"fontSize": "14px", "padding": "4px 8px", "border": "none", "fontFamily": "inherit"},
+                style_cell_conditional=[
+                    {"if": {"column_id": "name"}, "textAlign": "left", "whiteSpace": "pre", "paddingLeft": "15px"},
+                    {"if": {"column_id": "size"}, "textAlign": "right", "color": "#6c757d", "width": "100px"},
+                    {"if": {"column_id": "view"}, "textAlign": "center", "width": "40px", "cursor": "pointer"},
+                    {"if": {"column_id": "download"}, "textAlign": "center", "width": "40px", "cursor": "pointer"},
+                    {"if": {"column_id": "external"}, "textAlign": "center", "width": "100px", "cursor": "pointer", "color": "#2c3e50", "fontSize": "12px"},
+                ],
+                style_data_conditional=[
+                    {"if": {"filter_query": '{kind} = "folder"', "column_id": "name"}, "fontWeight": "600"},
+                    {"if": {"state": "active"}, "backgroundColor": "inherit", "border": "none"},
+                    {"if": {"state": "selected"}, "backgroundColor": "inherit", "border": "none"},
+                ],
+                css=[
+                    {"selector": ".dash-cell img", "rule": "width: 14px;"},
+                    {"selector": ".dash-cell p", "rule": "margin: 0;"},
+                ],
             ),
-            html.Tbody(rows, id={"type": "file-table-body", "index": active_item, "category": category}),
-        ],
-        hover=True,
-        borderless=True,
-        className="mb-0 table-sm",
+            dcc.Store(id={"type": "file-action", "index": active_item, "category": category}),
+            dcc.Store(id={"type": "file-expanded", "index": active_item, "category": category}, data=[]),
+        ]
     )
 
 
 # --- [3. App Initialization & Layout] ---
+# Background callbacks (export progress) need a manager; diskcache is optional.
+try:
+    import diskcache
+    background_callback_manager = dash.DiskcacheManager(diskcache.Cache(os.path.join(TEMP_DOWNLOAD_PATH, "background")))
+except ImportError:
+    background_callback_manager = None
+    print("### diskcache not installed: workspace export runs without live progress")
+
 app = dash.Dash(
     __name__,
     external_stylesheets=[dbc.themes.FLATLY, dbc.icons.BOOTSTRAP],
     suppress_callback_exceptions=True,
+    background_callback_manager=background_callback_manager,
 )
 
 
@@ -394,6 +436,14 @@ app.layout = dbc.Container(
                                     [
                                         html.H4(service.default_section_title(0, "Projects"), className="fw-bold mb-3"),
                                         dbc.Row(id="filter-container", className="g-2 mb-3"),
+                                        dbc.Input(
+                                            id="global-file-search",
+                                            type="search",
+                                            placeholder="Search all files...",
+                                            debounce=True,
+                                            size="sm",
+                                        ),
+                                        html.Div(id="global-file-search-results", className="mt-1"),
                                         html.Hr(className="mt-2"),
                                     ],
                                     style={"flex": "0 0 auto", "padding": "0 5px"},
@@ -462,7 +512,7 @@ app.layout = dbc.Container(
             style={"position": "fixed", "top": 66, "right": 10, "width": 350, "zIndex": 9999},
             children=html.P(id="download-toast-body", className="mb-0 small"),
         ),
-        dcc.Download(id="download-component"),
+        dcc.Store(id="download-url", data=None),
     ],
     fluid=True,
 )
@@ -508,6 +558,69 @@ def render_filters(_):
     filter_spec = service.get_filter_spec() or {}
     return build_filter_components(filter_spec)
 
+GLOBAL_FILE_SEARCH_LIMIT = 30
+
+
+def render_file_hit(hit: FileHit):
+    f = hit.file
+    return dbc.ListGroupItem(
+        html.Div(
+            [
+                html.Div(
+                    [
+                        html.Div(
+                            [html.Span("📂 " if f.is_folder else "📄 ", className="me-1"), html.Span(f.name)],
+                            className="text-truncate",
+                            style={"fontSize": "13px", "fontWeight": "600" if f.is_folder else "400"},
+                        ),
+                        html.Div(
+                            f"{hit.owner_label or hit.owner_id} · {hit.category}"
+                            + ("" if f.is_folder else f" · {format_size(f.size or 0)}"),
+                            className="text-muted text-truncate",
+                            style={"fontSize": "11px"},
+                        ),
+                    ],
+                    style={"minWidth": 0, "flex": "1 1 auto"},
+                ),
+                dbc.Button(
+                    html.Img(
+                        src=dash.get_asset_url("icons/folder-download.svg" if f.is_folder else "icons/download.svg"),
+                        style={"width": "14px"},
+                    ),
+                    # Pattern-matching id values must be str/number/bool: no None.
+                    id={"type": "btn-download", "index": f.id, "file_name": f.name or "", "category": hit.category, "is_folder": bool(f.is_folder), "vault_id": f.vault_id or "None", "modified_on": f.modified_on or ""},
+                    n_clicks=0,
+                    color="white",
+                    size="sm",
+                    className="ms-1 border py-0 px-2",
+                ),
+            ],
+            className="d-flex align-items-center",
+        ),
+        className="py-1 px-2",
+    )
+
+
+@callback(
+    Output("global-file-search-results", "children"),
+    Input("global-file-search", "value"),
+    prevent_initial_call=True,
+)
+def search_all_files(query):
+    query = (query or "").strip()
+    if not query:
+        return None
+
+    hits = service.search_files(query, limit=GLOBAL_FILE_SEARCH_LIMIT)
+    if not hits:
+        return html.Div("No matching files.", className="p-2 text-muted small")
+    return dbc.ListGroup(
+        [render_file_hit(h) for h in hits],
+        flush=True,
+        className="border rounded",
+        style={"maxHeight": "40vh", "overflowY": "auto"},
+    )
+
 def render_level0_item(node: NodeRef, details: DetailsData | None = None, active: bool = False):
     summary = node.summary if node.summary else (details.summary if details else Summary(title=node.id))
     badges = badges_for_view(node.summary.badges, "sidebar") if node.summary else []
@@ -789,27 +902,47 @@ def render_level2_details(active_item, component_id, node_map):
         [
             html.Div(
                 [
-                    dbc.Input(
-                        id={"type": "file-search", "index": current_id},
-                        placeholder="Search files in this request...",
+                    dbc.InputGroup(
+                        [
+                            dbc.Input(
+                                id={"type": "file-search", "index": current_id},
+                                placeholder="Search files in this request...",
+                                debounce=True,
+                            ),
+                            dbc.Button(
+                                "Export to workspace",
+                                id={"type": "btn-export", "index": current_id},
+                                color="primary",
+                                outline=True,
+                                n_clicks=0,
+                            ),
+                        ],
                         size="sm",
                         className="mb-2 shadow-sm",
-                        debounce=True,
-                    )
+                    ),
+                    dbc.Progress(
+                        id={"type": "export-progress", "index": current_id},
+                        value=0,
+                        striped=True,
+                        animated=True,
+                        className="mb-2",
+                        style={"display": "none", "height": "18px"},
+                    ),
+                    html.Div(id={"type": "export-status", "index": current_id}, className="small text-muted mb-2"),
                 ],
                 className="px-2",
             ),
             dbc.Tabs(
                 [
                     dbc.Tab(
-                        create_tree_table(inputs, "inputs", current_id),
+                        create_file_grid(inputs, "inputs", current_id),
                         label=f"Input Files ({len(inputs)})",
                         tab_id="tab-inputs",
                         label_class_name="fw-bold text-primary",
                         className="p-2 border border-top-0 bg-white rounded-bottom",
                     ),
                     dbc.Tab(
-                        create_tree_table(outputs, "outputs", current_id),
+                        create_file_grid(outputs, "outputs", current_id),
                         label=f"Output Files ({len(outputs)})",
                         tab_id="tab-outputs",
                         label_class_name="fw-bold text-success",
@@ -823,66 +956,166 @@ def render_level2_details(active_item, component_id, node_map):
         className="px-2 pb-2",
     )
 
-clientside_callback(
-    """
-    function(search_term, content_id) {
-        if (!content_id || typeof content_id.index === 'undefined') {
-            return window.dash_clientside.no_update;
-        }
+@callback(
+    Output({"type": "file-grid", "index": MATCH, "category": MATCH}, "data"),
+    Output({"type": "file-grid", "index": MATCH, "category": MATCH}, "page_count"),
+    Output({"type": "file-grid", "index": MATCH, "category": MATCH}, "page_current"),
+    Input({"type": "file-grid", "index": MATCH, "category": MATCH}, "page_current"),
+    Input({"type": "file-search", "index": MATCH}, "value"),
+    Input({"type": "file-expanded", "index": MATCH, "category": MATCH}, "data"),
+    State({"type": "file-grid", "index": MATCH, "category": MATCH}, "id"),
+    State("store-node-by-id", "data"),
+    prevent_initial_call=True,
+)
+def page_file_grid(page_current, search, expanded, grid_id, node_map):
+    # A new search term starts from the first page.
+    page = 0 if ctx.triggered_id and ctx.triggered_id.get("type") == "file-search" else page_current
+    file_list = cached_file_grid(grid_id["index"], grid_id["category"], node_map)
+    data, page_count = file_grid_page(file_list, search, page, set(expanded or []))
+    return data, page_count, min(page or 0, page_count - 1)
 
-        const term = search_term ? search_term.toLowerCase().trim() : "";
-        const currentIndex = String(content_id.index);
 
-        const rows = document.getElementsByClassName('file-row-item');
+@callback(
+    Output({"type": "file-expanded", "index": MATCH, "category": MATCH}, "data"),
+    Input({"type": "file-action", "index": MATCH, "category": MATCH}, "data"),
+    State({"type": "file-expanded", "index": MATCH, "category": MATCH}, "data"),
+    prevent_initial_call=True,
+)
+def toggle_file_folder(action, expanded):
+    row = (action or {}).get("row") or {}
+    if not action or action.get("action") != "name" or not row.get("expandable"):
+        return dash.no_update
+    expanded = list(expanded or [])
+    if row["id"] in expanded:
+        expanded.remove(row["id"])
+    else:
+        expanded.append(row["id"])
+    return expanded
 
-        for (let i = 0; i < rows.length; i++) {
-            let row = rows[i];
 
-            if (row.id && row.id.includes(currentIndex)) {
-                const fileName = row.getAttribute('data-filename') || "";
-                if (fileName.includes(term)) {
-                    row.style.display = "";
-                } else {
-                    row.style.display = "none";
-                }
-            }
+clientside_callback(
+    """
+    function(active_cell, data) {
+        // Turn a click on an action cell into a file action and clear the
+        // selection, so clicking the same cell again fires again.
+        if (!active_cell || !data || !data[active_cell.row]) {
+            return [window.dash_clientside.no_update, null, []];
         }
-
-        return window.dash_clientside.no_update;
+        const row = data[active_cell.row];
+        return [{action: active_cell.column_id, row: row, ts: Date.now()}, null, []];
     }
     """,
-    Output({"type": "file-search", "index": MATCH}, "id"),
-    Input({"type": "file-search", "index": MATCH}, "value"),
-    State({"type": "level2-detail-content", "index": MATCH}, "id"),
+    Output({"type": "file-action", "index": MATCH, "category": MATCH}, "data"),
+    Output({"type": "file-grid", "index": MATCH, "category": MATCH}, "active_cell"),
+    Output({"type": "file-grid", "index": MATCH, "category": MATCH}, "selected_cells"),
+    Input({"type": "file-grid", "index": MATCH, "category": MATCH}, "active_cell"),
+    State({"type": "file-grid", "index": MATCH, "category": MATCH}, "data"),
     prevent_initial_call=True,
 )
 
 
 
+EXPORT_PATH = os.path.join(TEMP_DOWNLOAD_PATH, "export")
+
+
+def format_export_progress(p: CLIProgress) -> tuple[float, str]:
+    done = f"{p.files_done}/{p.files_total} files" if p.files_total else f"{p.files_done} files"
+    size = f"{format_size(p.bytes_done)} / {format_size(p.bytes_total)}" if p.bytes_total else format_size(p.bytes_done)
+    return round(p.percent or 0, 1), f"{done} · {size}"
+
+
+def export_to_workspace(set_progress, n_clicks, component_id, node_map):
+    if not n_clicks:
+        return dash.no_update
+
+    node_dict = (node_map or {}).get(component_id["index"])
+    if not node_dict:
+        return "Export failed: node not found."
+
+    node = node_from_dict(node_dict)
+    dest = os.path.join(EXPORT_PATH, node.id)
+    on_progress = (lambda p: set_progress(format_export_progress(p))) if set_progress else None
+    try:
+        results = service.export_to_workspace(node, dest, incremental=True, on_progress=on_progress)
+    except Exception as e:
+        return f"Export failed: {e}"
+
+    failed = [r for r in results if not r.ok]
+    reused = sum(1 for r in results if r.reused)
+    summary = f"{len(results) - len(failed) - reused} transferred, {reused} already up to date"
+    if failed:
+        return f"Exported {len(results) - len(failed)}/{len(results)} items to {dest} ({summary}); failed: " + ", ".join(
+            f"{r.remote} ({r.message})" for r in failed[:5]
+        )
+    return f"Exported {len(results)} items to {dest} ({summary})."
+
+
+_export_io = (
+    Output({"type": "export-status", "index": MATCH}, "children"),
+    Input({"type": "btn-export", "index": MATCH}, "n_clicks"),
+    State({"type": "btn-export", "index": MATCH}, "id"),
+    State("store-node-by-id", "data"),
+)
+if background_callback_manager is not None:
+    callback(
+        *_export_io,
+        background=True,
+        running=[
+            (Output({"type": "btn-export", "index": MATCH}, "disabled"), True, False),
+            (Output({"type": "export-progress", "index": MATCH}, "style"), {"display": "flex", "height": "18px"}, {"display": "none"}),
+        ],
+        progress=[
+            Output({"type": "export-progress", "index": MATCH}, "value"),
+            Output({"type": "export-progress", "index": MATCH}, "label"),
+        ],
+        prevent_initial_call=True,
+    )(export_to_workspace)
+else:
+    callback(*_export_io, prevent_initial_call=True)(
+        lambda n_clicks, component_id, node_map: export_to_workspace(None, n_clicks, component_id, node_map)
+    )
+
+
 @callback(
     [
-        Output("download-component", "data"),
+        Output("download-url", "data"),
         Output("download-toast", "is_open"),
         Output("download-toast-body", "children"),
         Output("loading-output-target", "children"),
     ],
     Input(
-        {"type": "btn-download", "index": ALL, "file_name": ALL, "category": ALL, "is_folder": ALL, "vault_id": ALL},
+        {"type": "btn-download", "index": ALL, "file_name": ALL, "category": ALL, "is_folder": ALL, "vault_id": ALL, "modified_on": ALL},
         "n_clicks",
     ),
     State(
-        {"type": "btn-download", "index": ALL, "file_name": ALL, "category": ALL, "is_folder": ALL, "vault_id": ALL},
+        {"type": "btn-download", "index": ALL, "file_name": ALL, "category": ALL, "is_folder": ALL, "vault_id": ALL, "modified_on": ALL},
         "id",
     ),
+    Input({"type": "file-action", "index": ALL, "category": ALL}, "data"),
     prevent_initial_call=True,
 )
-def handle_file_download(n_clicks_list, id_list):
-    if not n_clicks_list or not any(n_clicks_list):
-        return dash.no_update, dash.no_update, dash.no_update, dash.no_update
+def handle_file_download(n_clicks_list, id_list, _file_actions):
     info = None
-
-    if isinstance(ctx.triggered_id, dict):
-        info = ctx.triggered_id
+    trigger = ctx.triggered_id if isinstance(ctx.triggered_id, dict) else {}
+
+    if trigger.get("type") == "file-action":
+        # Action cell clicked in a file grid
+        action = ctx.triggered[0]["value"] if ctx.triggered else None
+        if not action or action.get("action") != "download":
+            return dash.no_update, dash.no_update, dash.no_update, dash.no_update
+        row = action.get("row") or {}
+        info = {
+            "index": row.get("id"),
+            "vault_id": row.get("vault_id"),
+            "modified_on": row.get("modified_on"),
+            "category": trigger.get("category"),
+            "file_name": row.get("file_name"),
+            "is_folder": row.get("is_folder"),
+        }
+    elif not n_clicks_list or not any(n_clicks_list):
+        return dash.no_update, dash.no_update, dash.no_update, dash.no_update
+    elif trigger:
+        info = trigger
 
     # n_clicks is the largest button
     if not info:
@@ -893,6 +1126,8 @@ def handle_file_download(n_clicks_list, id_list):
 
     file_id = info.get("index")
     vault_id = info.get("vault_id")
+    # Button ids carry "" / "None" for missing values.
+    modified_on = info.get("modified_on") if info.get("modified_on") not in ("", "None") else None
     category = info.get("category", "files")
     file_name = info.get("file_name")
     is_folder = bool(info.get("is_folder", False))
@@ -901,61 +1136,26 @@ def handle_file_download(n_clicks_list, id_list):
         return dash.no_update, True, "Download failed: cannot resolve clicked file id.", ""
 
     try:
-        os.makedirs(TEMP_DOWNLOAD_PATH, exist_ok=True)
-
-        # Create an isolated work directory for this download request.
-        request_id = str(uuid.uuid4().hex.upper())
-        request_dir = os.path.join(TEMP_DOWNLOAD_PATH, request_id)
-        os.makedirs(request_dir, exist_ok=True)
-
-        # Target path inside the isolated request directory.
-        target_path = os.path.join(request_dir, file_name) if file_name else None
-
         if is_folder:
-            service.download_to_server_via_cli(ans_data_id=file_id, dest=request_dir)
-
-            if not target_path or not os.path.exists(target_path):
-                return (
-                    dash.no_update,
-                    True,
-                    f"[{category.upper()}] Downloaded folder not found: {file_name}",
-                    "",
-                )
-
-            if os.path.isdir(target_path):
-                # Create zip outside the source folder but still inside the same request directory.
-                zip_base = os.path.join(request_dir, Path(target_path).name)
-                zip_path = shutil.make_archive(
-                    base_name=zip_base,
-                    format="zip",
-                    root_dir=os.path.dirname(target_path),
-                    base_dir=os.path.basename(target_path),
-                )
-                return (
-                    dcc.send_file(zip_path),
-                    True,
-                    f"[{category.upper()}] Folder zipped; download started.",
-                    "",
-                )
+            # Archive is assembled on the fly by the streaming route; no staging directory.
+            return (
+                build_download_url({"kind": "folder", "folder_id": file_id, "file_name": file_name or file_id}),
+                True,
+                f"[{category.upper()}] Folder zip download started.",
+                "",
+            )
         else:
-            if not target_path:
+            if not vault_id or vault_id == "None":
                 return (
                     dash.no_update,
                     True,
-                    f"[{category.upper()}] File name is missing.",
-                    "",
-                )
-            service.download_to_server_via_odata(vault_id=vault_id, dest=target_path)
-            if not os.path.exists(target_path):
-                return (
-                    dash.no_update,
-                    True,
-                    f"[{category.upper()}] Download failed: file not found after OData download.",
+                    f"[{category.upper()}] File has no vault content.",
                     "",
                 )
 
+            # The browser pulls the bytes from the streaming route; nothing is staged on the server.
             return (
-                dcc.send_file(target_path),
+                build_download_url({"kind": "vault", "vault_id": vault_id, "version": modified_on, "file_name": file_name or vault_id}),
                 True,
                 f"[{file_name}] Download started.",
                 "",
@@ -965,5 +1165,123 @@ def handle_file_download(n_clicks_list, id_list):
         return dash.no_update, True, f"Transfer failed: {e}", ""
 
 
+clientside_callback(
+    """
+    function(url) {
+        if (!url) {
+            return window.dash_clientside.no_update;
+        }
+        const link = document.createElement('a');
+        link.href = url;
+        link.setAttribute('download', '');
+        document.body.appendChild(link);
+        link.click();
+        document.body.removeChild(link);
+        return window.dash_clientside.no_update;
+    }
+    """,
+    Output("download-url", "id"),
+    Input("download-url", "data"),
+    prevent_initial_call=True,
+)
+
+
+# --- [5. Streaming Download Routes] ---
+download_signer = URLSafeTimedSerializer(DOWNLOAD_URL_SECRET, salt="minerva-download")
+
+# Upstream headers relayed to the browser as-is.
+PASSTHROUGH_HEADERS = ("Content-Length", "Content-Range", "Accept-Ranges", "ETag", "Last-Modified")
+
+
+def build_download_url(payload: dict) -> str:
+    """Sign a download payload into a short-lived URL served by stream_download()."""
+    return f"/download/{download_signer.dumps(payload)}"
+
+
+def content_disposition(file_name: str) -> str:
+    fallback = file_name.encode("ascii", "replace").decode("ascii").replace('"', "")
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(file_name)}"
+
+
+@app.server.route("/download/<token>")
+def stream_download(token: str):
+    try:
+        payload = download_signer.loads(token, max_age=DOWNLOAD_URL_TTL)
+    except SignatureExpired:
+        abort(410)
+    except BadSignature:
+        abort(403)
+
+    kind = payload.get("kind")
+
+    if kind == "folder":
+        zip_name = f"{payload.get('file_name') or payload['folder_id']}.zip"
+        return Response(
+            service.iter_folder_zip(payload["folder_id"], payload.get("file_name") or payload["folder_id"]),
+            headers={"Content-Disposition": content_disposition(zip_name)},
+            mimetype="application/zip",
+            direct_passthrough=True,
+        )
+
+    if kind == "vault":
+        vault_id = payload["vault_id"]
+        file_name = payload.get("file_name") or vault_id
+        range_header = request.headers.get("Range")
+        cache_key = download_cache.key_for(vault_id, payload.get("version"))
+
+        cached = download_cache.get(cache_key)
+        fill_cache = False
+        if cached is None and not range_header:
+            fill_cache = download_cache.claim(cache_key)
+            if not fill_cache:
+                # Another request is transferring this file. Small files land in the
+                # cache quickly; otherwise stream from upstream instead of waiting
+                # on how fast the other request's client reads.
+                cached = download_cache.wait(cache_key, timeout=DOWNLOAD_CACHE_WAIT)
+
+        if cached:
+            return send_file(cached, as_attachment=True, download_name=file_name, conditional=True)
+
+        try:
+            upstream = service.open_download_via_odata(vault_id, range_header=range_header)
+            if upstream.status_code not in (200, 206):
+                status = upstream.status_code
+                upstream.close()
+                abort(416 if status == 416 else 502)
+
+            headers = {k: upstream.headers[k] for k in PASSTHROUGH_HEADERS if k in upstream.headers}
+            headers["Content-Disposition"] = content_disposition(file_name)
+
+            def generate():
+                try:
+                    for chunk in upstream.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        if chunk:
+                            yield chunk
+                finally:
+                    upstream.close()
+
+            body = generate()
+            if fill_cache and upstream.status_code == 200:
+                length = upstream.headers.get("Content-Length")
+                # From here on the claim is released by the tee iterator.
+                body = download_cache.tee(cache_key, body, expected_size=int(length) if length else None)
+            elif fill_cache:
+                download_cache.abandon(cache_key)
+        except BaseException:
+            if fill_cache:
+                download_cache.abandon(cache_key)
+            raise
+
+        return Response(
+            body,
+            status=upstream.status_code,
+            headers=headers,
+            mimetype="application/octet-stream",
+            direct_passthrough=True,
+        )
+
+    abort(400)
+
+
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
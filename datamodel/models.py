@@ -195,6 +195,18 @@ class FileNode:
     depth: int = 0
     vault_id: Optional[str] = None
     classification: Optional[str] = None
+    modified_on: Optional[str] = None
+    has_children: Optional[bool] = None  # set for folders whose children were not loaded yet (lazy trees)
+
+
+@dataclass(frozen=True)
+class FileHit:
+    file: FileNode
+    owner_id: str
+    owner_type: str
+    owner_label: Optional[str] = None
+    category: str = "inputs"
+    score: float = 0.0
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,261 @@
+import asyncio
+import contextvars
+from typing import Any, AsyncIterator, Callable, Iterable, List, Optional, Union
+from weakref import WeakKeyDictionary
+
+from .cli import (
+    CLIFileStatus,
+    CLIItemResult,
+    MinervaCLIClient,
+    MinervaCliError,
+    OverwriteMode,
+    _listify,
+    item_results_from_error,
+    parse_file_status,
+    parse_item_results,
+)
+
+DEFAULT_MAX_CONCURRENCY = 16
+_READ_CHUNK = 64 * 1024
+
+# Receives each stdout line of CLI processes started in the current context.
+_line_sink: contextvars.ContextVar[Optional[Callable[[str], None]]] = contextvars.ContextVar(
+    "minerva_cli_line_sink", default=None
+)
+
+
+class AsyncMinervaCLIClient(MinervaCLIClient):
+    """
+    asyncio counterpart of MinervaCLIClient, built on asyncio subprocesses.
+
+    Every command method of MinervaCLIClient only composes arguments and
+    returns self._run(...); here _run is a coroutine, so the same methods
+    return awaitables:
+
+        aclient = AsyncMinervaCLIClient(base_url=..., database=..., username=..., password=...)
+        out = await aclient.download("ans_Data/123", local=dest)
+        results = await asyncio.gather(*(aclient.fetch_status(local=d) for d in dirs))
+
+    - stdout is read incrementally; iter_lines() yields it line by line
+      while the process runs.
+    - A timeout or task cancellation kills the process.
+    - At most `max_concurrency` processes run at once per event loop.
+    """
+
+    def __init__(self, *, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, **kwargs: Any):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be > 0")
+        super().__init__(**kwargs)
+        self.max_concurrency = max_concurrency
+        self._semaphores: "WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = self._semaphores.get(loop)
+        if sem is None:
+            sem = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return sem
+
+    # -------------------------------------------------------------------
+    # Core execution
+    # -------------------------------------------------------------------
+    async def _run(
+        self,
+        command: str,
+        args: List[str],
+        *,
+        parse_json: bool = False,
+        timeout: Optional[float] = None,
+        cwd: Optional[str] = None,
+    ) -> Union[str, Any]:
+        try:
+            return await self._exec(command, args, parse_json=parse_json, timeout=timeout, cwd=cwd)
+        except MinervaCliError as e:
+            retry_args = self._session_retry_args(args, e)
+            if retry_args is None:
+                raise
+            return await self._exec(command, retry_args, parse_json=parse_json, timeout=timeout, cwd=cwd)
+
+    async def _exec(
+        self,
+        command: str,
+        args: List[str],
+        *,
+        parse_json: bool = False,
+        timeout: Optional[float] = None,
+        cwd: Optional[str] = None,
+    ) -> Union[str, Any]:
+        full_cmd = [self.exe, command] + args
+        eff_timeout = self.default_timeout if timeout is None else timeout
+        sink = _line_sink.get()
+        # Lines handed to a sink are not kept unless the caller needs the output.
+        keep = sink is None or parse_json
+
+        async with self._semaphore():
+            self._log_execute(full_cmd)
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *full_cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    env=self._env_for(full_cmd),
+                    cwd=cwd,
+                )
+            except OSError as e:
+                raise MinervaCliError(
+                    f"{self._pfx}CLI could not start: {command}",
+                    returncode=-1,
+                    stdout="",
+                    stderr=str(e),
+                    command=full_cmd,
+                ) from e
+
+            stdout_parts: List[str] = []
+            stderr_parts: List[bytes] = []
+
+            async def read_stdout():
+                pending = b""
+                while True:
+                    chunk = await proc.stdout.read(_READ_CHUNK)
+                    if not chunk:
+                        break
+                    pending += chunk
+                    *lines, pending = pending.split(b"\n")
+                    for raw in lines:
+                        self._emit(raw + b"\n", sink, stdout_parts if keep else None)
+                if pending:
+                    self._emit(pending, sink, stdout_parts if keep else None)
+
+            async def read_stderr():
+                stderr_parts.append(await proc.stderr.read())
+
+            try:
+                await asyncio.wait_for(asyncio.gather(read_stdout(), read_stderr(), proc.wait()), eff_timeout)
+            except asyncio.TimeoutError as e:
+                await self._kill(proc)
+                raise MinervaCliError(
+                    f"{self._pfx}CLI timed out: {command}",
+                    returncode=-1,
+                    stdout="".join(stdout_parts),
+                    stderr=b"".join(stderr_parts).decode("utf-8", "replace"),
+                    command=full_cmd,
+                ) from e
+            except BaseException:
+                # Cancelled (or the reader failed): never leave the process behind.
+                await self._kill(proc)
+                raise
+
+        return self._result(
+            command,
+            full_cmd,
+            proc.returncode,
+            "".join(stdout_parts),
+            b"".join(stderr_parts).decode("utf-8", "replace"),
+            parse_json=parse_json,
+        )
+
+    @staticmethod
+    def _emit(raw: bytes, sink: Optional[Callable[[str], None]], keep: Optional[List[str]]) -> None:
+        line = raw.decode("utf-8", "replace")
+        if keep is not None:
+            keep.append(line)
+        if sink is not None:
+            sink(line.rstrip("\r\n"))
+
+    @staticmethod
+    async def _kill(proc: asyncio.subprocess.Process) -> None:
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+        await proc.wait()
+
+    # -------------------------------------------------------------------
+    # Streaming
+    # -------------------------------------------------------------------
+    async def iter_lines(self, command: str, *args: Any, **kwargs: Any) -> AsyncIterator[str]:
+        """
+        Run `self.<command>(*args, **kwargs)` and yield its stdout lines as
+        they arrive; raises the command's MinervaCliError at the end. Lines
+        are not buffered for the return value, so long transfers stay flat
+        in memory. Leaving the loop early kills the process.
+
+            async for line in aclient.iter_lines("download", remote, local=dest):
+                ...
+        """
+        method = getattr(self, command, None)
+        if not callable(method) or command.startswith("_"):
+            raise ValueError(f"Unknown CLI command: {command!r}")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        async def produce():
+            token = _line_sink.set(queue.put_nowait)
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                _line_sink.reset(token)
+                queue.put_nowait(done)
+
+        task = asyncio.ensure_future(produce())
+        try:
+            while True:
+                line = await queue.get()
+                if line is done:
+                    break
+                yield line
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except BaseException:
+                    pass
+
+    # -------------------------------------------------------------------
+    # Commands that post-process output
+    # -------------------------------------------------------------------
+    async def sign_in(
+        self,
+        *,
+        force: bool = False,
+        local: Optional[str] = None,
+        timeout: Optional[float] = None,
+        parse_json: bool = False,
+    ) -> Union[str, Any]:
+        """Async sign_in(); the workspace session is recorded once it succeeded."""
+        result = await self._run("sign-in", self._sign_in_args(force=force, local=local), timeout=timeout, parse_json=parse_json)
+        if local:
+            self._record_session(local)
+        return result
+
+    async def download_items(
+        self,
+        remote: Union[str, Iterable[str]],
+        *,
+        local: Optional[str] = None,
+        overwrite: OverwriteMode = "Overwrite",
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> List[CLIItemResult]:
+        """Async download_items(): one process, one CLIItemResult per remote."""
+        remotes = _listify(remote)
+        try:
+            payload = await self.download(remotes, local=local, overwrite=overwrite, timeout=timeout, parse_json=True, **kwargs)
+        except MinervaCliError as e:
+            return item_results_from_error(e, remotes)
+        return parse_item_results(payload, remotes, default_ok=True)
+
+    async def file_status(
+        self,
+        *,
+        glob: Union[str, Iterable[str], None] = None,
+        local: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> List[CLIFileStatus]:
+        """Async file_status()."""
+        payload = await self.fetch_status(glob=glob, local=local, timeout=timeout, parse_json=True)
+        return parse_file_status(payload, local=local)
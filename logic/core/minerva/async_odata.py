@@ -0,0 +1,169 @@
+import os
+import copy
+import itertools
+import asyncio
+import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, BinaryIO, Callable, Iterable, List, Optional, TypeVar, Union
+from weakref import WeakKeyDictionary
+
+from .odata import Json, MinervaODataClient, ODataPage
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class AsyncMinervaODataClient:
+    """
+    asyncio counterpart of MinervaODataClient.
+
+    Calls run on a private, bounded thread pool (one requests.Session per
+    worker) and share the sync client's ODataAuth, so a token obtained by
+    either side is used by both and a 401 triggers a single re-auth. At most
+    `max_concurrency` requests are in flight per event loop.
+
+    From synchronous code (e.g. Dash callbacks) use run() or gather_sync():
+
+        aclient = AsyncMinervaODataClient(service.odata)
+        rows = aclient.gather_sync(aclient.get("Ans_Data", i) for i in ids)
+    """
+
+    def __init__(self, client: MinervaODataClient, *, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be > 0")
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._start_pool()
+        self._semaphores: "WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = WeakKeyDictionary()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def close(self) -> None:
+        """Stop the worker threads and close their sessions."""
+        self._executor.shutdown(wait=True)
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+    def __enter__(self) -> "AsyncMinervaODataClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _start_pool(self) -> None:
+        self._pid = os.getpid()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="odata-async")
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Worker threads do not survive fork() (e.g. Dash background callbacks); start fresh ones.
+        if self._pid != os.getpid():
+            self._start_pool()
+        return self._executor
+
+    def _worker_client(self) -> MinervaODataClient:
+        """Per-thread copy of the sync client with its own session (shared auth)."""
+        client = getattr(self._local, "client", None)
+        if client is None:
+            session = requests.Session()
+            with self._sessions_lock:
+                self._sessions.append(session)
+            client = copy.copy(self.client)
+            client.session = session
+            self._local.client = client
+        return client
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = self._semaphores.get(loop)
+        if sem is None:
+            sem = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return sem
+
+    async def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        def work():
+            return getattr(self._worker_client(), method)(*args, **kwargs)
+
+        async with self._semaphore():
+            return await asyncio.get_running_loop().run_in_executor(self._pool(), work)
+
+    # ------------------------------------------------------------------
+    # Public API (mirrors MinervaODataClient)
+    # ------------------------------------------------------------------
+
+    async def list(self, resource: str, **kwargs: Any) -> List[Json]:
+        return await self._call("list", resource, **kwargs)
+
+    async def list_page(self, resource: str, **kwargs: Any) -> ODataPage:
+        return await self._call("list_page", resource, **kwargs)
+
+    async def count(self, resource: str, **kwargs: Any) -> Optional[int]:
+        return await self._call("count", resource, **kwargs)
+
+    async def get(self, resource: str, resource_id: str, **kwargs: Any) -> Json:
+        return await self._call("get", resource, resource_id, **kwargs)
+
+    async def list_related(self, resource: str, resource_id: str, related: str, **kwargs: Any) -> List[Json]:
+        return await self._call("list_related", resource, resource_id, related, **kwargs)
+
+    async def download(self, vault_id: str, dest: Union[str, BinaryIO], **kwargs: Any) -> Any:
+        return await self._call("download", vault_id, dest, **kwargs)
+
+    async def iter_list(self, entity_set: str, **kwargs: Any) -> AsyncIterator[Json]:
+        """
+        Async version of iter_list().
+
+        The sync generator runs on the worker pool with its own session and is
+        advanced one page at a time; it is closed if iteration stops early.
+        """
+        page_size = kwargs.get("page_size", 100)
+        client = copy.copy(self.client)
+        client.session = requests.Session()
+        gen = client.iter_list(entity_set, **kwargs)
+        loop = asyncio.get_running_loop()
+
+        try:
+            while True:
+                async with self._semaphore():
+                    page = await loop.run_in_executor(self._pool(), lambda: list(itertools.islice(gen, page_size)))
+                for item in page:
+                    yield item
+                if len(page) < page_size:
+                    break
+        finally:
+            await loop.run_in_executor(self._pool(), gen.close)
+            client.session.close()
+
+    # ------------------------------------------------------------------
+    # Sync wrappers
+    # ------------------------------------------------------------------
+
+    def run(self, aw: Awaitable[T]) -> T:
+        """Run a coroutine to completion from synchronous code."""
+        async def main():
+            return await aw
+        return asyncio.run(main())
+
+    def gather_sync(self, aws: Iterable[Awaitable[Any]], *, return_exceptions: bool = False) -> List[Any]:
+        """Run awaitables concurrently from synchronous code; results keep input order."""
+        aws = list(aws)
+
+        async def main():
+            return await asyncio.gather(*aws, return_exceptions=return_exceptions)
+        return asyncio.run(main())
+
+    def map_sync(self, fn: Callable[[T], Awaitable[Any]], items: Iterable[T]) -> List[Any]:
+        """gather_sync() over fn(item) for each item."""
+        return self.gather_sync(fn(item) for item in items)
@@ -0,0 +1,264 @@
+import re
+import json
+import uuid
+from dataclasses import dataclass
+from urllib.parse import urlencode, quote
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from .odata import MinervaODataClient
+
+Json = Dict[str, Any]
+Params = Dict[str, Any]
+Headers = Dict[str, str]
+
+DEFAULT_MAX_BATCH_SIZE = 100
+
+_BOUNDARY_RE = re.compile(r'boundary="?([^";]+)"?', re.IGNORECASE)
+_BLANK_LINE_RE = re.compile(r"\r?\n\r?\n")
+_STATUS_LINE_RE = re.compile(r"HTTP/\d\.\d\s+(\d{3})")
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Outcome of one batched operation. `error` is set when it failed."""
+    status: int
+    data: Any = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class _BatchOp:
+    method: str
+    path: str
+    params: Optional[Params] = None
+    body: Optional[Json] = None
+    headers: Optional[Headers] = None
+    transform: Optional[Callable[[Any], Any]] = None
+
+
+class ODataBatch:
+    """
+    Collects OData operations and sends them as `$batch` multipart requests.
+
+    Each queue method returns the operation's index into the list returned by
+    execute(). Operations are sent as independent parts (not a change set),
+    so one failing does not roll back the others. Batches larger than
+    `max_batch_size` are split into several round trips, in order.
+
+        batch = client.batch()
+        a = batch.get("Ans_Project", pid)
+        b = batch.list_related("Ans_Project", pid, "Ans_ProjectSR")
+        results = batch.execute()
+        results[b].data  # -> List[Json], same shape as list_related()
+    """
+
+    def __init__(self, client: "MinervaODataClient", *, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE):
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be > 0")
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self._ops: List[_BatchOp] = []
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    def _add(self, op: _BatchOp) -> int:
+        self._ops.append(op)
+        return len(self._ops) - 1
+
+    # ------------------------------------------------------------------
+    # Queue operations (mirror MinervaODataClient)
+    # ------------------------------------------------------------------
+
+    def list(
+        self,
+        resource: str,
+        *,
+        select: Optional[Union[str, Iterable[str]]] = None,
+        filter: Optional[str] = None,
+        expand: Optional[str] = None,
+        top: Optional[int] = None,
+        skip: Optional[int] = None,
+        orderby: Optional[str] = None,
+        count: Optional[bool] = None,
+    ) -> int:
+        params = self.client._build_odata_params(
+            select=select, filter=filter, expand=expand, top=top, skip=skip, orderby=orderby, count=count,
+        )
+        return self._add(_BatchOp("GET", resource, params=params, transform=self.client._extract_values))
+
+    def get(
+        self,
+        resource: str,
+        resource_id: str,
+        *,
+        select: Optional[Union[str, Iterable[str]]] = None,
+        expand: Optional[str] = None,
+    ) -> int:
+        params = self.client._build_odata_params(select=select, expand=expand)
+        return self._add(_BatchOp("GET", f"{resource}('{resource_id}')", params=params, transform=_as_dict))
+
+    def list_related(
+        self,
+        resource: str,
+        resource_id: str,
+        related: str,
+        *,
+        select: Optional[Union[str, Iterable[str]]] = None,
+        filter: Optional[str] = None,
+        expand: Optional[str] = "related_id($select=id, keyed_name)",
+        top: Optional[int] = None,
+        skip: Optional[int] = None,
+        orderby: Optional[str] = None,
+        count: Optional[bool] = None,
+    ) -> int:
+        params = self.client._build_odata_params(
+            select=select, filter=filter, expand=expand, top=top, skip=skip, orderby=orderby, count=count,
+        )
+        path = f"{resource}('{resource_id}')/{related}"
+        return self._add(_BatchOp("GET", path, params=params, transform=self.client._extract_related))
+
+    def create(self, resource: str, payload: Json) -> int:
+        return self._add(_BatchOp("POST", resource, body=payload, transform=_as_dict))
+
+    def patch(self, resource: str, resource_id: str, payload: Json) -> int:
+        return self._add(_BatchOp("PATCH", f"{resource}('{resource_id}')", body=payload, transform=_as_dict))
+
+    def delete(self, resource: str, resource_id: str, *, purge: bool = False) -> int:
+        headers = {"@aras.action": "purge"} if purge else None
+        return self._add(_BatchOp("DELETE", f"{resource}('{resource_id}')", headers=headers))
+
+    # ------------------------------------------------------------------
+    # Execute
+    # ------------------------------------------------------------------
+
+    def execute(self) -> List[BatchResult]:
+        """
+        Send all queued operations and return one BatchResult per operation,
+        in the order they were added. The queue is cleared afterwards.
+
+        If a whole `$batch` round trip fails, every operation in that chunk
+        gets an error result; earlier chunks keep their results.
+        """
+        ops, self._ops = self._ops, []
+        results: List[BatchResult] = []
+        for start in range(0, len(ops), self.max_batch_size):
+            results.extend(self._send(ops[start:start + self.max_batch_size]))
+        return results
+
+    def _send(self, ops: List[_BatchOp]) -> List[BatchResult]:
+        boundary = f"batch_{uuid.uuid4().hex}"
+        body = _encode_batch(ops, boundary)
+
+        response = self.client.request_raw(
+            "POST",
+            "$batch",
+            data=body,
+            extra_headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+        )
+        for op in ops:
+            if op.method != "GET":
+                self.client._invalidate(op.path)
+
+        if response.status_code not in (200, 202):
+            error = f"Batch Error {response.status_code}: {response.text}"
+            return [BatchResult(status=response.status_code, error=error) for _ in ops]
+
+        parts = _decode_batch(response.headers.get("Content-Type", ""), response.content)
+        if len(parts) != len(ops):
+            error = f"Batch response has {len(parts)} parts for {len(ops)} operations"
+            return [BatchResult(status=response.status_code, error=error) for _ in ops]
+
+        return [_to_result(op, status, text) for op, (status, text) in zip(ops, parts)]
+
+
+# ----------------------------------------------------------------------
+# Multipart encoding / decoding
+# ----------------------------------------------------------------------
+
+def _as_dict(data: Any) -> Json:
+    return data if isinstance(data, dict) else {"value": data}
+
+
+def _encode_batch(ops: List[_BatchOp], boundary: str) -> bytes:
+    lines: List[str] = []
+    for i, op in enumerate(ops, start=1):
+        url = op.path
+        if op.params:
+            url += "?" + urlencode(op.params, quote_via=quote, safe="$(),'=@:")
+
+        lines += [
+            f"--{boundary}",
+            "Content-Type: application/http",
+            "Content-Transfer-Encoding: binary",
+            f"Content-ID: {i}",
+            "",
+            f"{op.method} {url} HTTP/1.1",
+            "Accept: application/json",
+        ]
+        for k, v in (op.headers or {}).items():
+            lines.append(f"{k}: {v}")
+
+        if op.body is not None:
+            lines += ["Content-Type: application/json", "", json.dumps(op.body)]
+        else:
+            lines.append("")
+        lines.append("")
+
+    lines.append(f"--{boundary}--")
+    lines.append("")
+    return "\r\n".join(lines).encode("utf-8")
+
+
+def _decode_batch(content_type: str, content: bytes) -> List[Tuple[int, str]]:
+    """Split a multipart/mixed batch response into (status, body) per operation."""
+    match = _BOUNDARY_RE.search(content_type)
+    if not match:
+        return []
+    text = content.decode("utf-8", errors="replace")
+
+    out: List[Tuple[int, str]] = []
+    for part in text.split(f"--{match.group(1)}")[1:]:
+        if part.startswith("--"):
+            break  # Closing delimiter
+
+        part_headers, http = _split_blank(part.lstrip("\r\n"))
+
+        # Change set responses nest another multipart body.
+        nested = re.search(r"content-type:\s*(multipart/mixed[^\r\n]*)", part_headers, re.IGNORECASE)
+        if nested:
+            out.extend(_decode_batch(nested.group(1), http.encode("utf-8")))
+            continue
+
+        status_block, body = _split_blank(http)
+        status = _STATUS_LINE_RE.match(status_block.strip())
+        out.append((int(status.group(1)) if status else 0, body.strip()))
+    return out
+
+
+def _split_blank(text: str) -> Tuple[str, str]:
+    """Split at the first blank line: (headers, rest)."""
+    parts = _BLANK_LINE_RE.split(text, maxsplit=1)
+    return (parts[0], parts[1]) if len(parts) == 2 else (parts[0], "")
+
+
+def _to_result(op: _BatchOp, status: int, text: str) -> BatchResult:
+    if not 200 <= status < 300:
+        return BatchResult(status=status, error=f"API Error {status}: {text}")
+
+    if not text or status == 204:
+        data: Any = {"status": "success", "code": status} if op.method != "DELETE" else None
+    else:
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            return BatchResult(status=status, error=f"Invalid JSON response: {text}")
+
+    if op.method == "DELETE":
+        return BatchResult(status=status)
+    return BatchResult(status=status, data=op.transform(data) if op.transform else data)
@@ -1,10 +1,16 @@
 import os
+import re
 import json
+import uuid
 import shlex
+import hashlib
+import tempfile
 import logging
+import threading
 import subprocess
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Literal, Optional, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Literal, Optional, Union
 
 # -------------------------------------------------------------------
 # Logging
@@ -24,6 +30,15 @@ SelectMode = Literal["SaveFile", "SelectFile", "SelectFolder", "SelectFileFolder
 # -------------------------------------------------------------------
 # Exception
 # -------------------------------------------------------------------
+# CLI messages for an expired, revoked or missing sign-in.
+_AUTH_FAILURE_RE = re.compile(
+    r"unauthori[sz]ed|\b401\b|not (?:signed|logged) in|(?:sign[- ]?in|log[- ]?in|authentication) (?:is )?required"
+    r"|session (?:has )?(?:expired|been revoked|is invalid|not found)|(?:invalid|expired|revoked) (?:session|token)"
+    r"|authentication failed",
+    re.IGNORECASE,
+)
+
+
 class MinervaCliError(RuntimeError):
     """Raised when Minerva CLI execution fails, with debug metadata."""
 
@@ -42,6 +57,11 @@ class MinervaCliError(RuntimeError):
         self.stderr = stderr
         self.command = command
 
+    @property
+    def is_auth_failure(self) -> bool:
+        """True if the CLI rejected the credentials or workspace session, not the command."""
+        return self.returncode > 0 and bool(_AUTH_FAILURE_RE.search(f"{self.stderr}\n{self.stdout}"))
+
     def __str__(self) -> str:
         cmd = " ".join(shlex.quote(str(x)) for x in self.command)
         return (
@@ -95,6 +115,203 @@ class CLIAuthOptions:
     certconfig: Optional[str] = None
 
 
+# -------------------------------------------------------------------
+# Per-item results of multi-remote commands
+# -------------------------------------------------------------------
+@dataclass(frozen=True)
+class CLIItemResult:
+    """Outcome of one --remote of a multi-remote command (e.g. download)."""
+    remote: str
+    ok: bool
+    local_path: Optional[str] = None
+    message: Optional[str] = None
+    raw: Optional[Dict[str, Any]] = None
+    reused: bool = False  # Already up to date locally; no transfer was made.
+
+
+_ITEM_LIST_KEYS = ("items", "results", "files", "downloaded", "data")
+_ITEM_PATH_KEYS = ("local_path", "localPath", "local", "path")
+_ITEM_FAILED = ("error", "failed", "failure", "fault")
+
+
+def _json_entries(payload: Any) -> List[Dict[str, Any]]:
+    """Find the list of per-item records in a CLI JSON document."""
+    if isinstance(payload, list):
+        return [e for e in payload if isinstance(e, dict)]
+    if isinstance(payload, dict):
+        for key in _ITEM_LIST_KEYS:
+            if isinstance(payload.get(key), list):
+                return _json_entries(payload[key])
+        return [payload]
+    return []
+
+
+def parse_item_results(
+    payload: Any,
+    remotes: Iterable[str],
+    *,
+    default_ok: bool,
+    default_message: Optional[str] = None,
+) -> List[CLIItemResult]:
+    """
+    Map a CLI JSON document to one CLIItemResult per requested remote.
+
+    Records are matched to a remote when the remote's id (the part after
+    "type/") appears in any of their string values. Remotes without a record
+    get `default_ok` / `default_message` (the process exit status).
+    """
+    remotes = _listify(remotes)
+    matched: Dict[str, CLIItemResult] = {}
+
+    for entry in _json_entries(payload):
+        text = " ".join(str(v) for v in entry.values() if isinstance(v, (str, int))).lower()
+        for remote in remotes:
+            if remote in matched or remote.rsplit("/", 1)[-1].lower() not in text:
+                continue
+            status = str(entry.get("status") or entry.get("result") or entry.get("state") or "").lower()
+            error = entry.get("error")
+            if error is None and any(word in status for word in _ITEM_FAILED):
+                error = entry.get("message") or status
+            matched[remote] = CLIItemResult(
+                remote=remote,
+                ok=error is None,
+                local_path=next((str(entry[k]) for k in _ITEM_PATH_KEYS if entry.get(k)), None),
+                message=str(error) if error is not None else (status or None),
+                raw=entry,
+            )
+            break
+
+    return [
+        matched.get(remote) or CLIItemResult(remote=remote, ok=default_ok, message=default_message)
+        for remote in remotes
+    ]
+
+
+def last_json_document(text: str) -> Any:
+    """
+    The last JSON document in `text`, e.g. the summary a CLI prints after
+    progress lines; None if there is none. Documents must start a line.
+    """
+    decoder = json.JSONDecoder()
+    end = len(text)
+    while end > 0:
+        start = max(text.rfind("\n{", 0, end), text.rfind("\n[", 0, end))
+        pos = start + 1 if start >= 0 else 0
+        if text[pos:pos + 1] in ("{", "["):
+            try:
+                payload, stop = decoder.raw_decode(text, pos)
+            except json.JSONDecodeError:
+                pass
+            else:
+                if not text[stop:].strip():
+                    return payload
+        if start < 0:
+            return None
+        end = start
+    return None
+
+
+def item_results_from_error(error: MinervaCliError, remotes: List[str]) -> List[CLIItemResult]:
+    """
+    Per-remote results for a multi-remote command that raised. When stdout
+    is not pure JSON (e.g. progress lines first), the last JSON document in
+    it is used; remotes it does not cover are reported as failed.
+    """
+    payload = last_json_document(error.stdout or "")
+    if error.returncode == 0:
+        if payload is None:
+            return parse_item_results(None, remotes, default_ok=False, default_message="unparseable CLI output")
+        return parse_item_results(payload, remotes, default_ok=False, default_message="not reported by the CLI")
+    message = (error.stderr or error.stdout or str(error)).strip().splitlines()
+    return parse_item_results(payload, remotes, default_ok=False, default_message=message[-1] if message else None)
+
+
+@dataclass(frozen=True)
+class CLIFileStatus:
+    """
+    One local file reported by fetch-status. `up_to_date` is None when the
+    record says nothing about freshness (neither a status nor both versions).
+    """
+    local_path: str
+    remote: Optional[str] = None
+    local_version: Optional[str] = None
+    remote_version: Optional[str] = None
+    status: Optional[str] = None
+    up_to_date: Optional[bool] = None
+    raw: Optional[Dict[str, Any]] = None
+
+
+_STATUS_FLAG_KEYS = ("upToDate", "up_to_date", "isLatest", "is_latest", "latest", "current")
+_STATUS_REMOTE_KEYS = ("remote", "id", "itemId", "item_id", "config_id")
+_STATUS_LOCAL_VERSION_KEYS = ("localVersion", "local_version", "localGeneration", "local_generation", "version", "generation")
+_STATUS_REMOTE_VERSION_KEYS = (
+    "remoteVersion", "remote_version", "latestVersion", "latest_version",
+    "remoteGeneration", "remote_generation", "serverVersion", "server_version",
+)
+# Statuses are compared whole, after dropping case, spaces and punctuation
+# ("Up-to-date" -> "uptodate"); anything negated ("not current") is stale.
+_STATUS_STALE = {
+    "outdated", "outofdate", "stale", "modified", "changed", "conflict", "missing", "new",
+    "behind", "deleted", "updated", "outofsync",
+}
+_STATUS_FRESH = {"uptodate", "current", "unchanged", "latest", "synced", "insync", "same"}
+_STATUS_NEGATIONS = ("not", "no")
+
+
+def _status_freshness(status: str) -> Optional[bool]:
+    words = re.findall(r"[a-z0-9]+", status.lower())
+    if not words:
+        return None
+    if words[0] in _STATUS_NEGATIONS:
+        return False if "".join(words[1:]) in _STATUS_FRESH else None
+    text = "".join(words)
+    if text in _STATUS_STALE:
+        return False
+    if text in _STATUS_FRESH:
+        return True
+    return None
+
+
+def _first(entry: Dict[str, Any], keys: Iterable[str]) -> Optional[str]:
+    return next((str(entry[k]) for k in keys if entry.get(k) not in (None, "")), None)
+
+
+def parse_file_status(payload: Any, *, local: Optional[str] = None) -> List[CLIFileStatus]:
+    """
+    Map a fetch-status JSON document to CLIFileStatus records. Relative paths
+    are resolved against the workspace `local`; records without a path are
+    dropped.
+    """
+    statuses: List[CLIFileStatus] = []
+    for entry in _json_entries(payload):
+        path = _first(entry, _ITEM_PATH_KEYS + ("file", "name"))
+        if path is None:
+            continue
+        if local and not os.path.isabs(path):
+            path = os.path.join(local, path)
+
+        status = _first(entry, ("status", "state", "result"))
+        local_version = _first(entry, _STATUS_LOCAL_VERSION_KEYS)
+        remote_version = _first(entry, _STATUS_REMOTE_VERSION_KEYS)
+
+        flag = next((entry[k] for k in _STATUS_FLAG_KEYS if isinstance(entry.get(k), bool)), None)
+        if flag is None and status:
+            flag = _status_freshness(status)
+        if flag is None and local_version is not None and remote_version is not None:
+            flag = local_version == remote_version
+
+        statuses.append(CLIFileStatus(
+            local_path=path,
+            remote=_first(entry, _STATUS_REMOTE_KEYS),
+            local_version=local_version,
+            remote_version=remote_version,
+            status=status,
+            up_to_date=flag,
+            raw=entry,
+        ))
+    return statuses
+
+
 # -------------------------------------------------------------------
 # Client (3-layer args: runtime / workspace / server)
 # -------------------------------------------------------------------
@@ -107,6 +324,8 @@ class MinervaCLIClient:
         (3) server args: url + auth flags (+ env secrets)
     - Reconfigurable authentication via set_auth()
     - Execution env built once per auth configuration (self._exec_env)
+    - Workspaces signed in through sign_in(local=...) keep a CLI session;
+      later commands on them run without auth flags or secrets
     """
 
     def __init__(
@@ -125,6 +344,7 @@ class MinervaCLIClient:
         output: str = "stream://stdout",
         ui_theme: Optional[str] = None,
         default_timeout: Optional[float] = None,
+        session_dir: Optional[str] = None,
     ):
         if not base_url:
             raise ValueError("base_url is required.")
@@ -134,6 +354,9 @@ class MinervaCLIClient:
         self.base_url = base_url
         self.database = database
         self.default_timeout = default_timeout
+        self._observer = threading.local()  # per-thread process hooks, see observe_processes()
+        # Signed-in workspaces are recorded here, visible to forked/other processes.
+        self.session_dir = session_dir or os.path.join(tempfile.gettempdir(), "minerva-cli-sessions")
 
         # Logging context
         if name:
@@ -275,8 +498,11 @@ class MinervaCLIClient:
 
         # Build execution environment once per auth configuration
         auth_env = self._build_auth_env(auth)
-        self._exec_env = os.environ.copy()
+        self._session_env = {k: v for k, v in os.environ.items() if k not in auth_env}
+        self._exec_env = dict(self._session_env)
         self._exec_env.update(auth_env)
+        # Sessions recorded under the previous credentials no longer count.
+        self._auth_epoch = uuid.uuid4().hex
 
         logger.debug(f"{self._pfx}[AUTH] Updated auth mode={mode}, user={username!r}")
 
@@ -291,70 +517,185 @@ class MinervaCLIClient:
         parse_json: bool = False,
         timeout: Optional[float] = None,
         cwd: Optional[str] = None,
+    ) -> Union[str, Any]:
+        try:
+            return self._exec(command, args, parse_json=parse_json, timeout=timeout, cwd=cwd)
+        except MinervaCliError as e:
+            retry_args = self._session_retry_args(args, e)
+            if retry_args is None:
+                raise
+            return self._exec(command, retry_args, parse_json=parse_json, timeout=timeout, cwd=cwd)
+
+    def _exec(
+        self,
+        command: str,
+        args: List[str],
+        *,
+        parse_json: bool = False,
+        timeout: Optional[float] = None,
+        cwd: Optional[str] = None,
     ) -> Union[str, Any]:
         full_cmd = [self.exe, command] + args
-        cmd_str = " ".join(shlex.quote(str(x)) for x in full_cmd)
-
         eff_timeout = self.default_timeout if timeout is None else timeout
-
-        logger.debug("=" * 70)
-        logger.debug(f"{self._pfx}[EXECUTE] {cmd_str}")
-        logger.debug(f"{self._pfx}[AUTH_ENV] {_mask_env(self._build_auth_env(self._auth))}")
-        logger.debug("=" * 70)
+        self._log_execute(full_cmd)
 
         try:
-            cp = subprocess.run(
+            proc = subprocess.Popen(
                 full_cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
                 encoding="utf-8",
                 errors="replace",
-                env=self._exec_env,
-                timeout=eff_timeout,
+                env=self._env_for(full_cmd),
                 cwd=cwd,
             )
+        except OSError as e:
+            raise MinervaCliError(
+                f"{self._pfx}CLI could not start: {command}",
+                returncode=-1,
+                stdout="",
+                stderr=str(e),
+                command=full_cmd,
+            ) from e
+
+        on_start = getattr(self._observer, "on_start", None)
+        if on_start is not None:
+            on_start(proc)
+
+        try:
+            stdout, stderr = proc.communicate(timeout=eff_timeout)
         except subprocess.TimeoutExpired as e:
+            proc.kill()
+            stdout, stderr = proc.communicate()
             raise MinervaCliError(
                 f"{self._pfx}CLI timed out: {command}",
                 returncode=-1,
-                stdout=(e.stdout or ""),
-                stderr=(e.stderr or ""),
+                stdout=(stdout or ""),
+                stderr=(stderr or ""),
                 command=full_cmd,
             ) from e
 
-        if cp.returncode != 0:
+        return self._result(command, full_cmd, proc.returncode, stdout or "", stderr or "", parse_json=parse_json)
+
+    def _log_execute(self, full_cmd: List[str]) -> None:
+        cmd_str = " ".join(shlex.quote(str(x)) for x in full_cmd)
+        logger.debug("=" * 70)
+        logger.debug(f"{self._pfx}[EXECUTE] {cmd_str}")
+        logger.debug(f"{self._pfx}[AUTH_ENV] {_mask_env(self._build_auth_env(self._auth))}")
+        logger.debug("=" * 70)
+
+    def _result(
+        self,
+        command: str,
+        full_cmd: List[str],
+        returncode: int,
+        stdout: str,
+        stderr: str,
+        *,
+        parse_json: bool,
+    ) -> Union[str, Any]:
+        """Turn a finished process into the command's return value (or MinervaCliError)."""
+        if returncode != 0:
             raise MinervaCliError(
                 f"{self._pfx}CLI failed: {command}",
-                returncode=cp.returncode,
-                stdout=cp.stdout or "",
-                stderr=cp.stderr or "",
+                returncode=returncode,
+                stdout=stdout,
+                stderr=stderr,
                 command=full_cmd,
             )
 
-        out = cp.stdout or ""
         if parse_json:
             try:
-                return json.loads(out)
+                return json.loads(stdout)
             except json.JSONDecodeError as e:
                 raise MinervaCliError(
                     f"{self._pfx}Invalid JSON output: {command}",
-                    returncode=cp.returncode,
-                    stdout=out,
-                    stderr=cp.stderr or "",
+                    returncode=returncode,
+                    stdout=stdout,
+                    stderr=stderr,
                     command=full_cmd,
                 ) from e
 
-        return out
+        return stdout
+
+    @contextmanager
+    def observe_processes(self, on_start: Callable[[subprocess.Popen], None]) -> Iterator[None]:
+        """
+        Call `on_start(proc)` for every CLI process this thread starts inside
+        the block, e.g. to keep a handle for killing it from elsewhere.
+        """
+        previous = getattr(self._observer, "on_start", None)
+        self._observer.on_start = on_start
+        try:
+            yield
+        finally:
+            self._observer.on_start = previous
 
     # -------------------------------------------------------------------
     # Command arg composition
     # -------------------------------------------------------------------
     def _server_command_args(self, *, local: Optional[str], include_auth: bool = True) -> List[str]:
-        """Compose args for server-backed commands."""
+        """Compose args for server-backed commands (no auth flags in a signed-in workspace)."""
+        if include_auth and self.has_session(local):
+            include_auth = False
         args = self._server_base_args + (self._auth_args if include_auth else []) + self._runtime_args
         args += self._build_workspace_args(local=local)
         return args
 
+    def _env_for(self, args: List[str]) -> Dict[str, str]:
+        """Secrets only go to processes that authenticate with flags."""
+        return self._exec_env if self._auth_args[0] in args else self._session_env
+
+    def has_session(self, local: Optional[str]) -> bool:
+        """
+        True if the workspace `local` was signed in with the current
+        credentials, by this client or a process forked from it.
+        """
+        if not local:
+            return False
+        try:
+            with open(self._session_marker(local), "r", encoding="utf-8") as f:
+                return f.read() == self._auth_epoch
+        except OSError:
+            return False
+
+    def _session_marker(self, local: str) -> str:
+        key = "|".join([self.base_url, self.database, self._auth.mode, self._auth.username or "", os.path.abspath(local)])
+        return os.path.join(self.session_dir, hashlib.sha1(key.encode("utf-8")).hexdigest())
+
+    def _record_session(self, local: str) -> None:
+        os.makedirs(self.session_dir, mode=0o700, exist_ok=True)
+        marker = self._session_marker(local)
+        tmp = f"{marker}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self._auth_epoch)
+        os.replace(tmp, marker)
+
+    def _forget_session(self, local: str) -> None:
+        try:
+            os.remove(self._session_marker(local))
+        except FileNotFoundError:
+            pass
+
+    def _session_retry_args(self, args: List[str], error: MinervaCliError) -> Optional[List[str]]:
+        """
+        If `args` relied on a workspace session that the CLI rejected, forget
+        the session and return the same args with auth flags; else None.
+        """
+        n = len(self._server_base_args)
+        if args[:n] != self._server_base_args or self._auth_args[0] in args or not error.is_auth_failure:
+            return None
+        try:
+            local = args[args.index("--local") + 1]
+        except (ValueError, IndexError):
+            return None
+        if not self.has_session(local):
+            return None
+        self._forget_session(local)
+        logger.info(f"{self._pfx}[AUTH] Session of {local} was rejected; retrying with credentials")
+        return args[:n] + self._auth_args + args[n:]
+
     def _local_command_args(self, *, local: Optional[str]) -> List[str]:
         """Compose args for local-context commands."""
         args = self._runtime_args + self._build_workspace_args(local=local)
@@ -371,11 +712,21 @@ class MinervaCLIClient:
         timeout: Optional[float] = None,
         parse_json: bool = False,
     ) -> Union[str, Any]:
-        """Sign in to Minerva."""
-        args = self._server_command_args(local=local, include_auth=True)
+        """
+        Sign in to Minerva. With `local`, later commands on that workspace
+        reuse its session instead of passing credentials.
+        """
+        result = self._run("sign-in", self._sign_in_args(force=force, local=local), timeout=timeout, parse_json=parse_json)
+        if local:
+            self._record_session(local)
+        return result
+
+    def _sign_in_args(self, *, force: bool, local: Optional[str]) -> List[str]:
+        # Always with credentials, even if the workspace already has a session.
+        args = self._server_base_args + self._auth_args + self._runtime_args + self._build_workspace_args(local=local)
         if force:
             args += ["--force"]
-        return self._run("sign-in", args, timeout=timeout, parse_json=parse_json)
+        return args
 
     def sign_out(
         self,
@@ -387,6 +738,8 @@ class MinervaCLIClient:
         """Sign out from Minerva."""
         # Sign-out typically does not require auth flags; keep it conservative.
         args = self._server_command_args(local=local, include_auth=False)
+        if local:
+            self._forget_session(local)
         return self._run("sign-out", args, timeout=timeout, parse_json=parse_json)
 
     def claim(
@@ -454,6 +807,27 @@ class MinervaCLIClient:
         args += _add_many("--remote", remote)
         return self._run("download", args, timeout=timeout, parse_json=parse_json)
 
+    def download_items(
+        self,
+        remote: Union[str, Iterable[str]],
+        *,
+        local: Optional[str] = None,
+        overwrite: OverwriteMode = "Overwrite",
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> List[CLIItemResult]:
+        """
+        download() many remotes in one process and report per remote.
+        A failing process does not raise: its JSON output (if any) is still
+        parsed and every remote without a record is marked failed.
+        """
+        remotes = _listify(remote)
+        try:
+            payload = self.download(remotes, local=local, overwrite=overwrite, timeout=timeout, parse_json=True, **kwargs)
+        except MinervaCliError as e:
+            return item_results_from_error(e, remotes)
+        return parse_item_results(payload, remotes, default_ok=True)
+
     def fetch_status(
         self,
         *,
@@ -467,6 +841,17 @@ class MinervaCLIClient:
         args += _add_many("--glob", glob)
         return self._run("fetch-status", args, timeout=timeout, parse_json=parse_json)
 
+    def file_status(
+        self,
+        *,
+        glob: Union[str, Iterable[str], None] = None,
+        local: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> List[CLIFileStatus]:
+        """fetch_status() parsed into one CLIFileStatus per local file."""
+        payload = self.fetch_status(glob=glob, local=local, timeout=timeout, parse_json=True)
+        return parse_file_status(payload, local=local)
+
     def select_items(
         self,
         *,
@@ -0,0 +1,151 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class CLIProgress:
+    """Progress of a running CLI transfer; totals are None when unknown."""
+    bytes_done: int = 0
+    bytes_total: Optional[int] = None
+    files_done: int = 0
+    files_total: Optional[int] = None
+    current_path: Optional[str] = None
+    percent: Optional[float] = None
+
+
+class CLIProgressTracker:
+    """
+    Report CLIProgress for a CLI download by watching its target files.
+
+    `expected` maps the local paths the transfer will produce to their sizes
+    (OOTBService._expected_local_files). Files already on disk are recorded
+    when the tracker is created and only count once the CLI rewrites them,
+    so an overwriting download starts at 0%. While running, the tracker
+    stats at most `max_stats` pending files every `interval` seconds, in
+    rotation; files at their full size are done and never stat'ed again,
+    others contribute the bytes last seen. `percent` never goes down.
+
+        tracker = CLIProgressTracker(on_progress, expected=expected).start()
+        ok = False
+        try:
+            ...run the CLI...
+            ok = True
+        finally:
+            tracker.finish(complete=ok)
+    """
+
+    def __init__(
+        self,
+        on_progress: Callable[[CLIProgress], None],
+        *,
+        expected: Mapping[str, int],
+        interval: float = 0.5,
+        max_stats: int = 512,
+    ):
+        self.on_progress = on_progress
+        self.interval = interval
+        self.max_stats = max_stats
+        self._pending: "OrderedDict[str, int]" = OrderedDict(expected)
+        self._before: Dict[str, Tuple[int, int]] = {}  # path -> (size, mtime_ns) before the transfer
+        for path in self._pending:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            self._before[path] = (st.st_size, st.st_mtime_ns)
+        self._partial: Dict[str, int] = {}
+        self._partial_bytes = 0
+        self._done_bytes = 0
+        self._done_files = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.state = CLIProgress(
+            bytes_total=sum(self._pending.values()),
+            files_total=len(self._pending),
+            percent=0.0,
+        )
+
+    def start(self) -> "CLIProgressTracker":
+        """Report the initial state and start polling in the background."""
+        self.poll(force=True)
+        self._thread = threading.Thread(target=self._run, name="cli-progress", daemon=True)
+        self._thread.start()
+        return self
+
+    def finish(self, *, complete: bool = False) -> CLIProgress:
+        """
+        Stop polling, deliver the final state (and return it). With
+        `complete` (the CLI succeeded), files it left untouched, e.g. skipped
+        as up to date, count as done.
+        """
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        if complete:
+            with self._lock:
+                for path, size in self._pending.items():
+                    self._mark_done(path, size)
+                self._pending.clear()
+        return self.poll(force=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def poll(self, *, force: bool = False) -> CLIProgress:
+        """Measure the next pending files; report if anything changed (or `force`)."""
+        with self._lock:
+            previous = self.state
+            current_path = previous.current_path
+            for _ in range(min(self.max_stats, len(self._pending))):
+                path, size = self._pending.popitem(last=False)
+                written = self._written(path)
+                if written is not None and written >= size:
+                    self._mark_done(path, size)
+                    current_path = path
+                    continue
+                written = min(written or 0, size)
+                self._partial_bytes += written - self._partial.get(path, 0)
+                self._partial[path] = written
+                self._pending[path] = size  # Back of the rotation.
+
+            bytes_done = self._done_bytes + self._partial_bytes
+            if previous.bytes_total:
+                percent = 100.0 * bytes_done / previous.bytes_total
+            elif previous.files_total:
+                percent = 100.0 * self._done_files / previous.files_total
+            else:
+                percent = 100.0 if force else 0.0
+
+            self.state = CLIProgress(
+                bytes_done=max(bytes_done, previous.bytes_done),
+                bytes_total=previous.bytes_total,
+                files_done=self._done_files,
+                files_total=previous.files_total,
+                current_path=current_path,
+                percent=max(min(percent, 100.0), previous.percent or 0.0),
+            )
+            state = self.state
+        if force or state != previous:
+            self.on_progress(state)
+        return state
+
+    def _written(self, path: str) -> Optional[int]:
+        """Size of `path` if the transfer has written it; None if missing or untouched since start."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if self._before.get(path) == (st.st_size, st.st_mtime_ns):
+            return None
+        return st.st_size
+
+    def _mark_done(self, path: str, size: int) -> None:
+        self._partial_bytes -= self._partial.pop(path, 0)
+        self._done_bytes += size
+        self._done_files += 1
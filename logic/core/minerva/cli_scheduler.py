@@ -0,0 +1,262 @@
+import os
+import time
+import heapq
+import itertools
+import logging
+import threading
+import subprocess
+from concurrent.futures import CancelledError, Future
+from typing import Any, Callable, Dict, List, Optional
+
+from .cli import MinervaCLIClient, MinervaCliError
+
+logger = logging.getLogger("MinervaCLIScheduler")
+
+DEFAULT_MAX_CONCURRENCY = 2
+
+
+class CLIJob:
+    """
+    One queued CLI command. `future` resolves to the command's return value
+    (or raises its MinervaCliError / CancelledError); from asyncio use
+    `await asyncio.wrap_future(job.future)`.
+    """
+
+    def __init__(
+        self,
+        job_id: int,
+        command: str,
+        args: tuple,
+        kwargs: dict,
+        priority: int,
+    ):
+        self.id = job_id
+        self.command = command
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.future: Future = Future()
+        self.submitted_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+        self._scheduler: Optional["CLIScheduler"] = None
+        self._lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+        self._cancel_requested = False
+
+    @property
+    def status(self) -> str:
+        if self.future.cancelled() or self._cancel_requested:
+            return "cancelled"
+        if self.future.done():
+            return "failed" if self.future.exception() is not None else "done"
+        return "running" if self.started_at is not None else "queued"
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        return self.future.result(timeout)
+
+    def cancel(self) -> bool:
+        """
+        Cancel the job: a queued job never starts, a running job has its CLI
+        process killed. Returns False if the job had already finished.
+        """
+        if self.future.done():
+            return False
+        with self._lock:
+            self._cancel_requested = True
+            proc = self._proc
+        if self.future.cancel():  # Still queued.
+            if self._scheduler is not None:
+                self._scheduler._count("cancelled")
+            return True
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+        return True
+
+    def _attach(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            self._proc = proc
+            kill = self._cancel_requested
+        if kill:
+            proc.kill()
+
+    def __repr__(self) -> str:
+        return f"CLIJob(id={self.id}, command={self.command!r}, priority={self.priority}, status={self.status!r})"
+
+
+class CLIScheduler:
+    """
+    Bounded worker pool for MinervaCLIClient commands.
+
+    - At most `max_concurrency` CLI processes run at once; the rest wait in
+      a queue ordered by priority (higher first), then FIFO.
+    - submit() returns a CLIJob carrying a concurrent.futures.Future.
+    - CLIJob.cancel() drops a queued job or kills a running job's process.
+    - stats() reports queue depth, running jobs, outcomes and wait times.
+
+        scheduler = CLIScheduler(service.cli, max_concurrency=2)
+        job = scheduler.submit("download", "ans_Data/123", local=dest)
+        job.result()
+    """
+
+    def __init__(self, client: MinervaCLIClient, *, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be > 0")
+        self.client = client
+        self.max_concurrency = max_concurrency
+
+        self._seq = itertools.count(1)
+        self._fork_hooks: List[Callable[[], None]] = []
+        self._start()
+
+    def _start(self) -> None:
+        self._pid = os.getpid()
+        self._cond = threading.Condition()
+        self._queue: List[tuple] = []  # (-priority, seq, job)
+        self._running: Dict[int, CLIJob] = {}
+        self._closed = False
+        self._stats = {"submitted": 0, "done": 0, "failed": 0, "cancelled": 0, "max_queue_depth": 0}
+        self._wait_total = 0.0
+        self._started = 0
+
+        self._workers = [
+            threading.Thread(target=self._work, name=f"cli-worker-{i}", daemon=True)
+            for i in range(self.max_concurrency)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def add_fork_hook(self, callback: Callable[[], None]) -> None:
+        """Call `callback` in a forked child when the pool restarts there."""
+        self._fork_hooks.append(callback)
+
+    def restart_after_fork(self) -> bool:
+        """
+        In a forked child (e.g. a Dash background callback) the workers and
+        the jobs queued on them stayed in the parent: start a fresh pool and
+        run the fork hooks. Returns True if it restarted; submit() calls it.
+        """
+        if self._pid == os.getpid():
+            return False
+        self._start()
+        for hook in self._fork_hooks:
+            hook()
+        return True
+
+    # ------------------------------------------------------------------
+    # Submit
+    # ------------------------------------------------------------------
+    def submit(
+        self,
+        command: str,
+        *args: Any,
+        priority: int = 0,
+        **kwargs: Any,
+    ) -> CLIJob:
+        """Queue `client.<command>(*args, **kwargs)`, e.g. submit("download", remote, local=dest)."""
+        if not callable(getattr(self.client, command, None)) or command.startswith("_"):
+            raise ValueError(f"Unknown CLI command: {command!r}")
+        self.restart_after_fork()
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("CLIScheduler is shut down")
+            seq = next(self._seq)
+            job = CLIJob(seq, command, args, kwargs, priority)
+            job._scheduler = self
+            heapq.heappush(self._queue, (-priority, seq, job))
+            self._stats["submitted"] += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], len(self._queue))
+            self._cond.notify()
+        logger.debug(f"Queued {job} (depth {len(self._queue)})")
+        return job
+
+    def run(
+        self,
+        command: str,
+        *args: Any,
+        priority: int = 0,
+        **kwargs: Any,
+    ) -> Any:
+        """submit() and wait for the result."""
+        return self.submit(command, *args, priority=priority, **kwargs).result()
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+    def _next_job(self) -> Optional[CLIJob]:
+        with self._cond:
+            while True:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return None  # Closed and drained.
+                _, _, job = heapq.heappop(self._queue)
+                if job.future.set_running_or_notify_cancel():
+                    job.started_at = time.monotonic()
+                    self._running[job.id] = job
+                    self._wait_total += job.started_at - job.submitted_at
+                    self._started += 1
+                    return job
+                # Cancelled while queued; already counted by cancel().
+
+    def _work(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            try:
+                with self.client.observe_processes(job._attach):
+                    result = getattr(self.client, job.command)(*job.args, **job.kwargs)
+            except BaseException as e:
+                if job._cancel_requested:
+                    job.future.set_exception(CancelledError(f"CLI job {job.id} cancelled"))
+                    self._finish(job, "cancelled")
+                else:
+                    job.future.set_exception(e)
+                    self._finish(job, "failed")
+                    if not isinstance(e, MinervaCliError):
+                        logger.error(f"CLI job {job.id} ({job.command}) raised: {e}")
+            else:
+                job.future.set_result(result)
+                self._finish(job, "cancelled" if job._cancel_requested else "done")
+
+    def _finish(self, job: CLIJob, outcome: str) -> None:
+        job.finished_at = time.monotonic()
+        with self._cond:
+            self._running.pop(job.id, None)
+            self._stats[outcome] += 1
+
+    def _count(self, outcome: str) -> None:
+        with self._cond:
+            self._stats[outcome] += 1
+
+    # ------------------------------------------------------------------
+    # Metrics / lifecycle
+    # ------------------------------------------------------------------
+    def queue_depth(self) -> int:
+        with self._cond:
+            return sum(1 for _, _, job in self._queue if not job.future.cancelled())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                **self._stats,
+                "queued": sum(1 for _, _, job in self._queue if not job.future.cancelled()),
+                "running": len(self._running),
+                "max_concurrency": self.max_concurrency,
+                "avg_wait_seconds": round(self._wait_total / self._started, 3) if self._started else 0.0,
+            }
+
+    def shutdown(self, *, cancel_pending: bool = False, wait: bool = True) -> None:
+        """Stop accepting jobs; optionally cancel queued ones, then let workers drain."""
+        with self._cond:
+            self._closed = True
+            pending = [job for _, _, job in self._queue] if cancel_pending else []
+            self._cond.notify_all()
+        for job in pending:
+            job.cancel()
+        if wait:
+            for worker in self._workers:
+                worker.join()
@@ -0,0 +1,288 @@
+import re
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set
+
+from .odata import Json, MinervaODataClient, _odata_literal
+
+logger = logging.getLogger("DeltaSync")
+
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_ID_DIFF_INTERVAL = 3600.0
+WATERMARK_FIELD = "modified_on"
+
+# Date, time, fraction and offset of a timestamp in any of the forms servers
+# return: "2024-05-01T08:30:00Z", "2024-05-01 08:30:00.1234567+09:00", "datetime'...'".
+_TIMESTAMP_RE = re.compile(
+    r"(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}(?::\d{2})?)(?:\.(\d+))?\s*(Z|[+-]\d{2}:?\d{2})?",
+    re.IGNORECASE,
+)
+
+
+def parse_watermark(value: Any) -> Optional[datetime]:
+    """A modified_on value as an aware datetime (no offset = UTC); None if empty or unparseable."""
+    if isinstance(value, datetime):
+        return value
+    m = _TIMESTAMP_RE.search(str(value or ""))
+    if not m:
+        return None
+    day, clock, fraction, offset = m.groups()
+    if len(clock) == 5:
+        clock += ":00"
+    fraction = f".{(fraction or '')[:6].ljust(6, '0')}"
+    if not offset or offset.upper() == "Z":
+        offset = "+00:00"
+    elif ":" not in offset:
+        offset = f"{offset[:3]}:{offset[3:]}"
+    try:
+        return datetime.fromisoformat(f"{day}T{clock}{fraction}{offset}")
+    except ValueError:
+        return None
+
+
+def normalize_watermark(value: Any) -> Optional[str]:
+    """
+    A modified_on value as fixed-width ISO-8601 UTC ("2024-05-01T08:30:00.000000Z"),
+    which sorts chronologically as a string; None if empty or unparseable.
+    """
+    parsed = parse_watermark(value)
+    return _odata_literal(parsed) if parsed is not None else None
+
+
+@dataclass(frozen=True)
+class SyncStats:
+    """Outcome of one refresh of one entity set."""
+    entity_set: str
+    full: bool
+    upserted: int
+    deleted: int
+    watermark: Optional[str]
+    seconds: float
+
+
+@dataclass(frozen=True)
+class SyncChange:
+    """Rows one refresh of one entity set wrote (all rows on a full load) and removed."""
+    stats: SyncStats
+    changed: List[Json]
+    deleted: List[Json]
+
+
+class MemoryMirrorStore:
+    """
+    In-process mirror store: rows by id plus one watermark per entity set.
+
+    The contract (get_mark/set_mark/upsert/delete/ids/rows/get) is what
+    DeltaSync needs; a persistent store only has to implement the same methods.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows: Dict[str, Dict[str, Json]] = {}
+        self._marks: Dict[str, Optional[str]] = {}
+
+    def get_mark(self, entity_set: str) -> Optional[str]:
+        with self._lock:
+            return self._marks.get(entity_set)
+
+    def set_mark(self, entity_set: str, mark: Optional[str]) -> None:
+        with self._lock:
+            self._marks[entity_set] = mark
+
+    def upsert(self, entity_set: str, rows: Iterable[Json]) -> int:
+        n = 0
+        with self._lock:
+            table = self._rows.setdefault(entity_set, {})
+            for row in rows:
+                table[str(row["id"])] = dict(row)
+                n += 1
+        return n
+
+    def delete(self, entity_set: str, ids: Iterable[str]) -> int:
+        n = 0
+        with self._lock:
+            table = self._rows.get(entity_set, {})
+            for i in ids:
+                if table.pop(i, None) is not None:
+                    n += 1
+        return n
+
+    def ids(self, entity_set: str) -> Set[str]:
+        with self._lock:
+            return set(self._rows.get(entity_set, {}))
+
+    def rows(self, entity_set: str, *, where: Optional[Mapping[str, Any]] = None) -> List[Json]:
+        """All mirrored rows, optionally filtered by field equality."""
+        with self._lock:
+            rows = list(self._rows.get(entity_set, {}).values())
+        if where:
+            rows = [r for r in rows if all(str(r.get(k)) == str(v) for k, v in where.items())]
+        return [dict(r) for r in rows]
+
+    def get(self, entity_set: str, item_id: str) -> Optional[Json]:
+        with self._lock:
+            row = self._rows.get(entity_set, {}).get(item_id)
+        return dict(row) if row is not None else None
+
+
+class DeltaSync:
+    """
+    Keep a local mirror of OData entity sets up to date incrementally.
+
+    - The first refresh of a set loads it fully (keyset-paged by id).
+    - Later refreshes only pull rows with `modified_on ge <watermark>`, where
+      the watermark is the highest modified_on seen so far, kept as
+      normalize_watermark() and sent as a DateTimeOffset literal. `ge` rather than
+      `gt` re-reads rows stamped in the same instant as the mark, which a
+      strict comparison could miss; upserts make that harmless.
+    - Deletions cannot be seen through modified_on, so every
+      `id_diff_interval` seconds the server's id set is compared with the
+      mirror's and missing ids are dropped.
+
+        sync = DeltaSync(service.odata, ["Ans_Project", "Ans_SimulationRequest"])
+        sync.refresh()          # or sync.start(interval=60)
+        sync.rows("Ans_Project")
+
+    `on_change` is called after every refresh with one SyncChange per
+    entity set, so derived caches can follow the same deltas.
+    """
+
+    def __init__(
+        self,
+        client: MinervaODataClient,
+        entity_sets: Sequence[str],
+        *,
+        store: Optional[MemoryMirrorStore] = None,
+        select: Optional[Mapping[str, Sequence[str]]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        id_diff_interval: float = DEFAULT_ID_DIFF_INTERVAL,
+        on_change: Optional[Callable[[List[SyncChange]], None]] = None,
+    ):
+        self.client = client
+        self.entity_sets = list(entity_sets)
+        self.store = store if store is not None else MemoryMirrorStore()
+        self.select = dict(select or {})
+        self.page_size = page_size
+        self.id_diff_interval = id_diff_interval
+        self.on_change = on_change
+
+        self._refresh_lock = threading.Lock()
+        self._last_id_diff: Dict[str, float] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def covers(self, entity_set: str) -> bool:
+        """True once `entity_set` is mirrored and has been loaded at least once."""
+        return entity_set in self.entity_sets and self.store.get_mark(entity_set) is not None
+
+    def rows(self, entity_set: str, *, where: Optional[Mapping[str, Any]] = None) -> List[Json]:
+        return self.store.rows(entity_set, where=where)
+
+    def get(self, entity_set: str, item_id: str) -> Optional[Json]:
+        return self.store.get(entity_set, item_id)
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def refresh(self, entity_set: Optional[str] = None, *, force_id_diff: bool = False) -> List[SyncStats]:
+        """Refresh one entity set (or all of them); returns per-set stats."""
+        targets = [entity_set] if entity_set else self.entity_sets
+        with self._refresh_lock:
+            changes = [self._refresh_one(name, force_id_diff=force_id_diff) for name in targets]
+            if self.on_change is not None:
+                try:
+                    self.on_change(changes)
+                except Exception as e:
+                    logger.error(f"Delta sync listener failed: {e}")
+        return [c.stats for c in changes]
+
+    def _fields(self, entity_set: str) -> Optional[List[str]]:
+        fields = list(self.select.get(entity_set) or [])
+        if not fields:
+            return None
+        for required in ("id", WATERMARK_FIELD):
+            if required not in fields:
+                fields.append(required)
+        return fields
+
+    def _refresh_one(self, entity_set: str, *, force_id_diff: bool) -> SyncChange:
+        started = time.monotonic()
+        stored = self.store.get_mark(entity_set) or None
+        mark = normalize_watermark(stored)
+        if stored is not None and mark is None:
+            logger.warning(f"Delta sync {entity_set}: unreadable watermark {stored!r}; reloading fully")
+        full = mark is None
+
+        filter = None if full else f"{WATERMARK_FIELD} ge {_odata_literal(parse_watermark(mark))}"
+        rows = list(self.client.iter_list(
+            entity_set,
+            page_size=self.page_size,
+            select=self._fields(entity_set),
+            filter=filter,
+            keyset="id",
+        ))
+        upserted = self.store.upsert(entity_set, rows)
+
+        new_mark = max((m for m in (normalize_watermark(r.get(WATERMARK_FIELD)) for r in rows) if m), default=None)
+        if new_mark is not None and (mark is None or new_mark > mark):
+            mark = new_mark
+        # An empty set still counts as loaded; "" sorts below every timestamp.
+        self.store.set_mark(entity_set, mark or "")
+
+        deleted: List[Json] = []
+        due = time.monotonic() - self._last_id_diff.get(entity_set, 0.0) >= self.id_diff_interval
+        if full:
+            self._last_id_diff[entity_set] = time.monotonic()
+        elif force_id_diff or due:
+            deleted = self._diff_ids(entity_set)
+
+        stats = SyncStats(entity_set, full, upserted, len(deleted), mark, round(time.monotonic() - started, 3))
+        logger.info(f"Delta sync {stats}")
+        return SyncChange(stats, rows, deleted)
+
+    def _diff_ids(self, entity_set: str) -> List[Json]:
+        """Drop mirrored rows whose id no longer exists on the server; return them."""
+        remote = {
+            str(r["id"])
+            for r in self.client.iter_list(entity_set, page_size=self.page_size * 10, select=["id"], keyset="id")
+        }
+        self._last_id_diff[entity_set] = time.monotonic()
+        gone = self.store.ids(entity_set) - remote
+        rows = [row for row in (self.store.get(entity_set, i) for i in gone) if row is not None]
+        self.store.delete(entity_set, gone)
+        return rows
+
+    # ------------------------------------------------------------------
+    # Background refresh
+    # ------------------------------------------------------------------
+
+    def start(self, interval: float) -> None:
+        """Refresh every `interval` seconds on a daemon thread until stop()."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"Delta sync failed: {e}")
+                self._stop.wait(interval)
+
+        self._thread = threading.Thread(target=loop, name="delta-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
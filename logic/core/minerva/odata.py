@@ -1,16 +1,45 @@
+import io
+import os
+import re
 import json
+import queue
 import requests
 import hashlib
-from typing import Any, Dict, Iterable, List, Optional, Union
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from urllib.parse import urljoin
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Union
 
 import logging
 from ...utils.decorators import log
+from ...utils.response_cache import ResponseCache
+from ...utils.single_flight import SingleFlight
+from .batch import DEFAULT_MAX_BATCH_SIZE, ODataBatch
 logging.basicConfig(level=logging.DEBUG, format='%(levelname)s: %(message)s')
 
 Json = Dict[str, Any]
 Params = Dict[str, Any]
 Headers = Dict[str, str]
 
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
+CHECKPOINT_INTERVAL = 8 * 1024 * 1024
+
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
+
+@dataclass(frozen=True)
+class ODataPage:
+    """Items of a collection response plus its @odata.count / @odata.nextLink."""
+    items: List[Json]
+    count: Optional[int] = None
+    next_link: Optional[str] = None
+
+
 class ODataAuth:
     """Handles OAuth2 authentication and credential management."""
     def __init__(self, base_url, database, username, password):
@@ -20,6 +49,7 @@ class ODataAuth:
         self.password = password  # Raw password for hashing
         self.token = None
         self.headers = {}
+        self._lock = threading.Lock()
         self.credentials = {
             "username": username,
             "database": database,
@@ -54,12 +84,27 @@ class ODataAuth:
             print(f"Auth Exception: {e}")
             return False
 
+    def refresh(self, stale_token: Optional[str]) -> bool:
+        """
+        Re-authenticate after a 401 that was sent with `stale_token`.
+
+        Serialized so that many threads hitting 401 at once sign in only once;
+        callers that arrive after another thread already replaced the token
+        just retry with the new one.
+        """
+        with self._lock:
+            if self.token is not None and self.token != stale_token:
+                return True
+            return self.authenticate()
+
 class MinervaODataClient:
     """
     REST-style API client over Minerva OData endpoint.
 
     Public method names:
       - list(), get(), list_related(), create(), patch(), delete()
+      - list_page(), next_page(), count(): paging with totals
+      - batch(): queue many of the above into `$batch` round trips
 
     Internals:
       - request_raw(): executes HTTP + 401 re-auth retry, returns Response
@@ -77,15 +122,30 @@ class MinervaODataClient:
         timeout: Union[int, float] = 30,
         auth: Optional[ODataAuth] = None,
         session: Optional[requests.Session] = None,
+        download_chunk_size: int = DEFAULT_CHUNK_SIZE,
+        download_connections: int = 4,
+        download_part_size: int = DEFAULT_PART_SIZE,
+        cache: Optional[ResponseCache] = None,
+        coalesce_reads: bool = True,
     ):
         """
         Initialize the client.
 
         If `auth` is provided, it will be used directly (advanced use).
         Otherwise, this client creates and owns a ODataAuth instance.
+
+        Pass a ResponseCache as `cache` to serve repeated GETs from memory
+        (opt-in; writes through this client invalidate affected entries).
+        With `coalesce_reads`, identical concurrent GETs share one request.
         """
         self.timeout = timeout
         self.verify = verify
+        self.download_chunk_size = download_chunk_size
+        self.download_connections = download_connections
+        self.download_part_size = download_part_size
+        self.cache = cache
+        self.coalesce_reads = coalesce_reads
+        self._in_flight = SingleFlight()
         self.api_base = f"{base_url.rstrip('/')}/server/odata"
 
         if auth is None:
@@ -145,6 +205,38 @@ class MinervaODataClient:
         except json.JSONDecodeError:
             raise RuntimeError(f"Invalid JSON response: {response.text}")
 
+    @staticmethod
+    def _extract_values(data: Any) -> List[Json]:
+        """Return the `value` rows of a collection payload."""
+        return data.get("value", []) if isinstance(data, dict) else []
+
+    @staticmethod
+    def _extract_related(data: Any) -> List[Json]:
+        """Flatten a relationship collection payload to its related items."""
+        return MinervaODataClient._flatten_related(MinervaODataClient._extract_values(data))
+
+    @staticmethod
+    def _flatten_related(rel_rows: Any) -> List[Json]:
+        """
+        Rows with an expanded `related_id` yield that item (or items, if it
+        expands to a list); rows without one yield the relationship row itself.
+        """
+        if not isinstance(rel_rows, list):
+            return []
+
+        expanded: List[Json] = []
+        for row in rel_rows:
+            if not isinstance(row, dict):
+                continue
+            rid = row.get("related_id")
+            if not rid:
+                expanded.append(row)
+            elif isinstance(rid, list):
+                expanded.extend([x for x in rid if isinstance(x, dict)])
+            elif isinstance(rid, dict):
+                expanded.append(rid)
+        return expanded
+
     def _build_odata_params(
         self,
         *,
@@ -185,9 +277,12 @@ class MinervaODataClient:
         *,
         params: Optional[Params] = None,
         json_body: Optional[Json] = None,
+        data: Optional[Union[str, bytes]] = None,
         extra_headers: Optional[Headers] = None,
         headers_override: Optional[Headers] = None,
         retry_401: bool = True,
+        stream: bool = False,
+        session: Optional[requests.Session] = None,
     ) -> requests.Response:
         """
         Execute an HTTP request and return the raw Response.
@@ -195,35 +290,51 @@ class MinervaODataClient:
         Handles:
           - header composition
           - one-time 401 re-auth retry
+
+        With stream=True the body is not read up front; the caller owns the
+        response and must close it. `session` overrides self.session (used
+        by parallel downloads to spread ranges over several connections).
         """
-        url = f"{self.api_base}/{path.lstrip('/')}"
+        if path.startswith(("http://", "https://")):
+            url = path  # e.g. an @odata.nextLink outside the service root
+        else:
+            url = f"{self.api_base}/{path.lstrip('/')}"
+        sent_token = self.auth.token
         headers = self._merge_headers(extra_headers=extra_headers, headers_override=headers_override)
 
         #logging.debug(f"Request: {method} {url} params={params} json={json_body}")
-        response = self.session.request(
+        response = (session or self.session).request(
             method=method,
             url=url,
             headers=headers,
             params=params,
             json=json_body,
+            data=data,
             timeout=self.timeout,
             verify=self.verify,
+            stream=stream,
         )
         #logging.debug(f"Response: response.text={response.text}")
 
         if response.status_code == 401 and retry_401:
-            if self.auth.authenticate():
+            response.close()
+            if self.auth.refresh(sent_token):
                 # Token may change after re-auth; rebuild headers and retry once.
                 return self.request_raw(
                     method,
                     path,
                     params=params,
                     json_body=json_body,
+                    data=data,
                     extra_headers=extra_headers,
                     headers_override=headers_override,
                     retry_401=False,
+                    stream=stream,
+                    session=session,
                 )
 
+        if method.upper() != "GET":
+            self._invalidate(path)
         return response
 
     def request_json(
@@ -237,18 +348,56 @@ class MinervaODataClient:
         headers_override: Optional[Headers] = None,
         retry_401: bool = True,
     ) -> Any:
-        response = self.request_raw(
-            method,
-            path,
-            params=params,
-            json_body=json_body,
-            extra_headers=extra_headers,
-            headers_override=headers_override,
-            retry_401=retry_401,
-        )
+        """
+        Execute a request and return parsed JSON.
+
+        Plain GETs (no custom headers) are served from self.cache when one is
+        configured, and identical GETs already in flight on another thread
+        are coalesced into one request. The returned object is always a
+        fresh copy.
+        """
+        def _send() -> requests.Response:
+            # Taken before sending: a write that lands meanwhile keeps this body out of the cache.
+            generation = self.cache.generation(path) if cache_key is not None else None
+            response = self.request_raw(
+                method,
+                path,
+                params=params,
+                json_body=json_body,
+                extra_headers=extra_headers,
+                headers_override=headers_override,
+                retry_401=retry_401,
+            )
+            if cache_key is not None and response.status_code == 200:
+                self.cache.put(cache_key, path, response.content, generation=generation)
+            return response
+
+        plain_get = method.upper() == "GET" and not extra_headers and headers_override is None
+        cache_key = None
+        if plain_get and self.cache is not None:
+            cache_key = self.cache.key(path, params)
+            body = self.cache.get(cache_key)
+            if body is not None:
+                return json.loads(body)
+
+        if plain_get and self.coalesce_reads:
+            # Waiters share the leader's (fully read) response; each parses its own copy.
+            # A GET issued after a write must not join one that started before it.
+            flight_key = ResponseCache.key(path, params)
+            if self.cache is not None:
+                flight_key += f"#{self.cache.generation(path)}"
+            response = self._in_flight.do(flight_key, _send)
+        else:
+            response = _send()
+
         self._raise_for_status(response)
         return self._parse_json(response)
 
+    def _invalidate(self, path: str) -> None:
+        """Drop cached reads of the entity set(s) a write touched."""
+        if self.cache is not None and not path.startswith("$"):
+            self.cache.invalidate_path(path)
+
     # ------------------------------------------------------------------
     # REST-style public API
     # ------------------------------------------------------------------
@@ -265,7 +414,12 @@ class MinervaODataClient:
         orderby: Optional[str] = None,
         count: Optional[bool] = None,
     ) -> List[Json]:
-        """List resources from a collection endpoint."""
+        """
+        List resources from a collection endpoint.
+
+        Follows @odata.nextLink, so server-side paging never truncates the
+        result; use list_page() to get one page and the total count.
+        """
         params = self._build_odata_params(
             select=select,
             filter=filter,
@@ -275,8 +429,69 @@ class MinervaODataClient:
             orderby=orderby,
             count=count,
         )
-        data = self.request_json("GET", resource, params=params)
-        return data.get("value", []) if isinstance(data, dict) else []
+        return self._get_collection(resource, params).items
+
+    def list_page(
+        self,
+        resource: str,
+        *,
+        select: Optional[Union[str, Iterable[str]]] = None,
+        filter: Optional[str] = None,
+        expand: Optional[str] = None,
+        top: Optional[int] = None,
+        skip: Optional[int] = None,
+        orderby: Optional[str] = None,
+        count: bool = True,
+        follow_next: bool = False,
+    ) -> ODataPage:
+        """
+        List one page of a collection with its total (`$count=true`) and
+        the server's nextLink, if any. Pass the nextLink to next_page().
+        """
+        params = self._build_odata_params(
+            select=select,
+            filter=filter,
+            expand=expand,
+            top=top,
+            skip=skip,
+            orderby=orderby,
+            count=count,
+        )
+        return self._get_collection(resource, params, follow_next=follow_next)
+
+    def next_page(self, next_link: str) -> ODataPage:
+        """Fetch the page an @odata.nextLink points to."""
+        return self._get_collection(self._relative_link(next_link), None, follow_next=False)
+
+    def count(self, resource: str, *, filter: Optional[str] = None) -> Optional[int]:
+        """Total number of items in a collection (None if the server omits it)."""
+        return self.list_page(resource, filter=filter, top=0, count=True).count
+
+    def _get_collection(self, path: str, params: Optional[Params], *, follow_next: bool = True) -> ODataPage:
+        """GET a collection; with follow_next, merge all pages via @odata.nextLink."""
+        data = self.request_json("GET", path, params=params)
+        items = list(self._extract_values(data))
+        total = data.get("@odata.count") if isinstance(data, dict) else None
+        next_link = data.get("@odata.nextLink") if isinstance(data, dict) else None
+
+        seen = set()
+        while follow_next and next_link and next_link not in seen:
+            seen.add(next_link)
+            data = self.request_json("GET", self._relative_link(next_link))
+            items.extend(self._extract_values(data))
+            next_link = data.get("@odata.nextLink") if isinstance(data, dict) else None
+
+        return ODataPage(
+            items=items,
+            count=int(total) if total is not None else None,
+            next_link=next_link,
+        )
+
+    def _relative_link(self, link: str) -> str:
+        """Resolve a (possibly relative) nextLink; keep it relative to api_base when possible."""
+        absolute = urljoin(f"{self.api_base}/", link)
+        prefix = f"{self.api_base}/"
+        return absolute[len(prefix):] if absolute.startswith(prefix) else absolute
 
     def get(
         self,
@@ -324,29 +539,7 @@ class MinervaODataClient:
             count=count,
         )
         path = f"{resource}('{resource_id}')/{related}"
-        data = self.request_json("GET", path, params=params)
-
-        if not isinstance(data, dict):
-            return []
-
-        rel_rows = data.get("value", [])
-        if not isinstance(rel_rows, list):
-            return []
-
-        # Extract expanded related_id items; flatten if related_id expands to a list.
-        expanded: List[Json] = []
-        for i, row in enumerate(rel_rows):
-            if not isinstance(row, dict):
-                continue
-            rid = row.get("related_id")
-            if not rid:
-                expanded.append(row)  # No related_id means we return the relationship row itself.
-            elif isinstance(rid, list):
-                expanded.extend([x for x in rid if isinstance(x, dict)])
-            elif isinstance(rid, dict):
-                expanded.append(rid)
-
-        return expanded
+        return self._flatten_related(self._get_collection(path, params).items)
 
     def create(self, resource: str, payload: Json) -> Json:
         """Create a resource."""
@@ -381,6 +574,10 @@ class MinervaODataClient:
         """Alias for patch()."""
         return self.patch(resource, resource_id, payload)
 
+    def batch(self, *, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE) -> ODataBatch:
+        """Start a `$batch` builder; see ODataBatch."""
+        return ODataBatch(self, max_batch_size=max_batch_size)
+
     def list_values(self, list_id: str) -> List[Dict[str, Any]]:
         """Aras list helper implemented via REST-style list_related()."""
         items = self.list_related("List", list_id, "Value", select=["value", "label"], expand=None)
@@ -400,42 +597,77 @@ class MinervaODataClient:
         expand: Optional[str] = None,
         orderby: Optional[str] = None,
         count: Optional[bool] = None,
+        prefetch: int = 0,
+        keyset: Optional[str] = None,
     ) -> Iterable[Json]:
         """
         Iterate items from an OData entity set using $top/$skip pagination.
 
-        Assumptions:
-        - self.list(...) returns List[Json] (already extracted list of items),
-        not a raw OData payload like {"value": [...]}.
-        - self.list(...) accepts keyword argument 'filter' (not 'filter_').
+        Each $top/$skip window is fetched with self.list(), which follows
+        @odata.nextLink, so a server page size smaller than `page_size` does
+        not end the iteration early.
+
+        With prefetch=K, up to K windows are requested ahead of the consumer
+        on background threads (at most K pages buffered). The total from
+        `$count` on the first window stops read-ahead at the end of the set.
+        Closing the generator early cancels the outstanding requests.
+
+        With keyset="id" (or another unique, monotonic property) pages are
+        requested as `$orderby=<key>&$filter=<key> gt <last>` instead of
+        `$skip`: each page costs the same however deep the iteration goes,
+        and rows created meanwhile do not shift later pages. The result is
+        ordered by the key, so `orderby` cannot be combined with it, and
+        pages depend on each other, so neither can `prefetch`.
         """
         if page_size <= 0:
             raise ValueError("page_size must be > 0")
+        if keyset and orderby:
+            raise ValueError("orderby cannot be combined with keyset pagination")
+        if keyset and prefetch > 0:
+            raise ValueError("prefetch is not supported with keyset pagination")
 
         # If max_items is 0 or negative, yield nothing.
         if max_items is not None and max_items <= 0:
             return
 
-        yielded = 0
-        skip = 0
-
-        while True:
-            # Fetch a page of items.
-            items = self.list(
-                entity_set,
+        def fetch(skip: int, with_count: bool = False) -> ODataPage:
+            params = self._build_odata_params(
                 select=select,
                 filter=filter,
                 expand=expand,
                 top=page_size,
                 skip=skip,
                 orderby=orderby,
+                count=True if with_count else count,
+            )
+            return self._get_collection(entity_set, params)
+
+        def fetch_after(last: Any) -> ODataPage:
+            fields = [select] if isinstance(select, str) else list(select or [])
+            if fields and keyset not in ",".join(fields).replace(" ", "").split(","):
+                fields.append(keyset)
+            conditions = [f"({filter})"] if filter else []
+            if last is not None:
+                conditions.append(f"{keyset} gt {_odata_literal(last)}")
+            params = self._build_odata_params(
+                select=fields or None,
+                filter=" and ".join(conditions) or None,
+                expand=expand,
+                top=page_size,
+                orderby=keyset,
                 count=count,
             )
+            return self._get_collection(entity_set, params)
 
-            # No items means we're done.
-            if not items:
-                break
+        if keyset:
+            windows = self._iter_windows_keyset(fetch_after, key=keyset, page_size=page_size)
+        elif prefetch > 0:
+            windows = self._iter_windows_prefetched(fetch, page_size=page_size, prefetch=prefetch, max_items=max_items)
+        else:
+            windows = self._iter_windows(fetch, page_size=page_size)
 
+        yielded = 0
+        for items in windows:
             for item in items:
                 yield item
                 yielded += 1
@@ -444,6 +676,17 @@ class MinervaODataClient:
                 if max_items is not None and yielded >= max_items:
                     return
 
+    @staticmethod
+    def _iter_windows(fetch: Callable[..., ODataPage], *, page_size: int) -> Iterator[List[Json]]:
+        skip = 0
+        while True:
+            items = fetch(skip).items
+
+            # No items means we're done.
+            if not items:
+                break
+            yield items
+
             # Advance the offset by the number of items we just received.
             skip += len(items)
 
@@ -451,17 +694,605 @@ class MinervaODataClient:
             if len(items) < page_size:
                 break
 
-    def download(self, vault_id: str, dest: str):
+    @staticmethod
+    def _iter_windows_keyset(
+        fetch_after: Callable[[Any], ODataPage],
+        *,
+        key: str,
+        page_size: int,
+    ) -> Iterator[List[Json]]:
+        last = None
+        while True:
+            items = fetch_after(last).items
+            if not items:
+                break
+            yield items
+
+            if len(items) < page_size:
+                break
+            last = items[-1].get(key)
+            if last is None:
+                raise RuntimeError(f"Keyset pagination: '{key}' missing from returned items")
+
+    @staticmethod
+    def _iter_windows_prefetched(
+        fetch: Callable[..., ODataPage],
+        *,
+        page_size: int,
+        prefetch: int,
+        max_items: Optional[int],
+    ) -> Iterator[List[Json]]:
+        """Yield $skip windows in order while keeping up to `prefetch` requests ahead."""
+        executor = ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix="odata-prefetch")
+        pending: "deque[Future]" = deque()
+        limit = max_items
+        next_skip = 0
+
+        def fill() -> None:
+            nonlocal next_skip
+            while len(pending) < prefetch and (limit is None or next_skip < limit):
+                pending.append(executor.submit(fetch, next_skip, next_skip == 0))
+                next_skip += page_size
+
+        try:
+            fill()
+            first = True
+            while pending:
+                page = pending.popleft().result()
+                if first and page.count is not None:
+                    limit = page.count if limit is None else min(limit, page.count)
+                first = False
+
+                if page.items:
+                    yield page.items
+                # A short (or oversized, i.e. $top ignored) window is the last one.
+                if len(page.items) != page_size:
+                    break
+                fill()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def open_download(
+        self,
+        vault_id: str,
+        *,
+        range_header: Optional[str] = None,
+        if_range: Optional[str] = None,
+    ) -> requests.Response:
+        """
+        Open a streaming GET on a vault file's content.
+
+        `range_header` (e.g. "bytes=100-") is forwarded as-is so the server can
+        answer 206 Partial Content; `if_range` makes that conditional on the
+        given ETag. The caller must close the returned response.
+        """
         path = f"File('{vault_id}')/$value"
-        response = self.request_raw("GET", path)
-        self._raise_for_status(response)
+        extra_headers: Headers = {}
+        if range_header:
+            extra_headers["Range"] = range_header
+            if if_range:
+                extra_headers["If-Range"] = if_range
+        return self.request_raw("GET", path, extra_headers=extra_headers or None, stream=True)
+
+    def _raise_for_download_status(self, response: requests.Response) -> None:
+        """Accept full and partial content; close the stream on anything else."""
+        if response.status_code in (200, 206):
+            return
+        try:
+            self._raise_for_status(response)
+        finally:
+            response.close()
+
+    def iter_download(
+        self,
+        vault_id: str,
+        *,
+        chunk_size: Optional[int] = None,
+        range_header: Optional[str] = None,
+    ) -> Iterator[bytes]:
+        """
+        Yield a vault file's content chunk by chunk without touching disk.
+
+        The HTTP response is released when the iterator is exhausted or closed.
+        """
+        response = self.open_download(vault_id, range_header=range_header)
+        self._raise_for_download_status(response)
+        return _iter_response(response, chunk_size or self.download_chunk_size)
+
+    def open_stream(self, vault_id: str, *, chunk_size: Optional[int] = None) -> BinaryIO:
+        """Return a read-only, non-seekable file object over a vault file's content."""
+        response = self.open_download(vault_id)
+        self._raise_for_download_status(response)
+        raw = VaultStream(response, chunk_size=chunk_size or self.download_chunk_size)
+        return io.BufferedReader(raw, buffer_size=chunk_size or self.download_chunk_size)
+
+    def download(
+        self,
+        vault_id: str,
+        dest: Union[str, BinaryIO],
+        *,
+        chunk_size: Optional[int] = None,
+        parallel: bool = False,
+        connections: Optional[int] = None,
+        part_size: Optional[int] = None,
+        resume: bool = False,
+        expected_size: Optional[int] = None,
+        validator: Optional[str] = None,
+        retries: int = 0,
+    ):
+        """
+        Download a vault file to `dest`.
+
+        `dest` is either a filesystem path or any object with a write() method
+        (socket wrapper, pipe, in-memory buffer...), in which case bytes are
+        forwarded without a temporary file.
+
+        Path destinations only:
+          - parallel=True fetches byte ranges over several connections
+            (see download_parallel()).
+          - resume=True writes to `<dest>.part` with a `<dest>.part.json`
+            checkpoint. A later call continues from the checkpoint with a
+            Range request; `dest` appears only once the size is verified
+            against `expected_size` (or the server-reported size).
+            `validator` (e.g. the item's modified_on) prevents resuming onto
+            another file version; the server ETag is used otherwise.
+          - retries re-attempts after transport errors (resuming when
+            resume=True).
+        """
+        if hasattr(dest, "write"):
+            response = self.open_download(vault_id)
+            self._raise_for_download_status(response)
+            self._write_response(response, dest, chunk_size=chunk_size)
+            logging.info(f"Downloaded {vault_id} -> {dest}")
+            return response.status_code
 
-        with open(dest, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
+        for attempt in range(retries + 1):
+            try:
+                if parallel:
+                    return self.download_parallel(
+                        vault_id,
+                        dest,
+                        chunk_size=chunk_size,
+                        connections=connections,
+                        part_size=part_size,
+                        resume=resume,
+                        expected_size=expected_size,
+                        validator=validator,
+                    )
+                if resume:
+                    return self._download_resumable(
+                        vault_id,
+                        dest,
+                        chunk_size=chunk_size,
+                        expected_size=expected_size,
+                        validator=validator,
+                    )
+
+                response = self.open_download(vault_id)
+                self._raise_for_download_status(response)
+                self._write_response(response, dest, chunk_size=chunk_size)
+                logging.info(f"Downloaded {vault_id} -> {dest}")
+                return response.status_code
+            except requests.RequestException as e:
+                if attempt >= retries:
+                    raise
+                logging.warning(f"Download of {vault_id} interrupted ({e}); retry {attempt + 1}/{retries}")
+
+    def _write_response(
+        self,
+        response: requests.Response,
+        dest: Union[str, BinaryIO],
+        *,
+        chunk_size: Optional[int] = None,
+    ) -> None:
+        chunks = _iter_response(response, chunk_size or self.download_chunk_size)
+
+        if hasattr(dest, "write"):
+            for chunk in chunks:
+                dest.write(chunk)
+        else:
+            with open(dest, "wb") as f:
+                for chunk in chunks:
                     f.write(chunk)
 
-        print(f"Downloaded {vault_id} -> {dest}")
-        return response.status_code
+    def _download_resumable(
+        self,
+        vault_id: str,
+        dest: str,
+        *,
+        chunk_size: Optional[int] = None,
+        expected_size: Optional[int] = None,
+        validator: Optional[str] = None,
+    ):
+        """Single-stream download into `<dest>.part`, continuing from its checkpoint."""
+        checkpoint = _Checkpoint(dest)
+        state = checkpoint.load(vault_id, mode="stream", validator=validator)
+        offset = state.get("received", 0)
+
+        saved_validator = state.get("validator")
+        response = self.open_download(
+            vault_id,
+            range_header=f"bytes={offset}-" if offset else None,
+            if_range=saved_validator if offset and _is_etag(saved_validator) else None,
+        )
+
+        if response.status_code == 416 and offset:
+            # Nothing left to fetch: either already complete or the file shrank.
+            response.close()
+            if state.get("size") == offset:
+                return self._promote(checkpoint, dest, vault_id, offset, expected_size, state.get("size"))
+            checkpoint.clear()
+            return self._download_resumable(vault_id, dest, chunk_size=chunk_size, expected_size=expected_size, validator=validator)
+
+        self._raise_for_download_status(response)
+        current = validator or response.headers.get("ETag") or response.headers.get("Last-Modified")
+
+        if response.status_code == 206:
+            start = _content_range_start(response)
+            if start != offset or (saved_validator and current and current != saved_validator):
+                # Different version or unexpected range: start over.
+                response.close()
+                checkpoint.clear()
+                return self._download_resumable(vault_id, dest, chunk_size=chunk_size, expected_size=expected_size, validator=validator)
+            total = _content_range_total(response)
+        else:
+            offset = 0
+            length = response.headers.get("Content-Length")
+            total = int(length) if length else None
+
+        if offset:
+            logging.info(f"Resuming {vault_id} at byte {offset}")
+
+        state = {"vault_id": vault_id, "mode": "stream", "validator": current, "size": total, "received": offset}
+        with open(checkpoint.part, "r+b" if offset else "wb") as f:
+            f.seek(offset)
+            f.truncate()
+            saved = offset
+            try:
+                for chunk in _iter_response(response, chunk_size or self.download_chunk_size):
+                    f.write(chunk)
+                    offset += len(chunk)
+                    if offset - saved >= CHECKPOINT_INTERVAL:
+                        f.flush()
+                        state["received"] = saved = offset
+                        checkpoint.save(state)
+            finally:
+                f.flush()
+                state["received"] = offset
+                checkpoint.save(state)
+
+        return self._promote(checkpoint, dest, vault_id, offset, expected_size, total, status=response.status_code)
+
+    def _promote(
+        self,
+        checkpoint: "_Checkpoint",
+        dest: str,
+        vault_id: str,
+        received: int,
+        expected_size: Optional[int],
+        total: Optional[int],
+        *,
+        status: int = 200,
+    ):
+        """Verify the .part size and move it into place."""
+        expected = expected_size if expected_size is not None else total
+        if expected is not None and received != expected:
+            if received > expected:
+                checkpoint.clear()
+            raise RuntimeError(f"Size mismatch for {vault_id}: expected {expected} bytes, got {received}")
+
+        os.replace(checkpoint.part, dest)
+        checkpoint.remove_sidecar()
+        logging.info(f"Downloaded {vault_id} -> {dest}")
+        return status
+
+    def download_parallel(
+        self,
+        vault_id: str,
+        dest: str,
+        *,
+        chunk_size: Optional[int] = None,
+        connections: Optional[int] = None,
+        part_size: Optional[int] = None,
+        resume: bool = False,
+        expected_size: Optional[int] = None,
+        validator: Optional[str] = None,
+    ):
+        """
+        Download a vault file as concurrent byte ranges into a preallocated file.
+
+        - probes the size with a one-byte Range request
+        - falls back to a single stream when the server ignores Range
+          (the probe response is then used as the full download)
+        - each worker uses its own pooled session and writes its range in place
+          into a temporary `<dest>.<id>.part`, which replaces `dest` only
+          once every range arrived (and is removed otherwise)
+        - with resume=True, ranges go to `<dest>.part` instead; completed
+          ranges are checkpointed and skipped on the next call
+        """
+        chunk_size = chunk_size or self.download_chunk_size
+        connections = max(1, connections or self.download_connections)
+        part_size = max(1, part_size or self.download_part_size)
+        single = dict(chunk_size=chunk_size, resume=resume, expected_size=expected_size, validator=validator)
+
+        probe = self.open_download(vault_id, range_header="bytes=0-0")
+        self._raise_for_download_status(probe)
+
+        total = _content_range_total(probe) if probe.status_code == 206 else None
+        if total is None:
+            # Range ignored (200) or total unknown: stream whatever we got.
+            if probe.status_code == 206 or resume:
+                probe.close()
+                return self.download(vault_id, dest, **single)
+            self._write_response(probe, dest, chunk_size=chunk_size)
+            logging.info(f"Downloaded {vault_id} -> {dest} (single stream)")
+            return probe.status_code
+        current = validator or probe.headers.get("ETag") or probe.headers.get("Last-Modified")
+        probe.close()
+
+        if total <= part_size or connections == 1:
+            return self.download(vault_id, dest, **single)
+
+        ranges = [(start, min(start + part_size, total) - 1) for start in range(0, total, part_size)]
+
+        checkpoint = _Checkpoint(dest) if resume else None
+        target = checkpoint.part if checkpoint else f"{dest}.{uuid.uuid4().hex[:8]}.part"
+        state: Dict[str, Any] = {}
+        if checkpoint:
+            state = checkpoint.load(vault_id, mode="ranges", validator=current)
+            if state.get("size") != total or state.get("part_size") != part_size:
+                checkpoint.clear()
+                state = {}
+            state = {
+                "vault_id": vault_id,
+                "mode": "ranges",
+                "validator": current,
+                "size": total,
+                "part_size": part_size,
+                "done": list(state.get("done", [])),
+            }
+
+        done = set(state.get("done", []))
+        todo = [(start, end) for start, end in ranges if start not in done]
+        received = sum(min(start + part_size, total) - start for start in done)
+
+        try:
+            if not done:
+                with open(target, "wb") as f:
+                    f.truncate(total)
+            elif todo:
+                logging.info(f"Resuming {vault_id}: {len(done)}/{len(ranges)} ranges already on disk")
+
+            state_lock = threading.Lock()
+
+            def _mark_done(start: int) -> None:
+                if not checkpoint:
+                    return
+                with state_lock:
+                    state["done"].append(start)
+                    checkpoint.save(state)
+
+            sessions: "queue.Queue[requests.Session]" = queue.Queue()
+            for _ in range(max(1, min(connections, len(todo)))):
+                sessions.put(requests.Session())
+
+            writer = _PositionalWriter(target)
+            try:
+                with ThreadPoolExecutor(max_workers=sessions.qsize(), thread_name_prefix="odata-range") as pool:
+                    futures = [
+                        pool.submit(self._fetch_range, vault_id, start, end, writer, sessions, chunk_size, _mark_done)
+                        for start, end in todo
+                    ]
+                    received += sum(fut.result() for fut in futures)
+            finally:
+                writer.close()
+                while not sessions.empty():
+                    sessions.get_nowait().close()
+
+            if checkpoint:
+                return self._promote(checkpoint, dest, vault_id, received, expected_size, total, status=206)
+
+            if received != total:
+                raise RuntimeError(f"Incomplete parallel download of {vault_id}: {received}/{total} bytes")
+            os.replace(target, dest)
+        except BaseException:
+            # Without a checkpoint a preallocated file with holes is worthless.
+            if not checkpoint:
+                try:
+                    os.remove(target)
+                except FileNotFoundError:
+                    pass
+            raise
+
+        logging.info(f"Downloaded {vault_id} -> {dest} ({len(ranges)} ranges)")
+        return 206
+
+    def _fetch_range(
+        self,
+        vault_id: str,
+        start: int,
+        end: int,
+        writer: "_PositionalWriter",
+        sessions: "queue.Queue[requests.Session]",
+        chunk_size: int,
+        on_done: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """Fetch bytes [start, end] on a borrowed session and write them in place."""
+        session = sessions.get()
+        try:
+            path = f"File('{vault_id}')/$value"
+            response = self.request_raw(
+                "GET",
+                path,
+                extra_headers={"Range": f"bytes={start}-{end}"},
+                stream=True,
+                session=session,
+            )
+            self._raise_for_download_status(response)
+            if response.status_code != 206:
+                response.close()
+                raise RuntimeError(f"Server ignored Range bytes={start}-{end} for {vault_id}")
+
+            offset = start
+            for chunk in _iter_response(response, chunk_size):
+                writer.write_at(chunk, offset)
+                offset += len(chunk)
+
+            if offset != end + 1:
+                raise RuntimeError(f"Short range bytes={start}-{end} for {vault_id}: got {offset - start} bytes")
+            if on_done:
+                on_done(start)
+            return offset - start
+        finally:
+            sessions.put(session)
+
+
+def _content_range_total(response: requests.Response) -> Optional[int]:
+    """Total size from a 'Content-Range: bytes a-b/N' header, if known."""
+    m = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+    if not m or m.group(3) == "*":
+        return None
+    return int(m.group(3))
+
+
+def _content_range_start(response: requests.Response) -> Optional[int]:
+    """First byte offset from a 'Content-Range: bytes a-b/N' header."""
+    m = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+    return int(m.group(1)) if m else None
+
+
+def _odata_literal(value: Any) -> str:
+    """
+    Format a value for $filter: numbers bare, datetimes as bare ISO-8601 UTC
+    DateTimeOffset literals (naive ones taken as UTC), strings quoted with
+    '' escaping.
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat(timespec="microseconds").replace("+00:00", "Z")
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _is_etag(value: Optional[str]) -> bool:
+    """True for strong/weak ETags ('"abc"', 'W/"abc"'), usable in If-Range."""
+    return bool(value) and (value.startswith('"') or value.startswith('W/"'))
+
+
+class _Checkpoint:
+    """Partial file (`<dest>.part`) plus its JSON sidecar (`<dest>.part.json`)."""
+
+    def __init__(self, dest: str):
+        self.part = f"{dest}.part"
+        self.sidecar = f"{dest}.part.json"
+
+    def load(self, vault_id: str, *, mode: str, validator: Optional[str] = None) -> Dict[str, Any]:
+        """Return saved state, or {} (and discard leftovers) if it does not match."""
+        try:
+            with open(self.sidecar, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+
+        valid = (
+            state.get("vault_id") == vault_id
+            and state.get("mode") == mode
+            and os.path.exists(self.part)
+            and (not validator or not state.get("validator") or state.get("validator") == validator)
+        )
+        if not valid:
+            self.clear()
+            return {}
+
+        if mode == "stream":
+            # Never trust bytes past the last checkpoint.
+            received = min(int(state.get("received", 0)), os.path.getsize(self.part))
+            state["received"] = received
+        return state
+
+    def save(self, state: Dict[str, Any]) -> None:
+        tmp = f"{self.sidecar}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.sidecar)
+
+    def remove_sidecar(self) -> None:
+        try:
+            os.remove(self.sidecar)
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        for path in (self.part, self.sidecar):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+class _PositionalWriter:
+    """Thread-safe writes at explicit offsets (pwrite where available)."""
+
+    def __init__(self, path: str):
+        self._fd = os.open(path, os.O_RDWR | getattr(os, "O_BINARY", 0))
+        self._lock = threading.Lock()
+
+    def write_at(self, data: bytes, offset: int) -> None:
+        view = memoryview(data)
+        while view:
+            if hasattr(os, "pwrite"):
+                n = os.pwrite(self._fd, view, offset)
+            else:
+                with self._lock:
+                    os.lseek(self._fd, offset, os.SEEK_SET)
+                    n = os.write(self._fd, view)
+            view = view[n:]
+            offset += n
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def _iter_response(response: requests.Response, chunk_size: int) -> Iterator[bytes]:
+    """Iterate non-empty body chunks and always release the connection."""
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if chunk:
+                yield chunk
+    finally:
+        response.close()
+
+
+class VaultStream(io.RawIOBase):
+    """Read-only raw stream over a streaming vault response."""
+
+    def __init__(self, response: requests.Response, *, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self._response = response
+        self._chunks = _iter_response(response, chunk_size)
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = memoryview(chunk)
 
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
 
+    def close(self) -> None:
+        if not self.closed:
+            self._chunks.close()
+        super().close()
@@ -0,0 +1,98 @@
+import os
+import sys
+import json
+import stat
+import tempfile
+
+from .cli import MinervaCLIClient
+
+# ------------------------------------------------------------
+# Fake CLI: sign-in creates a session file in the workspace; other server
+# commands without --auth:* flags fail like the real CLI once it is gone.
+# Every call is logged as [command, used_auth_flags, has_password_env].
+# ------------------------------------------------------------
+FAKE_CLI = """#!{python}
+import os, sys, json
+args = sys.argv[1:]
+local = args[args.index("--local") + 1]
+session = os.path.join(local, ".fake-session")
+with_auth = "--auth:mode" in args
+with open(os.path.join(local, "calls.log"), "a") as f:
+    f.write(json.dumps([args[0], with_auth, "ANS_MINERVA_AUTH__PASSWORD" in os.environ]) + "\\n")
+if args[0] == "sign-in":
+    open(session, "w").close()
+elif not with_auth and not os.path.exists(session):
+    sys.stderr.write("Error: the session has expired. Please sign in again.\\n")
+    sys.exit(3)
+print("[]")
+"""
+
+
+def calls(workspace: str):
+    path = os.path.join(workspace, "calls.log")
+    with open(path) as f:
+        out = [json.loads(line) for line in f]
+    os.remove(path)
+    return out
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        exe = os.path.join(tmp, "fake-minerva-cli")
+        with open(exe, "w") as f:
+            f.write(FAKE_CLI.format(python=sys.executable))
+        os.chmod(exe, os.stat(exe).st_mode | stat.S_IXUSR)
+
+        workspace = os.path.join(tmp, "ws")
+        os.makedirs(workspace)
+
+        client = MinervaCLIClient(
+            base_url="https://minerva.invalid",
+            database="SMOKE",
+            username="smoke",
+            password="secret",
+            cli_exe_path=exe,
+            name="SMOKE_CLI",
+            session_dir=os.path.join(tmp, "sessions"),
+        )
+
+        print("== Minerva CLI session smoke test ==")
+
+        # 1) A signed-in workspace runs without credentials.
+        client.sign_in(local=workspace)
+        client.download("ans_Data/1", local=workspace, parse_json=True)
+        got = calls(workspace)
+        print("[1] sign-in + download:", got)
+        if got != [["sign-in", True, True], ["download", False, False]] or not client.has_session(workspace):
+            print("[1] FAILED: download did not reuse the session")
+            return 1
+
+        # 2) The CLI rejects the session: forget it and retry once with credentials.
+        os.remove(os.path.join(workspace, ".fake-session"))
+        try:
+            client.download("ans_Data/1", local=workspace, parse_json=True)
+        except Exception as e:
+            print("[2] FAILED: rejected session was not retried:", e)
+            return 1
+        got = calls(workspace)
+        print("[2] download after revocation:", got)
+        if got != [["download", False, False], ["download", True, True]] or client.has_session(workspace):
+            print("[2] FAILED: expected one retry with credentials and no session left")
+            return 1
+
+        # 3) Until the next sign-in every command authenticates with flags.
+        client.download("ans_Data/1", local=workspace, parse_json=True)
+        client.sign_in(local=workspace)
+        client.download("ans_Data/1", local=workspace, parse_json=True)
+        got = calls(workspace)
+        print("[3] download, sign-in, download:", got)
+        if got != [["download", True, True], ["sign-in", True, True], ["download", False, False]]:
+            print("[3] FAILED: session was not restored by signing in again")
+            return 1
+
+    print("✅ Smoke test completed.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,506 @@
+# hierarchy_mirror.py
+from __future__ import annotations
+
+import json
+import time
+import sqlite3
+import threading
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Mapping, Optional, Sequence, Set, Tuple
+
+from datamodel.models import (
+    Badge,
+    ChildrenResult,
+    DetailsData,
+    FileNode,
+    FileSet,
+    NodeKind,
+    NodeRef,
+    Summary,
+)
+from logic.core.minerva.delta_sync import DeltaSync, SyncChange, normalize_watermark
+
+import logging
+logger = logging.getLogger("HierarchyMirror")
+
+ReadMode = Literal["live", "mirror"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    item_type TEXT NOT NULL,
+    role TEXT NOT NULL,
+    can_expand INTEGER,
+    summary TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS level0 (
+    filter_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    node_id TEXT NOT NULL,
+    PRIMARY KEY (filter_key, position)
+);
+CREATE TABLE IF NOT EXISTS children (
+    parent_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    node_id TEXT NOT NULL,
+    PRIMARY KEY (parent_id, position)
+);
+CREATE TABLE IF NOT EXISTS details (
+    node_id TEXT PRIMARY KEY,
+    summary TEXT NOT NULL,
+    has_files INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    owner_id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_folder INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    vault_id TEXT,
+    classification TEXT,
+    modified_on TEXT,
+    has_children INTEGER,
+    PRIMARY KEY (owner_id, category, position)
+);
+CREATE INDEX IF NOT EXISTS ix_files_name ON files (name);
+CREATE TABLE IF NOT EXISTS coverage (
+    scope TEXT PRIMARY KEY,
+    refreshed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_marks (
+    entity_set TEXT PRIMARY KEY,
+    mark TEXT NOT NULL
+);
+"""
+
+# SQLite's default limit on bound parameters is 999.
+_IN_CHUNK = 500
+
+_FILE_COLUMNS = ("id", "name", "is_folder", "size", "depth", "vault_id", "classification", "modified_on", "has_children")
+
+
+# ---------------- (De)serialization ----------------
+def _summary_to_json(summary: Summary) -> str:
+    return json.dumps(asdict(summary))
+
+
+def _summary_from_json(text: str) -> Summary:
+    data = json.loads(text)
+    badges = [Badge(**{**b, "views": tuple(b.get("views") or ())}) for b in data.get("badges") or []]
+    return Summary(title=data["title"], subtitle=data.get("subtitle"), badges=badges)
+
+
+def _filter_key(filters: Optional[Dict[str, Any]]) -> str:
+    return json.dumps(filters or {}, sort_keys=True, default=str)
+
+
+class HierarchyMirror:
+    """
+    Local SQLite copy of what the UI reads from a service.
+
+    Stores NodeRefs (level 0 lists per filter combination and children per
+    parent), detail summaries and FileNode trees, keyed so that each UI read
+    is a single indexed query. A `coverage` row records when each scope was
+    last written; reads of scopes that were never written return None so the
+    caller can fall back to the live service.
+
+    One connection per thread; WAL mode lets the refresh job write while
+    request threads read.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+            # Mirrors written before lazy file trees lack has_children.
+            if "has_children" not in {row[1] for row in conn.execute("PRAGMA table_info(files)")}:
+                conn.execute("ALTER TABLE files ADD COLUMN has_children INTEGER")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ---------------- Coverage ----------------
+    def refreshed_at(self, scope: str) -> Optional[float]:
+        row = self._conn().execute("SELECT refreshed_at FROM coverage WHERE scope = ?", (scope,)).fetchone()
+        return row[0] if row else None
+
+    def level0_filters(self) -> List[Optional[Dict[str, Any]]]:
+        """Filter combinations that have been mirrored (for the refresh job)."""
+        rows = self._conn().execute("SELECT scope FROM coverage WHERE scope LIKE 'level0:%'").fetchall()
+        return [json.loads(scope[len("level0:"):]) or None for (scope,) in rows]
+
+    def sync_mark(self, entity_set: str) -> Optional[str]:
+        """modified_on watermark of `entity_set` the mirror was last brought up to."""
+        row = self._conn().execute("SELECT mark FROM sync_marks WHERE entity_set = ?", (entity_set,)).fetchone()
+        return row[0] if row else None
+
+    def _set_sync_marks(self, marks: Mapping[str, Optional[str]]) -> None:
+        with self._conn() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO sync_marks (entity_set, mark) VALUES (?, ?)",
+                [(name, mark or "") for name, mark in marks.items()],
+            )
+
+    def _ids_in(self, sql: str, ids: Sequence[str]) -> List[Tuple[Any, ...]]:
+        """Run `sql` (with one "{}" for the IN list) over `ids` in chunks."""
+        out: List[Tuple[Any, ...]] = []
+        for i in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[i:i + _IN_CHUNK]
+            out.extend(self._conn().execute(sql.format(", ".join("?" * len(chunk))), chunk).fetchall())
+        return out
+
+    @staticmethod
+    def _touch(conn: sqlite3.Connection, scope: str) -> None:
+        conn.execute("INSERT OR REPLACE INTO coverage (scope, refreshed_at) VALUES (?, ?)", (scope, time.time()))
+
+    # ---------------- Nodes ----------------
+    @staticmethod
+    def _put_nodes(conn: sqlite3.Connection, nodes: Sequence[NodeRef]) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO nodes (id, kind, item_type, role, can_expand, summary) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (n.id, n.kind.value, n.item_type, n.role,
+                 None if n.can_expand is None else int(n.can_expand), _summary_to_json(n.summary))
+                for n in nodes
+            ],
+        )
+
+    @staticmethod
+    def _to_node(row: Sequence[Any]) -> NodeRef:
+        node_id, kind, item_type, role, can_expand, summary = row
+        return NodeRef(
+            id=node_id,
+            kind=NodeKind(kind),
+            summary=_summary_from_json(summary),
+            item_type=item_type,
+            role=role,
+            can_expand=None if can_expand is None else bool(can_expand),
+        )
+
+    def put_level0(self, filters: Optional[Dict[str, Any]], nodes: Sequence[NodeRef]) -> None:
+        key = _filter_key(filters)
+        with self._conn() as conn:
+            self._put_nodes(conn, nodes)
+            conn.execute("DELETE FROM level0 WHERE filter_key = ?", (key,))
+            conn.executemany(
+                "INSERT INTO level0 (filter_key, position, node_id) VALUES (?, ?, ?)",
+                [(key, i, n.id) for i, n in enumerate(nodes)],
+            )
+            self._touch(conn, f"level0:{key}")
+
+    def get_level0(self, filters: Optional[Dict[str, Any]]) -> Optional[List[NodeRef]]:
+        key = _filter_key(filters)
+        if self.refreshed_at(f"level0:{key}") is None:
+            return None
+        rows = self._conn().execute(
+            "SELECT n.id, n.kind, n.item_type, n.role, n.can_expand, n.summary "
+            "FROM level0 l JOIN nodes n ON n.id = l.node_id WHERE l.filter_key = ? ORDER BY l.position",
+            (key,),
+        ).fetchall()
+        return [self._to_node(r) for r in rows]
+
+    def put_children(self, parent_id: str, nodes: Sequence[NodeRef]) -> None:
+        with self._conn() as conn:
+            self._put_nodes(conn, nodes)
+            conn.execute("DELETE FROM children WHERE parent_id = ?", (parent_id,))
+            conn.executemany(
+                "INSERT INTO children (parent_id, position, node_id) VALUES (?, ?, ?)",
+                [(parent_id, i, n.id) for i, n in enumerate(nodes)],
+            )
+            self._touch(conn, f"children:{parent_id}")
+
+    def get_children(self, parent_id: str) -> Optional[List[NodeRef]]:
+        if self.refreshed_at(f"children:{parent_id}") is None:
+            return None
+        rows = self._conn().execute(
+            "SELECT n.id, n.kind, n.item_type, n.role, n.can_expand, n.summary "
+            "FROM children c JOIN nodes n ON n.id = c.node_id WHERE c.parent_id = ? ORDER BY c.position",
+            (parent_id,),
+        ).fetchall()
+        return [self._to_node(r) for r in rows]
+
+    # ---------------- Details / files ----------------
+    def put_details(self, node_id: str, details: DetailsData) -> None:
+        if not isinstance(details.summary, Summary):
+            return  # Placeholder details (unknown node kind); not worth mirroring.
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO details (node_id, summary, has_files) VALUES (?, ?, ?)",
+                (node_id, _summary_to_json(details.summary), int(details.files is not None)),
+            )
+            conn.execute("DELETE FROM files WHERE owner_id = ?", (node_id,))
+            if details.files is not None:
+                for category, nodes in (("inputs", details.files.inputs), ("outputs", details.files.outputs)):
+                    conn.executemany(
+                        "INSERT INTO files (owner_id, category, position, id, name, is_folder, size, depth, "
+                        "vault_id, classification, modified_on, has_children) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (node_id, category, i, f.id, f.name, int(f.is_folder), f.size, f.depth,
+                             f.vault_id, f.classification, f.modified_on,
+                             None if f.has_children is None else int(f.has_children))
+                            for i, f in enumerate(nodes)
+                        ],
+                    )
+            self._touch(conn, f"details:{node_id}")
+
+    def get_files(self, node_id: str) -> Optional[FileSet]:
+        if self.refreshed_at(f"details:{node_id}") is None:
+            return None
+        rows = self._conn().execute(
+            f"SELECT category, {', '.join(_FILE_COLUMNS)} FROM files WHERE owner_id = ? ORDER BY category, position",
+            (node_id,),
+        ).fetchall()
+        out: Dict[str, List[FileNode]] = {"inputs": [], "outputs": []}
+        for category, *values in rows:
+            data = dict(zip(_FILE_COLUMNS, values))
+            data["is_folder"] = bool(data["is_folder"])
+            data["has_children"] = None if data["has_children"] is None else bool(data["has_children"])
+            out[category].append(FileNode(**data))
+        return FileSet(out["inputs"], out["outputs"])
+
+    def get_details(self, node_id: str) -> Optional[DetailsData]:
+        row = self._conn().execute("SELECT summary, has_files FROM details WHERE node_id = ?", (node_id,)).fetchone()
+        if row is None:
+            return None
+        files = self.get_files(node_id) if row[1] else None
+        return DetailsData(_summary_from_json(row[0]), files)
+
+    def iter_file_sets(self) -> Iterator[Tuple[str, str, str, FileSet]]:
+        """(owner id, item type, title, files) for every mirrored item that has files."""
+        rows = self._conn().execute(
+            "SELECT d.node_id, n.item_type, d.summary FROM details d JOIN nodes n ON n.id = d.node_id "
+            "WHERE d.has_files = 1"
+        ).fetchall()
+        for node_id, item_type, summary in rows:
+            files = self.get_files(node_id)
+            if files is not None:
+                yield node_id, item_type, _summary_from_json(summary).title, files
+
+    # ---------------- Refresh ----------------
+    def refresh_from(self, service: Any) -> Dict[str, int]:
+        """
+        Re-read everything reachable from the mirrored level 0 lists through
+        the live `service` and store it. Used once to build a new mirror;
+        after that apply_changes() keeps it current.
+        """
+        started = time.monotonic()
+        counts = {"level0": 0, "nodes": 0, "details": 0}
+        seen = set()
+
+        pending = self._refresh_level0(service, counts)
+        while pending:
+            node = pending.pop()
+            if node.id in seen:
+                continue
+            seen.add(node.id)
+            pending.extend(self._refresh_node(service, node, counts))
+
+        logger.info(f"Mirror refreshed {counts} in {time.monotonic() - started:.1f}s")
+        return counts
+
+    def apply_changes(
+        self,
+        service: Any,
+        changes: Sequence[SyncChange],
+        keys: Mapping[str, Sequence[str]],
+        *,
+        file_entity_set: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """
+        Bring the mirror up to date from one DeltaSync refresh.
+
+        `keys` is service.hierarchy_change_keys(): every changed or deleted
+        row touches its own id and the ids its reference properties name.
+        Touched nodes are re-read (details and children), as are the
+        children lists of their parents and the owners of touched files.
+        Level 0 lists are re-read whenever anything was touched.
+
+        DeltaSync starts with a full load after a restart; rows older than
+        the mark stored here are skipped then, and mirrored ids missing from
+        the reloaded set count as deleted. A mirror without any marks is
+        built with refresh_from().
+        """
+        marks = {c.stats.entity_set: c.stats.watermark for c in changes if c.stats.entity_set in keys}
+        if not self._conn().execute("SELECT 1 FROM sync_marks LIMIT 1").fetchone():
+            counts = self.refresh_from(service)
+            self._set_sync_marks(marks)
+            return counts
+
+        touched: Set[str] = set()
+        for change in changes:
+            entity_set = change.stats.entity_set
+            refs = keys.get(entity_set)
+            if refs is None:
+                continue
+            rows = change.changed
+            if change.stats.full:
+                mark = self.sync_mark(entity_set)
+                if mark is None:
+                    continue  # Newly tracked set; the mirror was built without it.
+                mark = normalize_watermark(mark) or ""
+                rows = [r for r in rows if (normalize_watermark(r.get("modified_on")) or "") >= mark]
+                touched |= self._vanished(entity_set, {str(r["id"]) for r in change.changed}, file_entity_set)
+            for row in [*rows, *change.deleted]:
+                touched.add(str(row["id"]))
+                for ref in refs:
+                    value = row.get(f"{ref}@aras.id") or row.get(ref)
+                    if value:
+                        touched.add(str(value))
+
+        counts = self.refresh_ids(service, touched) if touched else {"level0": 0, "nodes": 0, "details": 0}
+        self._set_sync_marks(marks)
+        return counts
+
+    def _vanished(self, entity_set: str, present: Set[str], file_entity_set: Optional[str]) -> Set[str]:
+        """Mirrored ids of `entity_set` that a full reload no longer contains."""
+        if entity_set == file_entity_set:
+            rows = self._conn().execute("SELECT DISTINCT id FROM files").fetchall()
+        else:
+            rows = self._conn().execute("SELECT id FROM nodes WHERE item_type = ?", (entity_set,)).fetchall()
+        return {row[0] for row in rows} - present
+
+    def refresh_ids(self, service: Any, ids: Iterable[str]) -> Dict[str, int]:
+        """Re-read the mirrored nodes affected by changes to `ids` (see apply_changes)."""
+        started = time.monotonic()
+        ids = sorted(set(ids))
+        counts = {"level0": 0, "nodes": 0, "details": 0}
+        node_columns = "id, kind, item_type, role, can_expand, summary"
+
+        owner_ids = [row[0] for row in self._ids_in("SELECT DISTINCT owner_id FROM files WHERE id IN ({})", ids)]
+        nodes = {
+            row[0]: self._to_node(row)
+            for row in self._ids_in(f"SELECT {node_columns} FROM nodes WHERE id IN ({{}})", sorted(set(ids) | set(owner_ids)))
+        }
+        parents = {
+            row[0]: self._to_node(row)
+            for row in self._ids_in(
+                f"SELECT {node_columns} FROM nodes WHERE id IN "
+                "(SELECT DISTINCT parent_id FROM children WHERE node_id IN ({}))",
+                ids,
+            )
+            if row[0] not in nodes
+        }
+
+        self._refresh_level0(service, counts)
+        for node in nodes.values():
+            self._refresh_node(service, node, counts)
+        for parent in parents.values():
+            self._refresh_node(service, parent, counts, details=False)
+
+        logger.info(f"Mirror updated {counts} for {len(ids)} changed id(s) in {time.monotonic() - started:.1f}s")
+        return counts
+
+    def _refresh_level0(self, service: Any, counts: Dict[str, int]) -> List[NodeRef]:
+        nodes: List[NodeRef] = []
+        for filters in self.level0_filters() or [None]:
+            listed = service.list_level0(filters=filters)
+            self.put_level0(filters, listed)
+            counts["level0"] += 1
+            nodes.extend(listed)
+        return nodes
+
+    def _refresh_node(self, service: Any, node: NodeRef, counts: Dict[str, int], *, details: bool = True) -> List[NodeRef]:
+        """Re-read one node's details and children; returns the children."""
+        counts["nodes"] += 1
+        try:
+            if details:
+                self.put_details(node.id, service.get_details(node))
+                counts["details"] += 1
+            if not node.kind.is_leaf():
+                children = service.get_children(node).children
+                self.put_children(node.id, children)
+                return list(children)
+        except Exception as e:
+            logger.error(f"Mirror refresh failed for {node.item_type} {node.id}: {e}")
+        return []
+
+
+class MirroredService:
+    """
+    Wraps a service and answers list_level0 / get_children / get_details from
+    a HierarchyMirror when `mode == "mirror"`; everything else (and any scope
+    the mirror does not have yet) goes to the live service, and live answers
+    are written through so the next read is local.
+    """
+
+    def __init__(self, service: Any, mirror: HierarchyMirror, *, mode: ReadMode = "mirror"):
+        self.live = service
+        self.mirror = mirror
+        self.mode = mode
+        self._sync: Optional[DeltaSync] = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.live, name)
+
+    # ---------------- UI Contract ----------------
+    def list_level0(self, *, filters: Optional[Dict[str, Any]] = None) -> List[NodeRef]:
+        if self.mode == "mirror":
+            nodes = self.mirror.get_level0(filters)
+            if nodes is not None:
+                return nodes
+        nodes = self.live.list_level0(filters=filters)
+        self.mirror.put_level0(filters, nodes)
+        return nodes
+
+    def get_children(self, node: NodeRef) -> ChildrenResult:
+        if self.mode == "mirror":
+            children = self.mirror.get_children(node.id)
+            if children is not None:
+                return ChildrenResult(node, children)
+        result = self.live.get_children(node)
+        self.mirror.put_children(node.id, result.children)
+        return result
+
+    def get_details(self, node: NodeRef) -> DetailsData:
+        if self.mode == "mirror":
+            details = self.mirror.get_details(node.id)
+            if details is not None:
+                return details
+        details = self.live.get_details(node)
+        self.mirror.put_details(node.id, details)
+        return details
+
+    # ---------------- Background refresh ----------------
+    def start_refresh(self, interval: float) -> None:
+        """
+        Follow the live service's delta sync (enable_mirror): every `interval`
+        seconds it pulls the rows changed since the last sync, and only the
+        mirrored nodes those rows affect are re-read (HierarchyMirror.apply_changes).
+        """
+        if self._sync is not None:
+            return
+        threading.Thread(target=self._seed_file_index, name="hierarchy-mirror-seed", daemon=True).start()
+
+        keys = self.live.hierarchy_change_keys()
+        file_entity_set = getattr(getattr(self.live, "mapping", None), "data_item_type", None)
+
+        def on_change(changes: List[SyncChange]) -> None:
+            self.mirror.apply_changes(self.live, changes, keys, file_entity_set=file_entity_set)
+
+        self._sync = self.live.enable_mirror(interval=interval, track=keys, on_change=on_change)
+
+    def _seed_file_index(self) -> None:
+        """Fill the live service's file search index from the mirror so search works before the first refresh."""
+        if not hasattr(self.live, "_index_file_set"):
+            return
+        try:
+            for owner_id, item_type, title, files in self.mirror.iter_file_sets():
+                self.live._index_file_set(item_type, owner_id, title, files)
+        except Exception as e:
+            logger.error(f"Seeding file index from mirror failed: {e}")
+
+    def stop_refresh(self, timeout: Optional[float] = None) -> None:
+        if self._sync is not None:
+            self._sync.stop(timeout)
+            self._sync = None
@@ -1,8 +1,14 @@
 # ootb_service.py
 from __future__ import annotations
 
+import os
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Optional, List, Sequence
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, Optional, List, Sequence, Set, Tuple, Union
 
 from datamodel.models import (
     FilterSpec,
@@ -18,12 +24,20 @@ from datamodel.models import (
     ChildrenResult,
     FileNode,
     FileSet,
+    FileHit,
     BadgeColor,
     merge_badge_specs,
     status_color,
 )
 from logic.core.minerva.odata import MinervaODataClient
-from logic.core.minerva.cli import MinervaCLIClient
+from logic.core.minerva.async_odata import AsyncMinervaODataClient
+from logic.core.minerva.delta_sync import DeltaSync, MemoryMirrorStore, SyncChange
+from logic.core.minerva.cli import CLIItemResult, MinervaCLIClient, MinervaCliError
+from logic.core.minerva.cli_scheduler import CLIJob, CLIScheduler
+from logic.core.minerva.cli_progress import CLIProgress, CLIProgressTracker
+from logic.utils.zipstream import ZipEntry, iter_zip
+from logic.utils.response_cache import ResponseCache
+from logic.utils.file_index import FileSearchIndex
 
 import logging
 from ..utils.decorators import log
@@ -131,16 +145,35 @@ class OOTBService:
         password: str,
         cli_exe_path: Optional[str] = None,
         mapping: Optional[TenantMapping] = None,
+        odata_cache: Optional[ResponseCache] = None,
+        lazy_file_trees: bool = False,
+        prefetch_file_trees: bool = False,
+        cli_max_concurrency: int = 2,
     ):
         self.mapping = mapping or TenantMapping()
 
+        # Lazy trees: get_details returns the first level only and folders
+        # are opened with list_folder_children(); prefetch warms one level ahead.
+        self.lazy_file_trees = lazy_file_trees
+        self.prefetch_file_trees = prefetch_file_trees
+        self._folder_cache: "OrderedDict[str, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._folder_cache_lock = threading.Lock()
+        self._prefetch_pool: Optional[ThreadPoolExecutor] = None
+
+        # Pending/finished sign-in jobs per CLI workspace (--local dir); the
+        # sessions themselves are recorded on disk by the CLI client.
+        self._cli_sign_ins: Dict[str, CLIJob] = {}
+        self._cli_sign_in_lock = threading.Lock()
+
         # Create infrastructure clients internally
         self.odata = MinervaODataClient(
             base_url=base_url,
             database=database,
             username=username,
             password=password,
+            cache=odata_cache,
         )
+        self.odata_async = AsyncMinervaODataClient(self.odata)
         self.cli = MinervaCLIClient(
             base_url=base_url,
             database=database,
@@ -148,6 +181,16 @@ class OOTBService:
             password=password,
             cli_exe_path=cli_exe_path,
         )
+        # All CLI work goes through this pool: at most cli_max_concurrency processes at once
+        self.cli_jobs = CLIScheduler(self.cli, max_concurrency=cli_max_concurrency)
+        # Sign-in jobs pending in the parent never finish in a forked child.
+        self.cli_jobs.add_fork_hook(self._reset_cli_sign_ins)
+
+        # Optional local mirror, see enable_mirror()
+        self.mirror: Optional[DeltaSync] = None
+
+        # Filename search over every file tree loaded so far, see search_files()
+        self.file_index = FileSearchIndex()
 
         # Display policy (summary/badges)
         self.display_policy = OOTBDisplayPolicy(self.mapping)
@@ -163,6 +206,11 @@ class OOTBService:
         1: "Work Request",
         2: "Task",
     }
+    FILE_TREE_EXPAND = "related_id($select=id,keyed_name,file_size,classification,is_folder,local_file,modified_on)"
+    CLI_BATCH_SIZE = 200  # remotes per CLI invocation (keeps the command line short)
+    CLI_SIGN_IN_PRIORITY = 100  # sign-ins jump the queue of transfers waiting on them
+    FOLDER_CACHE_TTL = 120.0
+    FOLDER_CACHE_MAX = 4096
 
     def default_section_title(self, level: int, fallback: str) -> str:
         return self.DEFAULT_SECTION_TITLES.get(level, fallback)
@@ -174,6 +222,155 @@ class OOTBService:
         # Default: filters are not supported
         return {}
 
+    # ---------------- Mirror ----------------
+    def mirrored_entity_sets(self) -> Dict[str, List[str]]:
+        """Entity sets read through _list_entity/_get_entity, with the columns those reads use."""
+        return {
+            self.mapping.project_item_type: [
+                "id", "item_number", "keyed_name", "name", "created_on", "modified_on", "modified_by_id",
+            ],
+        }
+
+    def hierarchy_change_keys(self) -> Dict[str, List[str]]:
+        """
+        Entity sets whose changes alter what the UI shows, each with the
+        reference properties that name the affected parent item. A changed
+        row affects its own id plus those references (e.g. a new
+        WR -> input relationship row changes its source WR).
+        """
+        m = self.mapping
+        return {
+            m.project_item_type: [],
+            m.wr_item_type: [],
+            m.task_item_type: [],
+            m.data_item_type: [],
+            m.rel_project_to_wr: ["source_id"],
+            m.rel_wr_to_task: ["source_id"],
+            m.rel_wr_to_input: ["source_id"],
+            m.rel_wr_to_output: ["source_id"],
+            m.rel_task_to_input: ["source_id"],
+            m.rel_task_to_output: ["source_id"],
+            m.rel_data_to_child_data: ["source_id"],
+        }
+
+    def enable_mirror(
+        self,
+        *,
+        interval: float,
+        store: Optional[MemoryMirrorStore] = None,
+        track: Optional[Dict[str, List[str]]] = None,
+        on_change: Optional[Callable[[List[SyncChange]], None]] = None,
+    ) -> DeltaSync:
+        """
+        Keep a delta-synced local copy of the hierarchy's entity sets and
+        serve reads from it once loaded (live OData until then).
+
+        `track` adds entity sets (with extra columns) that are synced only so
+        `on_change` sees their deltas, e.g. for MirroredService. The owners
+        of indexed files are always tracked so deleted ones leave the file
+        search index.
+        """
+        selects = {name: list(fields) for name, fields in self.mirrored_entity_sets().items()}
+        owners = {self.mapping.wr_item_type: [], self.mapping.task_item_type: []}
+        for name, fields in {**owners, **(track or {})}.items():
+            selects[name] = list(dict.fromkeys(selects.get(name, ["id"]) + list(fields)))
+
+        def _on_change(changes: List[SyncChange]) -> None:
+            self._drop_deleted_owners(changes)
+            if on_change is not None:
+                on_change(changes)
+
+        self.mirror = DeltaSync(self.odata, list(selects), store=store, select=selects, on_change=_on_change)
+        self.mirror.start(interval)
+        return self.mirror
+
+    def _list_entity(
+        self,
+        entity_set: str,
+        *,
+        select: Optional[Sequence[str]] = None,
+        filter: Optional[str] = None,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[dict]:
+        """
+        List an entity set from the mirror when it covers it, else live.
+        `where` is the field-equality form of `filter` used for the mirror.
+        """
+        if self.mirror is not None and self.mirror.covers(entity_set):
+            return self.mirror.rows(entity_set, where=where)
+        return self.odata.list(entity_set, select=select, filter=filter)
+
+    def _get_entity(self, entity_set: str, item_id: str) -> dict:
+        if self.mirror is not None and self.mirror.covers(entity_set):
+            row = self.mirror.get(entity_set, item_id)
+            if row is not None:
+                return row
+        return self.odata.get(entity_set, item_id)
+
+    # ---------------- File Search ----------------
+    def search_files(self, query: str, *, limit: int = 20) -> List[FileHit]:
+        """Ranked filename search across all indexed work request / task files."""
+        return self.file_index.search(query, limit=limit)
+
+    def index_all_files(self) -> int:
+        """
+        Walk the whole hierarchy and load every item's file trees into the
+        search index (get_details indexes as a side effect). Returns the
+        number of items visited; failures are logged and skipped.
+        """
+        visited: Set[str] = set()
+        failed = False
+        pending = list(self.list_level0())
+        while pending:
+            node = pending.pop()
+            try:
+                if node.kind != NodeKind.LEVEL0:
+                    self.get_details(node)
+                    visited.add(node.id)
+                if node.can_expand is not False:
+                    pending.extend(self.get_children(node).children)
+            except Exception as e:
+                failed = True
+                logging.error(f"index_all_files: {node.kind} {node.id} failed: {e}")
+
+        # Owners a complete walk did not reach no longer exist upstream.
+        removed = 0 if failed else sum(self.file_index.remove_owner(o) for o in self.file_index.owner_ids() - visited)
+        logging.info(f"index_all_files: {len(visited)} items, {len(self.file_index)} files indexed, {removed} owners dropped")
+        return len(visited)
+
+    def _drop_deleted_owners(self, changes: List[SyncChange]) -> None:
+        """Remove items the delta sync reports as deleted from the file search index."""
+        removed = sum(self.file_index.remove_owner(row["id"]) for c in changes for row in c.deleted if row.get("id"))
+        if removed:
+            logging.info(f"File index: dropped {removed} deleted owner(s)")
+
+    def start_file_indexing(self, interval: float) -> threading.Thread:
+        """
+        Run index_all_files() on a daemon thread, then again every `interval`
+        seconds (once only if `interval` is 0).
+        """
+        def loop():
+            while True:
+                try:
+                    self.index_all_files()
+                except Exception as e:
+                    logging.error(f"File indexing failed: {e}")
+                if interval <= 0:
+                    return
+                time.sleep(interval)
+
+        thread = threading.Thread(target=loop, name="file-index", daemon=True)
+        thread.start()
+        return thread
+
+    def _index_file_set(self, item_type: str, item_id: str, label: Optional[str], files: FileSet) -> None:
+        self.file_index.index_owner(
+            owner_id=item_id,
+            owner_type=item_type,
+            owner_label=label,
+            files=[("inputs", f) for f in files.inputs] + [("outputs", f) for f in files.outputs],
+        )
+
     # ---------------- UI Contract ----------------
 
     def list_level0(self, *, filters: Optional[dict[str, Any]] = None) -> List[NodeRef]:
@@ -185,7 +382,7 @@ class OOTBService:
                          "created_on",
                          "modified_on",
                          ]
-        rows = self.odata.list(self.mapping.project_item_type, select=select_fields)
+        rows = self._list_entity(self.mapping.project_item_type, select=select_fields)
         print(f"list_level0: fetched {len(rows)} {self.mapping.project_item_type}")
         out = [
             NodeRef(
@@ -235,20 +432,25 @@ class OOTBService:
     def get_details(self, node: NodeRef) -> DetailsData:
         """Return summary and optional files"""
         if node.kind == NodeKind.LEVEL0:
-            raw = self.odata.get(self.mapping.project_item_type, node.id)
+            raw = self._get_entity(self.mapping.project_item_type, node.id)
             summary = self._to_summary(raw, item_type=self.mapping.project_item_type)
             return DetailsData(summary, None)
 
         if node.kind == NodeKind.LEVEL1:
-            raw = self.odata.get(self.mapping.wr_item_type, node.id)
-            summary = self._to_summary(raw, item_type=self.mapping.wr_item_type)
-            return DetailsData(summary, files)
+            return self._details_with_files(
+                self.mapping.wr_item_type,
+                node.id,
+                self.mapping.rel_wr_to_input,
+                self.mapping.rel_wr_to_output,
+            )
 
         if node.kind == NodeKind.LEVEL2:
-            raw = self.odata.get(self.mapping.task_item_type, node.id)
-            summary = self._to_summary(raw, item_type=self.mapping.task_item_type)
-            files = self._task_files(node.id)
-            return DetailsData(summary, files)
+            return self._details_with_files(
+                self.mapping.task_item_type,
+                node.id,
+                self.mapping.rel_task_to_input,
+                self.mapping.rel_task_to_output,
+            )
 
         return DetailsData({"id": node.id}, None)
 
@@ -295,6 +497,20 @@ class OOTBService:
 
         return Summary(title=title, subtitle=subtitle, badges=badges)
 
+    def _file_node(self, item: Dict[str, Any], depth: int, *, lazy: bool = False) -> FileNode:
+        is_folder = item.get("is_folder") == "1"
+        return FileNode(
+            id=str(item["id"]),
+            name=str(item.get("keyed_name") or ""),
+            is_folder=is_folder,
+            size=int(item.get("file_size") or 0),
+            depth=depth,
+            vault_id=item.get("local_file@aras.id") if not is_folder else "None",
+            classification=item.get("classification"),
+            modified_on=item.get("modified_on"),
+            has_children=is_folder if lazy else None,
+        )
+
     def _list_file_tree(
         self,
         *,
@@ -302,102 +518,558 @@ class OOTBService:
         root_id: str,
         root_relationship_name: str,
         expand: str,
+        recursive: bool = True,
     ) -> List[FileNode]:
         """
-        Recursively collect files/folders starting from a root item.
+        Collect files/folders starting from a root item, one depth at a time.
         Depth 0:
             root_item_type + root_relationship_name
             e.g. WR -> Ans_SimReq_Input
         Depth > 0:
             Ans_Data -> Ans_DataChild
-        """
-        def _recurse(parent_id: str, depth: int) -> List[FileNode]:
-            flattened: List[FileNode] = []
 
-            item_type = root_item_type if depth == 0 else self.mapping.data_item_type
-            rel_name = root_relationship_name if depth == 0 else self.mapping.rel_data_to_child_data
+        All folders of a depth are listed concurrently (bounded by
+        odata_async.max_concurrency). The result is still in depth-first
+        order, parents before their children.
 
-            items = self.odata.list_related(
-                item_type,
-                parent_id,
-                rel_name,
+        With recursive=False only depth 0 is listed and folders come back
+        with has_children=True; open them with list_folder_children().
+        """
+        def _list_children(folder: FileNode):
+            return self.odata_async.list_related(
+                self.mapping.data_item_type,
+                folder.id,
+                self.mapping.rel_data_to_child_data,
                 expand=expand,
             )
 
-            for item in items:
-                is_folder = item.get("is_folder") == "1"
-
-                flattened.append(
-                    FileNode(
-                        id=str(item["id"]),
-                        name=str(item.get("keyed_name") or ""),
-                        is_folder=is_folder,
-                        size=int(item.get("file_size") or 0),
-                        depth=depth,
-                        vault_id=item.get("local_file@aras.id") if not is_folder else "None",
-                        classification=item.get("classification"),
-                    )
-                )
+        roots = [
+            self._file_node(item, 0, lazy=not recursive)
+            for item in self.odata.list_related(root_item_type, root_id, root_relationship_name, expand=expand)
+        ]
+        if not recursive:
+            self._prefetch_folders(roots)
+            return roots
 
-                if is_folder:
-                    flattened.extend(_recurse(str(item["id"]), depth + 1))
+        # Breadth-first: fetch every folder of the current depth in one fan-out.
+        children: Dict[int, List[FileNode]] = {}
+        level = [n for n in roots if n.is_folder]
+        while level:
+            listed = self.odata_async.map_sync(_list_children, level)
+            next_level: List[FileNode] = []
+            for folder, items in zip(level, listed):
+                nodes = [self._file_node(item, folder.depth + 1) for item in items]
+                children[id(folder)] = nodes
+                next_level.extend(n for n in nodes if n.is_folder)
+            level = next_level
 
-            return flattened
+        # Reassemble in depth-first pre-order.
+        flattened: List[FileNode] = []
+        stack = list(reversed(roots))
+        while stack:
+            node = stack.pop()
+            flattened.append(node)
+            stack.extend(reversed(children.get(id(node), [])))
+        return flattened
 
-        return _recurse(root_id, 0)
+    # ---------------- Lazy Folders ----------------
+    def list_folder_children(self, folder_id: str, *, depth: int = 1) -> List[FileNode]:
+        """
+        One level of a folder, for lazy trees. `depth` is the depth the
+        children are shown at (parent depth + 1). Sub-folders come back with
+        has_children=True.
+        """
+        items = self._cached_folder_items(folder_id)
+        if items is None:
+            items = self.odata.list_related(
+                self.mapping.data_item_type,
+                folder_id,
+                self.mapping.rel_data_to_child_data,
+                expand=self.FILE_TREE_EXPAND,
+            )
+            self._cache_folder_items(folder_id, items)
 
-    def _wr_files(self, wr_id: str):
-        """Fetch all files and folders recursively for a given Work Request."""
-        results = {"inputs": [], "outputs": []}
-        expand = "related_id($select=id,keyed_name,file_size,classification,is_folder,local_file)"
+        nodes = [self._file_node(item, depth, lazy=True) for item in items]
+        self._prefetch_folders(nodes)
+        return nodes
 
-        rel_map = {
-            self.mapping.rel_wr_to_input: "inputs",
-            self.mapping.rel_wr_to_output: "outputs",
-        }
+    def _cached_folder_items(self, folder_id: str) -> Optional[List[Dict[str, Any]]]:
+        with self._folder_cache_lock:
+            entry = self._folder_cache.get(folder_id)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            self._folder_cache.move_to_end(folder_id)
+            return entry[1]
 
-        for rel, category in rel_map.items():
-            results[category] = self._list_file_tree(
-                root_item_type=self.mapping.wr_item_type,
-                root_id=wr_id,
-                root_relationship_name=rel,
-                expand=expand,
+    def _cache_folder_items(self, folder_id: str, items: List[Dict[str, Any]]) -> None:
+        with self._folder_cache_lock:
+            self._folder_cache[folder_id] = (time.monotonic() + self.FOLDER_CACHE_TTL, items)
+            self._folder_cache.move_to_end(folder_id)
+            while len(self._folder_cache) > self.FOLDER_CACHE_MAX:
+                self._folder_cache.popitem(last=False)
+
+    def _prefetch_folders(self, nodes: Sequence[FileNode]) -> None:
+        """Warm the folder cache with the children of `nodes`' folders in the background."""
+        if not self.prefetch_file_trees:
+            return
+        folders = [n.id for n in nodes if n.is_folder and self._cached_folder_items(n.id) is None]
+        if not folders:
+            return
+
+        def _warm():
+            listed = self.odata_async.map_sync(
+                lambda folder_id: self.odata_async.list_related(
+                    self.mapping.data_item_type,
+                    folder_id,
+                    self.mapping.rel_data_to_child_data,
+                    expand=self.FILE_TREE_EXPAND,
+                ),
+                folders,
             )
+            for folder_id, items in zip(folders, listed):
+                self._cache_folder_items(folder_id, items)
 
-        return FileSet(results["inputs"], results["outputs"])
+        def _done(future):
+            if future.exception() is not None:
+                logging.warning(f"Folder prefetch failed: {future.exception()}")
 
-    def _task_files(self, task_id: str):
-        """Fetch all files and folders recursively for a given Task."""
-        results = {"inputs": [], "outputs": []}
-        expand = "related_id($select=id,keyed_name,file_size,classification,is_folder,local_file)"
+        with self._folder_cache_lock:
+            if self._prefetch_pool is None:
+                self._prefetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="file-prefetch")
+        self._prefetch_pool.submit(_warm).add_done_callback(_done)
 
-        rel_map = {
-            self.mapping.rel_task_to_input: "inputs",
-            self.mapping.rel_task_to_output: "outputs",
-        }
+    @staticmethod
+    def _iter_tree_paths(nodes: Sequence[FileNode]) -> Iterator[Tuple[List[str], FileNode]]:
+        """
+        Pair each node of a depth-first `_list_file_tree` result with its path
+        parts relative to the tree root (parents always precede children).
+        """
+        parents: List[str] = []
+        for n in nodes:
+            del parents[n.depth:]
+            name = n.name or n.id
+            yield [*parents, name], n
+            if n.is_folder:
+                parents.append(name)
 
-        for rel, category in rel_map.items():
-            results[category] = self._list_file_tree(
-                root_item_type=self.mapping.task_item_type,
-                root_id=task_id,
+    async def _load_file_set(self, item_type: str, item_id: str, rel_input: str, rel_output: str) -> FileSet:
+        """Walk the input and output trees of an item concurrently."""
+        inputs, outputs = await asyncio.gather(*(
+            asyncio.to_thread(
+                self._list_file_tree,
+                root_item_type=item_type,
+                root_id=item_id,
                 root_relationship_name=rel,
-                expand=expand,
+                expand=self.FILE_TREE_EXPAND,
+                recursive=not self.lazy_file_trees,
+            )
+            for rel in (rel_input, rel_output)
+        ))
+        return FileSet(inputs, outputs)
+
+    def _details_with_files(self, item_type: str, item_id: str, rel_input: str, rel_output: str) -> DetailsData:
+        """Fetch the summary row and both file trees concurrently."""
+        async def _load():
+            return await asyncio.gather(
+                self.odata_async.get(item_type, item_id),
+                self._load_file_set(item_type, item_id, rel_input, rel_output),
             )
 
-        return FileSet(results["inputs"], results["outputs"])
+        raw, files = asyncio.run(_load())
+        summary = self._to_summary(raw, item_type=item_type)
+        self._index_file_set(item_type, item_id, summary.title, files)
+        return DetailsData(summary, files)
+
+    def _wr_files(self, wr_id: str) -> FileSet:
+        """Fetch all files and folders recursively for a given Work Request."""
+        return asyncio.run(self._load_file_set(
+            self.mapping.wr_item_type, wr_id, self.mapping.rel_wr_to_input, self.mapping.rel_wr_to_output,
+        ))
+
+    def _task_files(self, task_id: str) -> FileSet:
+        """Fetch all files and folders recursively for a given Task."""
+        return asyncio.run(self._load_file_set(
+            self.mapping.task_item_type, task_id, self.mapping.rel_task_to_input, self.mapping.rel_task_to_output,
+        ))
 
     # ---------------- Download to Server ----------------
-    def download_to_server_via_cli(self, ans_data_id: str, dest: str) -> str:
-        ret = self.cli.download(remote=f"ans_Data/{ans_data_id}", local=dest)
-        print(f"CLI download result: {ret}")
+    def download_to_server_via_cli(
+        self,
+        ans_data_id: str,
+        dest: str,
+        *,
+        resume: bool = False,
+        retries: int = 0,
+        on_progress: Optional[Callable[[CLIProgress], None]] = None,
+    ) -> str:
+        """
+        Download an Ans_Data item (file or folder) into `dest` with the CLI.
+
+        `on_progress` receives CLIProgress events while it runs, measured
+        from the item's files on disk against their known sizes.
+
+        With resume=True, files already on disk whose size matches
+        FileNode.size are kept and the CLI runs with overwrite="Ignore", so a
+        retry only transfers what is missing. Files with a wrong size
+        (interrupted writes) are removed first, and the result is verified
+        against FileNode.size before returning.
+        """
+        remote = f"ans_Data/{ans_data_id}"
+        expected = self._expected_local_files(ans_data_id, dest) if (resume or on_progress) else {}
+        tracker = CLIProgressTracker(on_progress, expected=expected).start() if on_progress else None
+        ok = False
+        try:
+            result = self._download_via_cli(remote, dest, expected, resume=resume, retries=retries)
+            ok = True
+            return result
+        finally:
+            if tracker:
+                tracker.finish(complete=ok)
+
+    def _download_via_cli(self, remote: str, dest: str, expected: Dict[str, int], *, resume: bool, retries: int) -> str:
+        """download_to_server_via_cli() without progress reporting."""
+        if not resume:
+            ret = self.cli_jobs.run("download", remote=remote, local=dest)
+            print(f"CLI download result: {ret}")
+            return dest
+
+        for attempt in range(retries + 1):
+            self._drop_incomplete(expected)
+            try:
+                ret = self.cli_jobs.run("download", remote=remote, local=dest, overwrite="Ignore")
+                print(f"CLI download result: {ret}")
+            except MinervaCliError as e:
+                if attempt >= retries:
+                    raise
+                logging.warning(f"CLI download of {remote} failed; retry {attempt + 1}/{retries}: {e}")
+                continue
+
+            incomplete = self._drop_incomplete(expected)
+            if not incomplete:
+                return dest
+            if attempt >= retries:
+                raise RuntimeError(f"CLI download of {remote} incomplete: {len(incomplete)} file(s) missing or truncated")
+            logging.warning(f"CLI download of {remote} left {len(incomplete)} incomplete file(s); retry {attempt + 1}/{retries}")
+
         return dest
 
-    def download_to_server_via_odata(self, vault_id: str, dest: str) -> str:
+    def download_many_to_server_via_cli(
+        self,
+        items: Iterable[Tuple[str, str]],
+        *,
+        batch_size: Optional[int] = None,
+        priority: int = 0,
+        overwrite: str = "Overwrite",
+        timeout: Optional[float] = None,
+        incremental: bool = False,
+    ) -> List[CLIItemResult]:
+        """
+        Download many Ans_Data items with as few CLI processes as possible.
+
+        `items` are (ans_data_id, dest) pairs. Items are grouped by dest
+        (the CLI workspace); each workspace is signed in once and its items
+        are passed as repeated --remote values, split into invocations of at
+        most `batch_size` remotes queued on the CLI pool (self.cli_jobs).
+        Returns one result per item, in input order; a failed invocation
+        marks its items failed instead of raising.
+
+        With incremental=True, items that are already current in their
+        workspace are not downloaded again (see _split_fresh); their results
+        have reused=True.
+        """
+        batch_size = batch_size or self.CLI_BATCH_SIZE
+        items = list(items)
+        reused: Dict[Tuple[str, str], CLIItemResult] = {}
+        if incremental and items:
+            reused = self._split_fresh({item: self._expected_local_files(*item) for item in dict.fromkeys(items)})
+            overwrite = "Ignore"  # Stale copies were deleted; keep the current ones.
+
+        by_dest: Dict[str, List[str]] = {}
+        order: List[Tuple[str, str]] = []
+        by_key: Dict[Tuple[str, str], CLIItemResult] = {}
+        for ans_data_id, dest in items:
+            remote = f"ans_Data/{ans_data_id}"
+            if (ans_data_id, dest) in reused:
+                by_key[(dest, remote)] = reused[(ans_data_id, dest)]
+                order.append((dest, remote))
+                continue
+            remotes = by_dest.setdefault(dest, [])
+            if remote not in remotes:
+                remotes.append(remote)
+            order.append((dest, remote))
+
+        batches: List[Tuple[str, List[str]]] = []
+        for dest, remotes in by_dest.items():
+            os.makedirs(dest, exist_ok=True)
+            self._cli_sign_in(dest)
+            batches.extend((dest, remotes[i:i + batch_size]) for i in range(0, len(remotes), batch_size))
+
+        jobs = [
+            (dest, self.cli_jobs.submit(
+                "download_items", remotes, local=dest, overwrite=overwrite, timeout=timeout,
+                priority=priority,
+            ))
+            for dest, remotes in batches
+        ]
+
+        for dest, job in jobs:
+            results = job.result()
+            failed = sum(1 for r in results if not r.ok)
+            logging.info(f"CLI download to {dest}: {len(results) - failed}/{len(results)} ok")
+            by_key.update(((dest, r.remote), r) for r in results)
+        return [by_key[key] for key in order]
+
+    def export_to_workspace(
+        self,
+        node: NodeRef,
+        dest: str,
+        *,
+        incremental: bool = False,
+        on_progress: Optional[Callable[[CLIProgress], None]] = None,
+    ) -> List[CLIItemResult]:
+        """
+        Download all input and output files of a WR/Task into `dest/inputs`
+        and `dest/outputs` on the server, batched per workspace, reporting
+        CLIProgress events over the whole export.
+
+        With incremental=True a repeated export into the same `dest` only
+        transfers items that changed since (results of the others have
+        reused=True), and progress covers just the transferred files.
+        """
+        details = self.get_details(node)
+        files = details.files
+        if files is None:
+            return []
+
+        items: List[Tuple[str, str]] = [
+            (f.id, os.path.join(dest, category))
+            for category, nodes in (("inputs", files.inputs), ("outputs", files.outputs))
+            for f in nodes
+            if f.depth == 0
+        ]
+        local_files: Dict[Tuple[str, str], Dict[str, int]] = {}
+        if incremental or on_progress is not None:
+            # The trees get_details just loaded already describe what the CLI will write.
+            for category, nodes in (("inputs", files.inputs), ("outputs", files.outputs)):
+                local_files.update(self._local_files_from_tree(nodes, os.path.join(dest, category)))
+        reused = self._split_fresh(local_files) if incremental and items else {}
+        pending = [item for item in items if item not in reused]
+
+        tracker = None
+        if on_progress is not None:
+            expected: Dict[str, int] = {}
+            for item in dict.fromkeys(pending):
+                expected.update(local_files[item])
+            tracker = CLIProgressTracker(on_progress, expected=expected).start()
+        results: List[CLIItemResult] = []
+        try:
+            results = self.download_many_to_server_via_cli(pending, overwrite="Ignore" if incremental else "Overwrite")
+        finally:
+            if tracker:
+                tracker.finish(complete=bool(results) and all(r.ok for r in results))
+        fetched = dict(zip(pending, results))
+        return [reused.get(item) or fetched[item] for item in items]
+
+    def _split_fresh(self, local_files: Dict[Tuple[str, str], Dict[str, int]]) -> Dict[Tuple[str, str], CLIItemResult]:
+        """
+        Incremental sync. `local_files` maps (ans_data_id, dest) items to the
+        files they produce (_expected_local_files). An item is fresh when all
+        its files are on disk with the expected size and fetch-status on the
+        workspace does not report any of them as outdated. Outdated or
+        truncated copies of the other items are deleted, so a download with
+        overwrite="Ignore" transfers exactly those files.
+
+        Returns reused=True results for the fresh items.
+        """
+        # One fetch-status per existing workspace, run side by side on the CLI pool.
+        status_jobs = []
+        for dest in dict.fromkeys(dest for _, dest in local_files):
+            if os.path.isdir(dest):
+                self._cli_sign_in(dest)
+                status_jobs.append((dest, self.cli_jobs.submit("file_status", local=dest)))
+
+        outdated = set()
+        for dest, job in status_jobs:
+            try:
+                statuses = job.result()
+            except MinervaCliError as e:
+                logging.warning(f"fetch-status failed for {dest}; comparing file sizes only: {e}")
+                continue
+            outdated.update(
+                os.path.normcase(os.path.abspath(st.local_path)) for st in statuses if st.up_to_date is False
+            )
+
+        fresh: Dict[Tuple[str, str], CLIItemResult] = {}
+        stale_files = 0
+        for (ans_data_id, dest), files in local_files.items():
+            for path in files:
+                if os.path.normcase(os.path.abspath(path)) in outdated and os.path.isfile(path):
+                    os.remove(path)
+            incomplete = self._drop_incomplete(files)
+            if incomplete:
+                stale_files += len(incomplete)
+                continue
+            fresh[(ans_data_id, dest)] = CLIItemResult(
+                remote=f"ans_Data/{ans_data_id}",
+                ok=True,
+                local_path=dest,
+                message="up to date",
+                reused=True,
+            )
+
+        logging.info(
+            f"Incremental CLI sync: {len(fresh)}/{len(local_files)} items up to date, "
+            f"{stale_files} file(s) to transfer"
+        )
+        return fresh
+
+    def _cli_sign_in(self, dest: str) -> None:
+        """
+        Sign the CLI workspace `dest` in once; later commands reuse its session.
+        Concurrent callers for one workspace share a single sign-in job, and
+        no lock is held while it waits on the CLI pool.
+        """
+        self.cli_jobs.restart_after_fork()
+        if self.cli.has_session(dest):
+            return
+        key = os.path.abspath(dest)
+        with self._cli_sign_in_lock:
+            job = self._cli_sign_ins.get(key)
+            # A finished job without a session failed, or set_auth() dropped its session.
+            if job is None or (job.future.done() and not self.cli.has_session(dest)):
+                job = self._cli_sign_ins[key] = self.cli_jobs.submit(
+                    "sign_in", local=dest, priority=self.CLI_SIGN_IN_PRIORITY,
+                )
+        job.result()
+
+    def _reset_cli_sign_ins(self) -> None:
+        self._cli_sign_ins = {}
+        self._cli_sign_in_lock = threading.Lock()
+
+    def _expected_local_files(self, ans_data_id: str, dest: str) -> Dict[str, int]:
+        """Map each local file path the CLI will produce to its FileNode.size."""
+        root = self.odata.get(
+            self.mapping.data_item_type,
+            ans_data_id,
+            select=["id", "keyed_name", "is_folder", "file_size"],
+        )
+        root_path = os.path.join(dest, str(root.get("keyed_name") or ans_data_id))
+        if root.get("is_folder") != "1":
+            return {root_path: int(root.get("file_size") or 0)}
+
+        nodes = self._list_file_tree(
+            root_item_type=self.mapping.data_item_type,
+            root_id=ans_data_id,
+            root_relationship_name=self.mapping.rel_data_to_child_data,
+            expand=self.FILE_TREE_EXPAND,
+        )
+        return {
+            os.path.join(root_path, *parts): n.size
+            for parts, n in self._iter_tree_paths(nodes)
+            if not n.is_folder
+        }
+
+    def _local_files_from_tree(self, nodes: Sequence[FileNode], dest: str) -> Dict[Tuple[str, str], Dict[str, int]]:
+        """
+        _expected_local_files() for every depth-0 item of a loaded file tree,
+        keyed by (ans_data_id, dest). Folders of a lazy tree (children not
+        loaded) are listed through _expected_local_files().
+        """
+        out: Dict[Tuple[str, str], Dict[str, int]] = {}
+        files: Dict[str, int] = {}
+        for parts, n in self._iter_tree_paths(nodes):
+            if n.depth == 0:
+                files = out.setdefault((n.id, dest), {})
+                if n.is_folder and n.has_children:
+                    files.update(self._expected_local_files(n.id, dest))
+                    continue
+            if not n.is_folder:
+                files[os.path.join(dest, *parts)] = n.size
+        return out
+
+    def _drop_incomplete(self, expected: Dict[str, int]) -> List[str]:
+        """Delete files whose size disagrees with FileNode.size; return missing/deleted paths."""
+        incomplete: List[str] = []
+        for path, size in expected.items():
+            if not os.path.isfile(path):
+                incomplete.append(path)
+            elif size and os.path.getsize(path) != size:
+                os.remove(path)
+                incomplete.append(path)
+        return incomplete
+
+    def download_to_server_via_odata(
+        self,
+        vault_id: str,
+        dest: Union[str, BinaryIO],
+        *,
+        parallel: bool = False,
+        resume: bool = False,
+        node: Optional[FileNode] = None,
+        retries: int = 0,
+    ) -> Union[str, BinaryIO]:
+        """
+        Download to a path, or proxy straight into a writable object when `dest` has write().
+        parallel=True fetches byte ranges over several connections (path destinations only).
+        resume=True keeps a checkpointed .part file across attempts; when `node` is
+        given, its size and modified_on validate the result before it is promoted.
+        """
         print(f"Initiating OData download for vault_id={vault_id} to dest={dest}")
-        ret = self.odata.download(vault_id, dest)
+        ret = self.odata.download(
+            vault_id,
+            dest,
+            parallel=parallel,
+            resume=resume,
+            expected_size=node.size if node and node.size else None,
+            validator=node.modified_on if node else None,
+            retries=retries,
+        )
         print(f"OData download result: {ret}")
         return dest
 
+    def iter_folder_zip(self, folder_id: str, folder_name: str) -> Iterator[bytes]:
+        """
+        Stream a ZIP of an Ans_Data folder, fed file by file from OData.
+
+        The root folder entry is emitted before the tree is walked so the
+        response starts immediately; each file's vault stream is opened only
+        when its entry is written.
+        """
+        root = folder_name or folder_id
+
+        def _entries() -> Iterator[ZipEntry]:
+            yield ZipEntry(root, is_dir=True)
+
+            nodes = self._list_file_tree(
+                root_item_type=self.mapping.data_item_type,
+                root_id=folder_id,
+                root_relationship_name=self.mapping.rel_data_to_child_data,
+                expand=self.FILE_TREE_EXPAND,
+            )
+
+            for parts, n in self._iter_tree_paths(nodes):
+                arcname = "/".join([root, *parts])
+                if n.is_folder:
+                    yield ZipEntry(arcname, is_dir=True)
+                elif n.vault_id and n.vault_id != "None":
+                    yield ZipEntry(
+                        arcname,
+                        open_chunks=lambda vid=n.vault_id: self.odata.iter_download(vid),
+                        size=n.size,
+                    )
+                else:
+                    yield ZipEntry(arcname, size=0)
+
+        return iter_zip(_entries())
+
+    def stream_via_odata(self, vault_id: str, *, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        """Yield vault file bytes for pass-through consumers; nothing lands on disk."""
+        return self.odata.iter_download(vault_id, chunk_size=chunk_size)
+
+    def open_download_via_odata(self, vault_id: str, *, range_header: Optional[str] = None):
+        """Open a streaming vault response; the caller relays and closes it."""
+        return self.odata.open_download(vault_id, range_header=range_header)
+
 
 # ---------------- Utility Functions ----------------
 def normalize_options(raw: Any) -> List[OptionSpec]:
@@ -4,10 +4,31 @@ from typing import Literal
 
 from logic.services.ootb_service import OOTBService
 from logic.services.vd_service import VDService
+from logic.services.hierarchy_mirror import HierarchyMirror, MirroredService
+from logic.utils.response_cache import ResponseCache
 
 Tenant = Literal["ootb", "vd"]
 
 
+def _odata_cache_from_env():
+    """
+    Build the opt-in OData read cache.
+
+    MINERVA_CACHE_TTL: default TTL in seconds (unset/0 disables the cache)
+    MINERVA_CACHE_TTLS: per-resource overrides, e.g. "Ans_Project=300,Ans_SimReq_Task=10"
+    """
+    default_ttl = float(os.getenv("MINERVA_CACHE_TTL", "0") or 0)
+    if default_ttl <= 0:
+        return None
+
+    ttls = {}
+    for pair in os.getenv("MINERVA_CACHE_TTLS", "").split(","):
+        name, sep, value = pair.partition("=")
+        if sep:
+            ttls[name.strip()] = float(value)
+    return ResponseCache(default_ttl=default_ttl, ttls=ttls)
+
+
 def get_service():
     tenant: Tenant = os.getenv("MINERVA_TENANT", "ootb").lower()
 
@@ -17,8 +38,35 @@ def get_service():
         username=os.environ["MINERVA_USERNAME"],
         password=os.environ["MINERVA_PASSWORD"],
         cli_exe_path=os.getenv("MINERVA_CLI_EXE_PATH"),
+        odata_cache=_odata_cache_from_env(),
+        # MINERVA_LAZY_FILES=1: load file trees one folder at a time;
+        # MINERVA_FILE_PREFETCH=1 warms the next level in the background.
+        lazy_file_trees=os.getenv("MINERVA_LAZY_FILES", "0").lower() in ("1", "true", "yes"),
+        prefetch_file_trees=os.getenv("MINERVA_FILE_PREFETCH", "0").lower() in ("1", "true", "yes"),
+        # MINERVA_CLI_MAX_CONCURRENCY: CLI processes allowed to run at once
+        cli_max_concurrency=int(os.getenv("MINERVA_CLI_MAX_CONCURRENCY", "2")),
     )
 
-    if tenant == "vd":
-        return VDService(**common)
-    return OOTBService(**common)
\ No newline at end of file
+    service = VDService(**common) if tenant == "vd" else OOTBService(**common)
+
+    # MINERVA_SYNC_INTERVAL: seconds between delta syncs of the local mirror (unset/0 = live reads only)
+    sync_interval = float(os.getenv("MINERVA_SYNC_INTERVAL", "0") or 0)
+    read_mode = os.getenv("MINERVA_READ_MODE", "live").lower()
+    if sync_interval > 0 and read_mode != "mirror":
+        service.enable_mirror(interval=sync_interval)
+
+    # MINERVA_FILE_INDEX_INTERVAL: seconds between full walks that feed the filename
+    # search index (unset/0 = one walk at startup, -1 = index only the file trees
+    # users open). In mirror mode the index is seeded from the mirror instead.
+    index_interval = float(os.getenv("MINERVA_FILE_INDEX_INTERVAL", "0") or 0)
+    if index_interval >= 0 and read_mode != "mirror":
+        service.start_file_indexing(index_interval)
+
+    # MINERVA_READ_MODE=mirror: answer navigation from a local SQLite mirror
+    # (MINERVA_MIRROR_PATH), updated from the same delta sync every
+    # MINERVA_SYNC_INTERVAL seconds (MINERVA_MIRROR_INTERVAL if that is unset).
+    if read_mode == "mirror":
+        mirror = HierarchyMirror(os.getenv("MINERVA_MIRROR_PATH", "minerva_mirror.sqlite3"))
+        service = MirroredService(service, mirror, mode="mirror")
+        service.start_refresh(sync_interval or float(os.getenv("MINERVA_MIRROR_INTERVAL", "600")))
+    return service
\ No newline at end of file
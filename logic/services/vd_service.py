@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Optional, List
+from typing import Any, Dict, Optional, List
 
 from logic.services.ootb_service import (
     OOTBDisplayPolicy,
@@ -25,6 +25,7 @@ from datamodel.models import (
     ChildrenResult,
     merge_badge_specs,
 )
+from logic.utils.response_cache import ResponseCache
 import logging
 from ..utils.decorators import log
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
@@ -117,6 +118,10 @@ class VDService(OOTBService):
         password: str,
         cli_exe_path: Optional[str] = None,
         mapping: Optional[VDMapping] = None,
+        odata_cache: Optional[ResponseCache] = None,
+        lazy_file_trees: bool = False,
+        prefetch_file_trees: bool = False,
+        cli_max_concurrency: int = 2,
     ):
         super().__init__(
             base_url=base_url,
@@ -125,6 +130,10 @@ class VDService(OOTBService):
             password=password,
             cli_exe_path=cli_exe_path,
             mapping=mapping or VDMapping(),
+            odata_cache=odata_cache,
+            lazy_file_trees=lazy_file_trees,
+            prefetch_file_trees=prefetch_file_trees,
+            cli_max_concurrency=cli_max_concurrency,
         )
         self.mapping: VDMapping = self.mapping
 
@@ -175,11 +184,14 @@ class VDService(OOTBService):
         year = filters.get("year")
         product = filters.get("product")
         filter_clauses = []
+        where = {}
 
         if year is not None and str(year).strip() != "":
             filter_clauses.append(f"_development_year eq '{year}'")
+            where["_development_year"] = year
         if product is not None and str(product).strip() != "":
             filter_clauses.append(f"_product_category eq '{product}'")
+            where["_product_category"] = product
         filter = " and ".join(filter_clauses) if filter_clauses else None
 
         select_fields = ["id",
@@ -191,7 +203,7 @@ class VDService(OOTBService):
                          "_product_category"
                          ]
 
-        rows = self.odata.list(self.mapping.project_item_type, select=select_fields, filter=filter)
+        rows = self._list_entity(self.mapping.project_item_type, select=select_fields, filter=filter, where=where)
 
         out = []
         for r in rows:
@@ -221,18 +233,43 @@ class VDService(OOTBService):
     def get_details(self, node: NodeRef) -> DetailsData:
         """WR holds files in VD"""
         if node.kind == NodeKind.LEVEL1:
-            raw = self.odata.get(self.mapping.sr_item_type, node.id)
+            raw = self._get_entity(self.mapping.sr_item_type, node.id)
             summary = self._to_summary(raw, item_type=self.mapping.sr_item_type)
             return DetailsData(summary, None)
 
         if node.kind == NodeKind.LEVEL2:
-            raw = self.odata.get(self.mapping.wr_item_type, node.id)
-            summary = self._to_summary(raw, item_type=self.mapping.wr_item_type)
-            files = self._wr_files(node.id)
-            return DetailsData(summary, files)
+            return self._details_with_files(
+                self.mapping.wr_item_type,
+                node.id,
+                self.mapping.rel_wr_to_input,
+                self.mapping.rel_wr_to_output,
+            )
 
         return super().get_details(node)
 
+    def mirrored_entity_sets(self) -> Dict[str, List[str]]:
+        return {
+            self.mapping.project_item_type: [
+                "id", "item_number", "name", "_model_name", "state", "_development_year", "_product_category",
+                "created_on",
+            ],
+            self.mapping.sr_item_type: [
+                "id", "keyed_name", "_item_number", "_name", "state", "_development_stage", "_request_type",
+                "_simulation_type", "created_on", "_target_date", "_background", "_project_id",
+            ],
+        }
+
+    def hierarchy_change_keys(self) -> Dict[str, List[str]]:
+        m = self.mapping
+        keys = {
+            name: refs for name, refs in super().hierarchy_change_keys().items()
+            if name not in (m.task_item_type, m.rel_project_to_wr, m.rel_wr_to_task, m.rel_task_to_input, m.rel_task_to_output)
+        }
+        # SRs hang off their project through a property, not a relationship.
+        keys[m.sr_item_type] = ["_project_id"]
+        keys[m.rel_sr_to_wr] = ["source_id"]
+        return keys
+
     def get_filter_years(self):
         years = self.odata.list_values(self.mapping.id_of_list_development_year)
         return years
@@ -255,7 +292,8 @@ class VDService(OOTBService):
                          "_background",
                          ]
 
-        rows = self.odata.list("VD_SimulationRequest", filter=filter)
+        # Mirrored rows hold item references as "<prop>@aras.id", like local_file@aras.id.
+        rows = self._list_entity(self.mapping.sr_item_type, filter=filter, where={"_project_id@aras.id": node_id})
         return [
             NodeRef(
                 id=str(r["id"]),
@@ -0,0 +1,276 @@
+import os
+import uuid
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger("DownloadCache")
+
+DEFAULT_MAX_BYTES = 10 * 1024 ** 3
+DEFAULT_WAIT_TIMEOUT = 30.0
+
+
+class DownloadCache:
+    """
+    Content-addressed on-disk cache for downloaded vault files.
+
+    - Entries are keyed by (vault id, version) and stored under `root`.
+    - Files are written to a temp name and renamed into place only once
+      complete, so readers never see partial content.
+    - Concurrent misses on the same key are single-flighted: one caller
+      transfers, the others wait for it and then read the cached file.
+    - Total size is capped; least recently used entries are evicted first.
+    """
+
+    def __init__(self, root: str, *, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        self._tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(self._tmp_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self._total = 0
+        self._inflight: Dict[str, threading.Event] = {}
+
+        self._load_index()
+
+    # ------------------------------------------------------------------
+    # Keys / paths
+    # ------------------------------------------------------------------
+    @staticmethod
+    def key_for(vault_id: str, version: Optional[str] = None) -> str:
+        """Build a cache key from a vault id and its generation/modified_on."""
+        return hashlib.sha256(f"{vault_id}|{version or ''}".encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU index from disk (oldest access first)."""
+        found = []
+        for shard in os.listdir(self.root):
+            shard_dir = os.path.join(self.root, shard)
+            if shard == "tmp" or not os.path.isdir(shard_dir):
+                continue
+            for name in os.listdir(shard_dir):
+                st = os.stat(os.path.join(shard_dir, name))
+                found.append((st.st_atime, name, st.st_size))
+
+        # Leftovers from interrupted transfers are never valid.
+        for name in os.listdir(self._tmp_dir):
+            try:
+                os.remove(os.path.join(self._tmp_dir, name))
+            except OSError:
+                pass
+
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total += size
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached file path and mark it recently used, or None."""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._forget(key)
+            return None
+        return path
+
+    # ------------------------------------------------------------------
+    # Single-flight
+    # ------------------------------------------------------------------
+    def claim(self, key: str) -> bool:
+        """Try to become the one caller filling `key`. Pair with tee()/fetch()."""
+        with self._lock:
+            if key in self._inflight or key in self._entries:
+                return False
+            self._inflight[key] = threading.Event()
+            return True
+
+    def wait(self, key: str, timeout: Optional[float] = DEFAULT_WAIT_TIMEOUT) -> Optional[str]:
+        """
+        Wait up to `timeout` seconds for an in-flight fill of `key`; return
+        the path, or None if it failed or is still running.
+        """
+        with self._lock:
+            event = self._inflight.get(key)
+        if event is not None:
+            event.wait(timeout)
+        return self.get(key)
+
+    def abandon(self, key: str) -> None:
+        """Give up a claim without filling; waiters see a miss."""
+        self._release(key)
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            event = self._inflight.pop(key, None)
+        if event is not None:
+            event.set()
+
+    # ------------------------------------------------------------------
+    # Fill
+    # ------------------------------------------------------------------
+    def tee(
+        self,
+        key: str,
+        chunks: Iterable[bytes],
+        *,
+        expected_size: Optional[int] = None,
+    ) -> Iterator[bytes]:
+        """
+        Yield `chunks` to the caller while writing them into the cache.
+
+        Must follow a successful claim(key). The entry is committed only if
+        the stream is fully consumed (and matches `expected_size` when given);
+        an early close or error discards the partial file. The claim is
+        released even if the iterator is closed before its first chunk.
+        """
+        tmp = os.path.join(self._tmp_dir, f"{key}.{uuid.uuid4().hex}.tmp")
+        return _CacheFill(self, key, chunks, tmp, expected_size)
+
+    def fetch(self, key: str, fill: Callable[[BinaryIO], None]) -> str:
+        """
+        Return the cached path for `key`, running `fill(fileobj)` on a miss.
+
+        Concurrent callers for the same key share one fill.
+        """
+        while True:
+            path = self.get(key)
+            if path:
+                return path
+
+            if not self.claim(key):
+                path = self.wait(key)
+                if path:
+                    return path
+                continue  # The other fill failed or is still running; check again.
+
+            tmp = os.path.join(self._tmp_dir, f"{key}.{uuid.uuid4().hex}.tmp")
+            try:
+                with open(tmp, "wb") as f:
+                    fill(f)
+                return self._commit(key, tmp, os.path.getsize(tmp))
+            except BaseException:
+                _remove_quietly(tmp)
+                raise
+            finally:
+                self._release(key)
+
+    def _commit(self, key: str, tmp: str, size: int) -> str:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._forget(key)
+            self._entries[key] = size
+            self._total += size
+            self._evict_locked(keep=key)
+        return path
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+    def _forget(self, key: str) -> None:
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total -= size
+
+    def _evict_locked(self, *, keep: str) -> None:
+        for key in list(self._entries.keys()):
+            if self._total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue  # Still open for reading (Windows); try again on a later commit.
+            self._forget(key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._total, "max_bytes": self.max_bytes}
+
+
+class _CacheFill:
+    """Iterator returned by DownloadCache.tee(); see there."""
+
+    def __init__(self, cache: DownloadCache, key: str, chunks: Iterable[bytes], tmp: str, expected_size: Optional[int]):
+        self._cache = cache
+        self._key = key
+        self._source = chunks
+        self._chunks = iter(chunks)
+        self._tmp = tmp
+        self._expected_size = expected_size
+        self._file: Optional[BinaryIO] = None
+        self._written = 0
+        self._done = False
+
+    def __iter__(self) -> "_CacheFill":
+        return self
+
+    def __next__(self) -> bytes:
+        if self._done:
+            raise StopIteration
+        try:
+            if self._file is None:
+                self._file = open(self._tmp, "wb")
+            chunk = next(self._chunks)
+            self._file.write(chunk)
+        except StopIteration:
+            self._finish(complete=True)
+            raise
+        except BaseException:
+            self._finish(complete=False)
+            raise
+        self._written += len(chunk)
+        return chunk
+
+    def close(self) -> None:
+        self._finish(complete=False)
+
+    def _finish(self, *, complete: bool) -> None:
+        if self._done:
+            return
+        self._done = True
+        try:
+            close = getattr(self._source, "close", None)
+            if close:
+                close()
+            if self._file is not None:
+                self._file.close()
+
+            if complete and self._expected_size is not None and self._written != self._expected_size:
+                logger.warning(f"Size mismatch for {self._key}: expected {self._expected_size}, got {self._written}")
+                complete = False
+
+            if complete and self._file is not None:
+                self._cache._commit(self._key, self._tmp, self._written)
+            else:
+                _remove_quietly(self._tmp)
+        finally:
+            self._cache._release(self._key)
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,193 @@
+import re
+import heapq
+import threading
+from array import array
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from datamodel.models import FileHit, FileNode
+
+_WORD_BOUNDARY = re.compile(r"[\s._\-/()\[\]]")
+
+
+# Terms shorter than a trigram are looked up by word prefix instead.
+_PREFIX = "\x00"
+# Very broad queries rank only this many matches (most recently indexed first).
+_MAX_MATCHES = 10000
+# Rough cost of verifying one candidate relative to one set-membership probe.
+_VERIFY_COST = 30
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _word_prefixes(text: str) -> Set[str]:
+    """One- and two-character prefixes of every word, plus of the whole text."""
+    out = set()
+    for word in _WORD_BOUNDARY.split(text) + [text]:
+        if word:
+            out.add(_PREFIX + word[:1])
+            out.add(_PREFIX + word[:2])
+    return out
+
+
+class FileSearchIndex:
+    """
+    In-memory trigram index over file names, classifications and the label of
+    the work request / task that owns each file.
+
+    - Postings are compact arrays of document ids per trigram.
+    - A query is split into terms; the postings of their trigrams are
+      intersected to a candidate set, and each candidate is verified by substring match
+      (every term must occur in the name, classification or owner label).
+      Terms of one or two characters match the start of a name word only.
+    - Very broad queries stop after _MAX_MATCHES verified hits so a search
+      stays interactive at hundreds of thousands of files.
+    - Re-indexing an owner replaces its previous documents and remove_owner()
+      drops them; stale ids are skipped and the index compacts itself once
+      half of it is stale.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._docs: List[Optional[Tuple[FileHit, str, str, str]]] = []  # hit, name, classification, owner (lowercase)
+        self._postings: Dict[str, array] = {}
+        self._by_owner: Dict[str, List[int]] = {}
+        self._dead = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._docs) - self._dead
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+    def index_owner(
+        self,
+        *,
+        owner_id: str,
+        owner_type: str,
+        owner_label: Optional[str],
+        files: Iterable[Tuple[str, FileNode]],
+    ) -> int:
+        """Replace all documents of `owner_id` with (category, FileNode) pairs."""
+        hits = [
+            FileHit(file=f, owner_id=owner_id, owner_type=owner_type, owner_label=owner_label, category=category)
+            for category, f in files
+        ]
+        with self._lock:
+            self._remove_owner(owner_id)
+            ids = []
+            for hit in hits:
+                ids.append(self._add(hit))
+            self._by_owner[owner_id] = ids
+            if self._dead > 1024 and self._dead * 2 > len(self._docs):
+                self._compact()
+        return len(hits)
+
+    def _add(self, hit: FileHit) -> int:
+        name = (hit.file.name or "").lower()
+        classification = (hit.file.classification or "").lower()
+        owner = (hit.owner_label or "").lower()
+
+        doc_id = len(self._docs)
+        self._docs.append((hit, name, classification, owner))
+        keys = _trigrams(name) | _trigrams(classification) | _trigrams(owner)
+        keys.update(_word_prefixes(name))
+        for gram in keys:
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array("I")
+            postings.append(doc_id)
+        return doc_id
+
+    def remove_owner(self, owner_id: str) -> bool:
+        """Drop every document of `owner_id` (e.g. the item was deleted); False if none were indexed."""
+        with self._lock:
+            if owner_id not in self._by_owner:
+                return False
+            self._remove_owner(owner_id)
+            return True
+
+    def owner_ids(self) -> Set[str]:
+        with self._lock:
+            return set(self._by_owner)
+
+    def _remove_owner(self, owner_id: str) -> None:
+        for doc_id in self._by_owner.pop(owner_id, []):
+            if self._docs[doc_id] is not None:
+                self._docs[doc_id] = None
+                self._dead += 1
+
+    def _compact(self) -> None:
+        live = [d[0] for d in self._docs if d is not None]
+        self._docs, self._postings, self._by_owner, self._dead = [], {}, {}, 0
+        for hit in live:
+            self._by_owner.setdefault(hit.owner_id, []).append(self._add(hit))
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    def search(self, query: str, *, limit: int = 20) -> List[FileHit]:
+        """Return up to `limit` hits, best first."""
+        terms = [t for t in (query or "").lower().split() if t]
+        if not terms:
+            return []
+
+        with self._lock:
+            candidates = self._candidates(terms)
+            scored = []
+            for doc_id in candidates:
+                doc = self._docs[doc_id]
+                if doc is None:
+                    continue
+                score = self._score(terms, doc[1], doc[2], doc[3])
+                if score is not None:
+                    scored.append((score, doc_id, doc[0]))
+                    if len(scored) >= _MAX_MATCHES:
+                        break
+
+        best = heapq.nlargest(limit, scored, key=lambda x: (x[0], x[1]))
+        return [replace(hit, score=round(score, 3)) for score, _, hit in best]
+
+    def _candidates(self, terms: List[str]) -> List[int]:
+        """
+        Doc ids that may match every term, newest first. Each term contributes
+        its rarest posting (trigrams of one word are strongly correlated, so
+        the others barely narrow it); those are intersected rarest first while
+        that is cheaper than verifying what is left.
+        """
+        postings = []
+        for term in terms:
+            keys = _trigrams(term) or {_PREFIX + term}
+            found = [self._postings.get(key) for key in keys]
+            if any(p is None for p in found):
+                return []
+            postings.append(min(found, key=len))
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for p in postings[1:]:
+            if len(candidates) * _VERIFY_COST < len(p):
+                break
+            candidates.intersection_update(p)
+        return sorted(candidates, reverse=True)
+
+    @staticmethod
+    def _score(terms: List[str], name: str, classification: str, owner: str) -> Optional[float]:
+        total = 0.0
+        for term in terms:
+            pos = name.find(term)
+            if pos == 0 and len(term) == len(name):
+                total += 100
+            elif pos == 0:
+                total += 80
+            elif pos > 0:
+                total += 60 if _WORD_BOUNDARY.match(name[pos - 1]) else 40
+            elif term in classification or term in owner:
+                total += 20
+            else:
+                return None
+        # Prefer shorter names among equal matches.
+        return total - len(name) / 1000
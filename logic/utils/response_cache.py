@@ -0,0 +1,169 @@
+import re
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Mapping, NamedTuple, Optional, Tuple
+
+DEFAULT_TTL = 30.0
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_KEY_PREDICATE_RE = re.compile(r"\(.*?\)")
+
+
+class _Entry(NamedTuple):
+    body: bytes
+    expires: float
+    resources: FrozenSet[str]
+
+
+class ResponseCache:
+    """
+    In-memory TTL + LRU cache for OData GET response bodies.
+
+    - Keys are the request path plus normalized query params, see key().
+    - TTLs are looked up per resource name (the last path segment first,
+      e.g. a relationship, then the entity set); a TTL of 0 disables caching
+      for that resource.
+    - Memory is bounded by entry count and total body bytes; least recently
+      used entries are evicted first.
+    - invalidate(name) drops every entry whose path mentions that entity set
+      or relationship; the OData client calls it on create/patch/delete.
+    - generation(path) is taken before a GET is sent and passed to put();
+      if a write invalidated the path in between, the (possibly pre-write)
+      body is not stored.
+
+    Bodies are stored as the raw response bytes, so each hit is parsed into
+    a fresh object and callers can never mutate a cached value.
+    """
+
+    def __init__(
+        self,
+        *,
+        default_ttl: float = DEFAULT_TTL,
+        ttls: Optional[Mapping[str, float]] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()  # oldest first
+        self._bytes = 0
+        self._generations: Dict[str, int] = {}  # resource -> invalidation count
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "invalidations": 0}
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+    @staticmethod
+    def key(path: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        """
+        Build a cache key. `$select` lists are order-insensitive; whitespace in
+        `$filter`/`$expand`/other values is collapsed.
+        """
+        parts = []
+        for name in sorted(params or {}):
+            value = params[name]
+            if value is None:
+                continue
+            if name == "$select":
+                value = ",".join(sorted(v.strip() for v in str(value).split(",") if v.strip()))
+            else:
+                value = " ".join(str(value).split())
+            parts.append(f"{name}={value}")
+        return path.strip("/") + "?" + "&".join(parts)
+
+    @staticmethod
+    def resource_names(path: str) -> FrozenSet[str]:
+        """Entity set / navigation names in a path: "A('1')/B" -> {"A", "B"}."""
+        stripped = _KEY_PREDICATE_RE.sub("", path.split("?", 1)[0])
+        return frozenset(seg for seg in stripped.strip("/").split("/") if seg)
+
+    def ttl_for(self, path: str) -> float:
+        segments = [s for s in _KEY_PREDICATE_RE.sub("", path.split("?", 1)[0]).strip("/").split("/") if s]
+        for name in reversed(segments):
+            if name in self.ttls:
+                return self.ttls[name]
+        return self.default_ttl
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached body for `key`, or None on a miss or expiry."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if entry.expires <= now:
+                self._drop(key)
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry.body
+
+    def generation(self, path: str) -> Tuple[int, ...]:
+        """Invalidation counters of the resources in `path`; see put()."""
+        names = sorted(self.resource_names(path))
+        with self._lock:
+            return tuple(self._generations.get(name, 0) for name in names)
+
+    def put(self, key: str, path: str, body: bytes, *, generation: Optional[Tuple[int, ...]] = None) -> None:
+        """
+        Store `body`. With `generation` (from generation() before the request
+        was sent), nothing is stored if the path was invalidated since.
+        """
+        ttl = self.ttl_for(path)
+        if ttl <= 0 or len(body) > self.max_bytes:
+            return
+
+        names = self.resource_names(path)
+        entry = _Entry(body, time.monotonic() + ttl, names)
+        with self._lock:
+            if generation is not None and generation != tuple(self._generations.get(n, 0) for n in sorted(names)):
+                return
+            self._drop(key)
+            self._entries[key] = entry
+            self._bytes += len(body)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+    def invalidate(self, resource: str) -> int:
+        """Drop all entries that touch `resource`; returns how many were dropped."""
+        with self._lock:
+            self._generations[resource] = self._generations.get(resource, 0) + 1
+            stale = [k for k, e in self._entries.items() if resource in e.resources]
+            for key in stale:
+                self._drop(key)
+            self._stats["invalidations"] += len(stale)
+            return len(stale)
+
+    def invalidate_path(self, path: str) -> int:
+        """Invalidate every resource named in a write request's path."""
+        return sum(self.invalidate(name) for name in self.resource_names(path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "bytes": self._bytes}
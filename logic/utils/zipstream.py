@@ -0,0 +1,102 @@
+import os
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+# Formats that are already compressed (archives, media, zipped CAE project
+# bundles). Deflating them costs CPU for little or no size gain, so they are
+# stored as-is.
+STORED_EXTENSIONS = frozenset({
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".zst",
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".mp4", ".avi", ".mov",
+    ".aedtz", ".aedbz", ".wbpz", ".mechdat", ".agdb", ".h5", ".hdf5",
+})
+
+DEFAULT_FLUSH_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ZipEntry:
+    """
+    One archive member.
+
+    `open_chunks` is called only when the entry is written, so remote streams
+    are opened one at a time as the archive progresses.
+    """
+    arcname: str
+    open_chunks: Optional[Callable[[], Iterable[bytes]]] = None
+    is_dir: bool = False
+    size: Optional[int] = None
+    date_time: Optional[Tuple[int, int, int, int, int, int]] = None
+
+
+class _ChunkSink:
+    """Write-only file object that buffers zipfile output until drained."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self.pending = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self.pending += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks = []
+        self.pending = 0
+        return out
+
+
+def compression_for(name: str) -> int:
+    """Pick ZIP_STORED for already-compressed formats, ZIP_DEFLATED otherwise."""
+    _, ext = os.path.splitext(name.lower())
+    return zipfile.ZIP_STORED if ext in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+
+def iter_zip(
+    entries: Iterable[ZipEntry],
+    *,
+    flush_size: int = DEFAULT_FLUSH_SIZE,
+) -> Iterator[bytes]:
+    """
+    Build a ZIP archive on the fly and yield it as byte chunks.
+
+    The output stream is never seeked: sizes and CRCs go into data
+    descriptors after each member, so the first bytes are available as soon
+    as the first entry starts. Entries are written with ZIP64 when their size
+    is unknown or large.
+    """
+    sink = _ChunkSink()
+
+    with zipfile.ZipFile(sink, mode="w", allowZip64=True) as zf:
+        for entry in entries:
+            date_time = entry.date_time or time.localtime()[:6]
+
+            if entry.is_dir:
+                info = zipfile.ZipInfo(entry.arcname.rstrip("/") + "/", date_time=date_time)
+                info.external_attr = (0o40775 << 16) | 0x10
+                zf.writestr(info, b"")
+            else:
+                info = zipfile.ZipInfo(entry.arcname, date_time=date_time)
+                info.external_attr = 0o644 << 16
+                info.compress_type = compression_for(entry.arcname)
+                force_zip64 = entry.size is None or entry.size >= zipfile.ZIP64_LIMIT // 2
+
+                with zf.open(info, mode="w", force_zip64=force_zip64) as dest:
+                    for chunk in (entry.open_chunks() if entry.open_chunks else ()):
+                        dest.write(chunk)
+                        if sink.pending >= flush_size:
+                            yield sink.drain()
+
+            if sink.pending:
+                yield sink.drain()
+
+    # Central directory
+    if sink.pending:
+        yield sink.drain()